@@ -2,16 +2,28 @@
 
 from __future__ import annotations
 
+import asyncio
+import concurrent.futures
+import functools
+import hashlib
 import logging
+import operator
 import os
+import stat
+import time
+import urllib.parse
 import uuid
 from pathlib import Path
 from typing import Any
 
+import httpx
+import orjson
+import pymupdf
 from fastapi import FastAPI, HTTPException, Query, Request, UploadFile, File
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse, HTMLResponse
+from fastapi.responses import FileResponse, HTMLResponse, JSONResponse, Response
 from fastapi.staticfiles import StaticFiles
+from openai import AsyncOpenAI
 from pydantic import BaseModel, Field
 
 from core.demo.logging_utils import configure_demo_logging
@@ -46,28 +58,89 @@ log = logging.getLogger("maldoc.demo.api")
 ROOT_DIR = Path(__file__).resolve().parent
 DEFAULT_STAGE2_MODEL = os.environ.get("MALDOC_STAGE2_MODEL", "gpt-5-2025-08-07")
 DEFAULT_STAGE3_MODEL = os.environ.get("MALDOC_STAGE3_MODEL", "gpt-5-2025-08-07")
+# Hard cap on a request body (and on each uploaded file while it is spooled)
+MAX_UPLOAD_BYTES = int(os.environ.get("MALDOC_MAX_UPLOAD_MB", "200")) * 1024 * 1024
 
-app = FastAPI(title="MALDOC: A Modular Red-Teaming Platform for Document Processing AI Agents", version="1.0.0")
+
+
+class _ORJSONResponse(JSONResponse):
+    """JSONResponse encoded with orjson (several times faster on the large listing payloads)."""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
+app = FastAPI(
+    title="MALDOC: A Modular Red-Teaming Platform for Document Processing AI Agents",
+    version="1.0.0",
+    default_response_class=_ORJSONResponse,
+)
+# The UI is normally served by this app (same origin, no CORS involved); the
+# allowlist covers separately served dev frontends. Explicit lists let the
+# middleware answer with prebuilt headers instead of echoing each request's.
+CORS_ORIGINS = [
+    origin.strip()
+    for origin in os.environ.get(
+        "MALDOC_CORS_ORIGINS",
+        "http://localhost:5173,http://127.0.0.1:5173,http://localhost:8000,http://127.0.0.1:8000",
+    ).split(",")
+    if origin.strip()
+]
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
+    allow_origins=CORS_ORIGINS,
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST", "OPTIONS"],
+    allow_headers=["content-type", "authorization"],
 )
-app.mount("/static", StaticFiles(directory=str(ROOT_DIR / "static")), name="static")
 
-# Serve /react/* with no-cache headers so browsers always fetch fresh JS modules
-_REACT_DIR = ROOT_DIR / "react"
 
-@app.get("/react/{filepath:path}")
-async def serve_react(filepath: str):
-    full = _REACT_DIR / filepath
-    if not full.is_file():
-        raise HTTPException(status_code=404)
-    resp = FileResponse(str(full))
-    resp.headers["Cache-Control"] = "no-store"
-    return resp
+@app.on_event("startup")
+async def _log_event_loop() -> None:
+    # Confirms the serving setup (uvloop when launched with --loop uvloop)
+    log.info("Event loop: %s", type(asyncio.get_running_loop()).__name__)
+
+
+@app.middleware("http")
+async def _reject_oversized_bodies(request: Request, call_next: Any) -> Response:
+    """Answer 413 from the declared Content-Length, before any of the body is read."""
+    try:
+        content_length = int(request.headers.get("content-length", 0))
+    except ValueError:
+        content_length = 0
+    if content_length > MAX_UPLOAD_BYTES:
+        return JSONResponse(
+            status_code=413,
+            content={"detail": f"Request body exceeds the {MAX_UPLOAD_BYTES} byte upload limit."},
+        )
+    return await call_next(request)
+
+
+
+
+class _RevalidatingStaticFiles(StaticFiles):
+    """StaticFiles whose files browsers keep but revalidate on every use.
+
+    "no-cache" keeps edits to the (unbundled) JS modules visible on the next
+    load, while unchanged files cost a 304 instead of a re-download. Files
+    under an assets/ directory of the static root are content-hashed build
+    output and are cached as immutable.
+    """
+
+    def file_response(self, full_path: Any, stat_result: os.stat_result, scope: Any, status_code: int = 200) -> Response:
+        response = super().file_response(full_path, stat_result, scope, status_code)
+        # Match against the path below the mount root, not the absolute path
+        if "assets" in Path(self.get_path(scope)).parts[:-1]:
+            response.headers["Cache-Control"] = "public, max-age=31536000, immutable"
+        else:
+            response.headers["Cache-Control"] = "no-cache"
+        return response
+
+
+app.mount("/static", _RevalidatingStaticFiles(directory=str(ROOT_DIR / "static")), name="static")
+
+_REACT_DIR = ROOT_DIR / "react"
+app.mount("/react", _RevalidatingStaticFiles(directory=str(_REACT_DIR), check_dir=False), name="react")
 
 
 class PipelineRunRequest(BaseModel):
@@ -110,6 +183,7 @@ class Stage5DocRequest(BaseModel):
     model: str = "gpt-4o"
     trials: int = Field(default=3, ge=1, le=9)
     out_subdir: str = "agent_backend_eval"
+    cache_trials: bool = False
 
 
 class Stage5BatchRequest(BaseModel):
@@ -127,7 +201,17 @@ def _require_openai_api_key() -> str:
     return key
 
 
+_STAGE_FIELDS = operator.attrgetter("stage", "status", "message", "artifacts")
+
+
 def _stage_to_dict(stage_obj: Any) -> dict[str, Any]:
+    try:
+        # Fast path for StageStatus: one C-level lookup of all four fields
+        stage, status, message, artifacts = _STAGE_FIELDS(stage_obj)
+    except AttributeError:
+        pass
+    else:
+        return {"stage": stage, "status": status, "message": message, "artifacts": list(artifacts or [])}
     return {
         "stage": getattr(stage_obj, "stage", "unknown"),
         "status": getattr(stage_obj, "status", "unknown"),
@@ -149,6 +233,20 @@ def _resolve_local_file(path_text: str) -> Path:
     return target.resolve()
 
 
+def _require_path(path: str | Path, *, is_dir: bool, detail: str, status_code: int = 400) -> os.stat_result:
+    """Validate with a single stat() that path is a directory (is_dir) or a regular file.
+
+    Raises HTTPException(status_code, detail) otherwise; returns the stat result.
+    """
+    try:
+        st = os.stat(path)
+    except (OSError, ValueError):
+        st = None
+    if st is None or not (stat.S_ISDIR(st.st_mode) if is_dir else stat.S_ISREG(st.st_mode)):
+        raise HTTPException(status_code=status_code, detail=detail)
+    return st
+
+
 def _require_pdf_upload(upload: Any, label: str) -> None:
     filename = (upload.filename or "").strip()
     if not filename:
@@ -157,11 +255,72 @@ def _require_pdf_upload(upload: Any, label: str) -> None:
         raise HTTPException(status_code=400, detail=f"{label} must be a PDF file.")
 
 
+UPLOAD_CHUNK_SIZE = 1 << 20
+
+# Pipeline and Stage 5 runs take seconds to minutes (subprocesses, OpenAI calls).
+# They run on their own pool so they neither block the event loop nor use up
+# the threadpool that serves the quick sync endpoints (health, listings).
+_PIPELINE_POOL = concurrent.futures.ThreadPoolExecutor(
+    max_workers=int(os.environ.get("MALDOC_PIPELINE_WORKERS", "4")),
+    thread_name_prefix="maldoc-pipeline",
+)
+
+
+async def _run_in_pipeline_pool(fn: Any, /, *args: Any, **kwargs: Any) -> Any:
+    """Await fn(*args, **kwargs) run on the pipeline pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_PIPELINE_POOL, functools.partial(fn, *args, **kwargs))
+
+
+async def _spool_upload(upload: Any, dest: Path | int) -> int:
+    """Stream an upload to dest (a path or an open file descriptor, which is
+    closed afterwards) in fixed-size chunks, writing off the event loop; return its size.
+
+    Raises HTTPException(413) as soon as more than MAX_UPLOAD_BYTES have been read.
+    """
+    size = 0
+    with open(dest, "wb") as fh:
+        while chunk := await upload.read(UPLOAD_CHUNK_SIZE):
+            size += len(chunk)
+            if size > MAX_UPLOAD_BYTES:
+                raise HTTPException(
+                    status_code=413,
+                    detail=f"{upload.filename or 'Upload'} exceeds the {MAX_UPLOAD_BYTES} byte upload limit.",
+                )
+            await asyncio.to_thread(fh.write, chunk)
+    return size
+
+
+_REACT_INDEX = _REACT_DIR / "index.html"
+# index.html only changes on deploy, so it is read once; with MALDOC_DEV set it
+# is re-checked on every request so edits show up without a restart
+_REACT_INDEX_RELOAD = bool(os.environ.get("MALDOC_DEV"))
+# (mtime_ns, html, etag) of the last index.html read
+_react_index_cache: tuple[int, str, str] | None = None
+
+
+def _react_index() -> tuple[str, str]:
+    """Return (html, etag) for the SPA entry page."""
+    global _react_index_cache
+    cached = _react_index_cache
+    if cached is not None and not _REACT_INDEX_RELOAD:
+        return cached[1], cached[2]
+    mtime_ns = _REACT_INDEX.stat().st_mtime_ns
+    if cached is None or cached[0] != mtime_ns:
+        data = _REACT_INDEX.read_bytes()
+        cached = (mtime_ns, data.decode("utf-8"), f'"{hashlib.blake2b(data, digest_size=8).hexdigest()}"')
+        _react_index_cache = cached
+    return cached[1], cached[2]
+
+
 @app.get("/", response_class=HTMLResponse)
-def home() -> HTMLResponse:
+def home(request: Request) -> Response:
     """Serve the React single-page application (default)."""
-    react_index = ROOT_DIR / "react" / "index.html"
-    return HTMLResponse(react_index.read_text())
+    html, etag = _react_index()
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return HTMLResponse(html, headers=headers)
 
 
 
@@ -171,27 +330,94 @@ def health() -> dict[str, str]:
     return {"status": "ok"}
 
 
+def _etagged_json(request: Request, payload: Any) -> Response:
+    """JSON response with a content-hash ETag; a matching If-None-Match gets an empty 304.
+
+    For endpoints the UI polls: unchanged data costs headers only, not the body.
+    """
+    body = orjson.dumps(payload, default=str, option=orjson.OPT_NON_STR_KEYS)
+    etag = f'"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
 @app.get("/api/metadata")
-def metadata() -> dict[str, Any]:
-    return {
-        "attack_mechanisms": ATTACK_MECHANISMS,
-        "scenario_labels": SCENARIO_LABELS,
-        "scenario_catalog": SCENARIO_CATALOG,
-        "agent_backend_agents": AGENT_BACKEND_AGENT_CATALOG,
-        "pipeline_run_root": str(PIPELINE_RUN_ROOT),
-        "default_demo_doc_ids": load_default_demo_doc_ids(),
-    }
+def metadata(request: Request) -> Response:
+    return _etagged_json(
+        request,
+        {
+            "attack_mechanisms": ATTACK_MECHANISMS,
+            "scenario_labels": SCENARIO_LABELS,
+            "scenario_catalog": SCENARIO_CATALOG,
+            "agent_backend_agents": AGENT_BACKEND_AGENT_CATALOG,
+            "pipeline_run_root": str(PIPELINE_RUN_ROOT),
+            "default_demo_doc_ids": load_default_demo_doc_ids(),
+        },
+    )
 
 
 PROJECT_ROOT = ROOT_DIR.parent.parent
+_PROJECT_ROOT_STR = str(PROJECT_ROOT)
+
+# Directory listings are cached per (root, directory mtimes); the TTL bucket
+# also expires entries whose change did not bump a watched directory's mtime
+# (e.g. a stage1 artifact written inside an existing doc directory)
+_LISTING_TTL_SECONDS = 1.0
+
+
+def _mtimes(*dirs: str | Path) -> tuple[int, ...]:
+    """mtime_ns of each directory (-1 if missing), used as a cache-key component."""
+    out = []
+    for d in dirs:
+        try:
+            out.append(os.stat(d).st_mtime_ns)
+        except OSError:
+            out.append(-1)
+    return tuple(out)
+
+
+def _ttl_bucket() -> int:
+    return int(time.monotonic() // _LISTING_TTL_SECONDS)
+
+
+@functools.lru_cache(maxsize=32)
+def _cached_pdf_candidates(root: str, mtimes: tuple[int, ...], ttl_bucket: int) -> tuple[str, ...]:
+    return tuple(list_pdf_candidates(root))
+
+
+@functools.lru_cache(maxsize=32)
+def _cached_processed_doc_dirs(root: str, mtimes: tuple[int, ...], ttl_bucket: int) -> tuple[Path, ...]:
+    return tuple(list_processed_doc_dirs(root))
+
+
+@functools.lru_cache(maxsize=32)
+def _cached_stage5_batch_reports(out_dir: str, mtimes: tuple[int, ...], ttl_bucket: int) -> tuple[dict[str, Any], ...]:
+    return tuple(list_stage5_batch_reports(out_dir))
+
+
+def _list_pdf_candidates(root: str) -> list[str]:
+    watched = [os.path.join(root, rel) for rel in ("pdfs/text_documents", "pdfs/sample", "pdfs")]
+    return list(_cached_pdf_candidates(root, _mtimes(*watched), _ttl_bucket()))
+
+
+def _list_processed_doc_dirs(root: str) -> list[Path]:
+    watched = Path(root) if Path(root).is_absolute() else Path.cwd() / root
+    return list(_cached_processed_doc_dirs(root, _mtimes(watched), _ttl_bucket()))
+
+
+def _list_stage5_batch_reports(out_dir: str) -> list[dict[str, Any]]:
+    watched = Path(out_dir) if Path(out_dir).is_absolute() else Path.cwd() / out_dir
+    return list(_cached_stage5_batch_reports(out_dir, _mtimes(watched), _ttl_bucket()))
 
 
 @app.get("/api/pdfs")
 def pdf_candidates(base_root: str = Query(".")) -> dict[str, Any]:
     try:
         # Resolve relative to project root so pdfs/text_documents is found
-        resolved = base_root if Path(base_root).is_absolute() else str(PROJECT_ROOT / base_root)
-        pdfs = list_pdf_candidates(resolved)
+        resolved = base_root if os.path.isabs(base_root) else os.path.join(_PROJECT_ROOT_STR, base_root)
+        pdfs = _list_pdf_candidates(resolved)
         return {"items": pdfs, "count": len(pdfs)}
     except Exception as exc:
         log.exception("Failed listing PDFs: %s", exc)
@@ -210,29 +436,36 @@ async def upload_pdf(file: UploadFile = File(...)) -> dict[str, Any]:
     if not filename.lower().endswith(".pdf"):
         raise HTTPException(status_code=400, detail="Only PDF files are accepted.")
     UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
-    # Avoid collisions by prefixing with short uuid
     safe_name = filename.replace(" ", "_")
     dest = UPLOAD_DIR / safe_name
-    if dest.exists():
-        stem = dest.stem
-        dest = UPLOAD_DIR / f"{stem}_{uuid.uuid4().hex[:6]}{dest.suffix}"
+    stem, suffix = dest.stem, dest.suffix
+    # Claim the name atomically (O_EXCL), so concurrent uploads of the same
+    # filename never overwrite each other; on a collision add a short uuid suffix
+    while True:
+        try:
+            fd = os.open(dest, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+            break
+        except FileExistsError:
+            dest = UPLOAD_DIR / f"{stem}_{uuid.uuid4().hex[:6]}{suffix}"
     try:
-        contents = await file.read()
-        dest.write_bytes(contents)
-        log.info("Uploaded PDF saved: %s (%d bytes)", dest, len(contents))
-        return {"path": str(dest.resolve()), "filename": dest.name, "size": len(contents)}
+        size = await _spool_upload(file, fd)
+        log.info("Uploaded PDF saved: %s (%d bytes)", dest, size)
+        return {"path": str(dest.resolve()), "filename": dest.name, "size": size}
+    except HTTPException:
+        dest.unlink(missing_ok=True)
+        raise
     except Exception as exc:
         log.exception("PDF upload failed: %s", exc)
+        dest.unlink(missing_ok=True)
         raise HTTPException(status_code=500, detail=str(exc))
 
 
 def _read_doc_domain(doc_dir: Path) -> str | None:
     """Read the domain field from stage2 analysis.json, if available."""
-    import json as _json
     analysis_path = doc_dir / "stage2" / "openai" / "analysis.json"
     if analysis_path.is_file():
         try:
-            data = _json.loads(analysis_path.read_text(encoding="utf-8"))
+            data = orjson.loads(analysis_path.read_bytes())
             return data.get("domain")
         except Exception:
             pass
@@ -240,10 +473,10 @@ def _read_doc_domain(doc_dir: Path) -> str | None:
 
 
 @app.get("/api/docs")
-def docs(base_root: str = Query(str(PIPELINE_RUN_ROOT))) -> dict[str, Any]:
+def docs(request: Request, base_root: str = Query(str(PIPELINE_RUN_ROOT))) -> Response:
     try:
         items = []
-        for doc_dir in list_processed_doc_dirs(base_root):
+        for doc_dir in _list_processed_doc_dirs(base_root):
             doc_id = doc_dir.name
             spec = resolve_scenario_for_doc(doc_id, doc_dir)
             items.append(
@@ -255,7 +488,7 @@ def docs(base_root: str = Query(str(PIPELINE_RUN_ROOT))) -> dict[str, Any]:
                     "domain": _read_doc_domain(doc_dir),
                 }
             )
-        return {"items": items, "count": len(items)}
+        return _etagged_json(request, {"items": items, "count": len(items)})
     except Exception as exc:
         log.exception("Failed listing docs: %s", exc)
         raise HTTPException(status_code=500, detail=str(exc))
@@ -264,10 +497,8 @@ def docs(base_root: str = Query(str(PIPELINE_RUN_ROOT))) -> dict[str, Any]:
 @app.get("/api/doc/{doc_id}/detail")
 def doc_detail(doc_id: str, base_root: str = Query(str(PIPELINE_RUN_ROOT))) -> dict[str, Any]:
     """Return enriched detail for a single pipeline run (for the drawer view)."""
-    import json as _json
     base_dir = Path(base_root) / doc_id
-    if not base_dir.is_dir():
-        raise HTTPException(status_code=404, detail=f"Document directory not found: {base_dir}")
+    _require_path(base_dir, is_dir=True, detail=f"Document directory not found: {base_dir}", status_code=404)
 
     result: dict[str, Any] = {
         "doc_id": doc_id,
@@ -282,7 +513,7 @@ def doc_detail(doc_id: str, base_root: str = Query(str(PIPELINE_RUN_ROOT))) -> d
     analysis_path = base_dir / "stage2" / "openai" / "analysis.json"
     if analysis_path.is_file():
         try:
-            data = _json.loads(analysis_path.read_text(encoding="utf-8"))
+            data = orjson.loads(analysis_path.read_bytes())
             result["analysis"] = {
                 "summary": data.get("summary"),
                 "domain": data.get("domain"),
@@ -296,7 +527,7 @@ def doc_detail(doc_id: str, base_root: str = Query(str(PIPELINE_RUN_ROOT))) -> d
     plan_path = base_dir / "stage3" / "openai" / "manipulation_plan.json"
     if plan_path.is_file():
         try:
-            data = _json.loads(plan_path.read_text(encoding="utf-8"))
+            data = orjson.loads(plan_path.read_bytes())
             result["plan"] = {
                 "document_threat_model": data.get("document_threat_model"),
                 "text_attack_count": len(data.get("text_attacks") or []),
@@ -312,8 +543,7 @@ def doc_detail(doc_id: str, base_root: str = Query(str(PIPELINE_RUN_ROOT))) -> d
 @app.get("/api/doc/{doc_id}/status")
 def doc_status(doc_id: str, base_root: str = Query(str(PIPELINE_RUN_ROOT))) -> dict[str, Any]:
     base_dir = Path(base_root) / doc_id
-    if not base_dir.is_dir():
-        raise HTTPException(status_code=404, detail=f"Document directory not found: {base_dir}")
+    _require_path(base_dir, is_dir=True, detail=f"Document directory not found: {base_dir}", status_code=404)
     return {
         "doc_id": doc_id,
         "base_dir": str(base_dir.resolve()),
@@ -330,19 +560,21 @@ def doc_scenario(doc_id: str) -> dict[str, Any]:
 
 
 @app.post("/api/pipeline/run")
-def run_pipeline(payload: PipelineRunRequest) -> dict[str, Any]:
+async def run_pipeline(payload: PipelineRunRequest) -> dict[str, Any]:
     api_key = _require_openai_api_key()
     try:
         pdf_path = Path(payload.pdf_path)
-        if not pdf_path.is_file():
-            raise HTTPException(status_code=400, detail=f"PDF not found: {pdf_path}")
+        _require_path(pdf_path, is_dir=False, detail=f"PDF not found: {pdf_path}")
 
         run_types = _normalize_run_types(payload.run_types)
 
-        base_dir, stage1 = run_stage1(pdf_path=pdf_path, out_root=payload.out_root, run_types=run_types)
-        stage2 = run_stage2(base_dir=base_dir, model=payload.stage2_model, api_key=api_key)
-        stage3 = run_stage3(base_dir=base_dir, model=payload.stage3_model, api_key=api_key)
-        stage4 = run_stage4_with_mechanism(
+        base_dir, stage1 = await _run_in_pipeline_pool(
+            run_stage1, pdf_path=pdf_path, out_root=payload.out_root, run_types=run_types
+        )
+        stage2 = await _run_in_pipeline_pool(run_stage2, base_dir=base_dir, model=payload.stage2_model, api_key=api_key)
+        stage3 = await _run_in_pipeline_pool(run_stage3, base_dir=base_dir, model=payload.stage3_model, api_key=api_key)
+        stage4 = await _run_in_pipeline_pool(
+            run_stage4_with_mechanism,
             base_dir=base_dir,
             source_pdf_path=pdf_path,
             attack_mechanism=payload.attack_mechanism,
@@ -366,14 +598,15 @@ def run_pipeline(payload: PipelineRunRequest) -> dict[str, Any]:
 
 
 @app.post("/api/pipeline/stage1")
-def run_pipeline_stage1(payload: PipelineStage1Request) -> dict[str, Any]:
+async def run_pipeline_stage1(payload: PipelineStage1Request) -> dict[str, Any]:
     try:
         pdf_path = Path(payload.pdf_path)
-        if not pdf_path.is_file():
-            raise HTTPException(status_code=400, detail=f"PDF not found: {pdf_path}")
+        _require_path(pdf_path, is_dir=False, detail=f"PDF not found: {pdf_path}")
 
         run_types = _normalize_run_types(payload.run_types)
-        base_dir, stage1 = run_stage1(pdf_path=pdf_path, out_root=payload.out_root, run_types=run_types)
+        base_dir, stage1 = await _run_in_pipeline_pool(
+            run_stage1, pdf_path=pdf_path, out_root=payload.out_root, run_types=run_types
+        )
         return {
             "doc_id": base_dir.name,
             "base_dir": str(base_dir.resolve()),
@@ -390,13 +623,14 @@ def run_pipeline_stage1(payload: PipelineStage1Request) -> dict[str, Any]:
 
 
 @app.post("/api/pipeline/stage2")
-def run_pipeline_stage2(payload: PipelineStage2Request) -> dict[str, Any]:
+async def run_pipeline_stage2(payload: PipelineStage2Request, force: bool = Query(False)) -> dict[str, Any]:
     api_key = _require_openai_api_key()
     try:
         base_dir = Path(payload.base_dir)
-        if not base_dir.is_dir():
-            raise HTTPException(status_code=400, detail=f"Base directory not found: {base_dir}")
-        stage2 = run_stage2(base_dir=base_dir, model=payload.stage2_model, api_key=api_key)
+        _require_path(base_dir, is_dir=True, detail=f"Base directory not found: {base_dir}")
+        stage2 = await _run_in_pipeline_pool(
+            run_stage2, base_dir=base_dir, model=payload.stage2_model, api_key=api_key, force=force
+        )
         return {
             "doc_id": base_dir.name,
             "base_dir": str(base_dir.resolve()),
@@ -411,13 +645,14 @@ def run_pipeline_stage2(payload: PipelineStage2Request) -> dict[str, Any]:
 
 
 @app.post("/api/pipeline/stage3")
-def run_pipeline_stage3(payload: PipelineStage3Request) -> dict[str, Any]:
+async def run_pipeline_stage3(payload: PipelineStage3Request, force: bool = Query(False)) -> dict[str, Any]:
     api_key = _require_openai_api_key()
     try:
         base_dir = Path(payload.base_dir)
-        if not base_dir.is_dir():
-            raise HTTPException(status_code=400, detail=f"Base directory not found: {base_dir}")
-        stage3 = run_stage3(base_dir=base_dir, model=payload.stage3_model, api_key=api_key)
+        _require_path(base_dir, is_dir=True, detail=f"Base directory not found: {base_dir}")
+        stage3 = await _run_in_pipeline_pool(
+            run_stage3, base_dir=base_dir, model=payload.stage3_model, api_key=api_key, force=force
+        )
         return {
             "doc_id": base_dir.name,
             "base_dir": str(base_dir.resolve()),
@@ -432,16 +667,15 @@ def run_pipeline_stage3(payload: PipelineStage3Request) -> dict[str, Any]:
 
 
 @app.post("/api/pipeline/stage4")
-def run_pipeline_stage4(payload: PipelineStage4Request) -> dict[str, Any]:
+async def run_pipeline_stage4(payload: PipelineStage4Request) -> dict[str, Any]:
     try:
         base_dir = Path(payload.base_dir)
         source_pdf_path = Path(payload.source_pdf_path)
-        if not base_dir.is_dir():
-            raise HTTPException(status_code=400, detail=f"Base directory not found: {base_dir}")
-        if not source_pdf_path.is_file():
-            raise HTTPException(status_code=400, detail=f"Source PDF not found: {source_pdf_path}")
+        _require_path(base_dir, is_dir=True, detail=f"Base directory not found: {base_dir}")
+        _require_path(source_pdf_path, is_dir=False, detail=f"Source PDF not found: {source_pdf_path}")
 
-        stage4 = run_stage4_with_mechanism(
+        stage4 = await _run_in_pipeline_pool(
+            run_stage4_with_mechanism,
             base_dir=base_dir,
             source_pdf_path=source_pdf_path,
             attack_mechanism=payload.attack_mechanism,
@@ -467,19 +701,36 @@ def run_pipeline_stage4(payload: PipelineStage4Request) -> dict[str, Any]:
         raise HTTPException(status_code=500, detail=str(exc))
 
 
+# PDFs up to this size are previewed from one in-memory read; larger ones are
+# streamed by FileResponse
+PREVIEW_INLINE_MAX_BYTES = 8 << 20
+# Behind nginx, set to an internal location aliased to "/" (e.g. "/_maldoc_files")
+# and large previews are handed to nginx via X-Accel-Redirect, which serves them
+# with sendfile(2) instead of streaming them through Python
+PREVIEW_ACCEL_PREFIX = os.environ.get("MALDOC_PREVIEW_ACCEL_PREFIX", "").rstrip("/")
+
+
 @app.get("/api/files/preview")
-def preview_file(path: str = Query(...)) -> FileResponse:
+def preview_file(path: str = Query(...)) -> Response:
     try:
         target = _resolve_local_file(path)
-        if not target.is_file():
-            raise HTTPException(status_code=404, detail=f"File not found: {target}")
+        st = _require_path(target, is_dir=False, detail=f"File not found: {target}", status_code=404)
         if target.suffix.lower() != ".pdf":
             raise HTTPException(status_code=400, detail="Only PDF preview is supported.")
+        headers = {"Content-Disposition": f'inline; filename="{target.name}"'}
+        if st.st_size <= PREVIEW_INLINE_MAX_BYTES:
+            return Response(content=target.read_bytes(), media_type="application/pdf", headers=headers)
+        if PREVIEW_ACCEL_PREFIX:
+            headers["X-Accel-Redirect"] = PREVIEW_ACCEL_PREFIX + urllib.parse.quote(target.as_posix())
+            return Response(media_type="application/pdf", headers=headers)
+        # FileResponse uses the ASGI pathsend extension (zero-copy) on servers
+        # that offer it and a chunked read loop otherwise
         return FileResponse(
             path=target,
             media_type="application/pdf",
             filename=target.name,
-            headers={"Content-Disposition": f'inline; filename="{target.name}"'},
+            headers=headers,
+            stat_result=st,
         )
     except HTTPException:
         raise
@@ -491,22 +742,23 @@ def preview_file(path: str = Query(...)) -> FileResponse:
 @app.get("/api/files/content")
 def content_file(path: str = Query(...), max_chars: int = Query(default=40000)) -> dict[str, Any]:
     """Return the text/JSON content of a file for inline inspection in the UI."""
-    import json as _json
     try:
         target = _resolve_local_file(path)
-        if not target.is_file():
-            raise HTTPException(status_code=404, detail=f"File not found: {target}")
+        st = _require_path(target, is_dir=False, detail=f"File not found: {target}", status_code=404)
         allowed_suffixes = {".txt", ".md", ".json", ".log", ".csv"}
         if target.suffix.lower() not in allowed_suffixes:
             raise HTTPException(status_code=400, detail=f"Inspection not supported for {target.suffix} files.")
-        raw = target.read_text(encoding="utf-8", errors="replace")
+        # Read at most max_chars + 1 characters: enough to tell whether the
+        # file was truncated without loading the rest of a large log
+        with target.open("r", encoding="utf-8", errors="replace") as fh:
+            raw = fh.read(max_chars + 1)
         truncated = len(raw) > max_chars
         content = raw[:max_chars] if truncated else raw
         content_type = "json" if target.suffix.lower() == ".json" else "text"
         if content_type == "json":
             try:
-                parsed = _json.loads(content)
-                content = _json.dumps(parsed, indent=2)
+                parsed = orjson.loads(content)
+                content = orjson.dumps(parsed, option=orjson.OPT_INDENT_2).decode()
             except Exception:
                 content_type = "text"
         return {
@@ -514,7 +766,7 @@ def content_file(path: str = Query(...), max_chars: int = Query(default=40000))
             "filename": target.name,
             "content": content,
             "content_type": content_type,
-            "char_count": len(raw),
+            "byte_count": st.st_size,
             "truncated": truncated,
         }
     except HTTPException:
@@ -580,16 +832,23 @@ async def stage5_prepare_upload(
         _require_pdf_upload(original_pdf, "Original document")
         _require_pdf_upload(adversarial_pdf, "Adversarial document")
 
-        original_bytes = await original_pdf.read()
-        adversarial_bytes = await adversarial_pdf.read()
-        if not original_bytes:
+        # Stream both uploads to disk concurrently; memory stays bounded by the chunk size
+        spools = [
+            asyncio.ensure_future(_spool_upload(original_pdf, original_tmp)),
+            asyncio.ensure_future(_spool_upload(adversarial_pdf, adversarial_tmp)),
+        ]
+        try:
+            original_size, adversarial_size = await asyncio.gather(*spools)
+        except BaseException:
+            # e.g. one file hit the size cap: stop writing the other one too
+            for spool in spools:
+                spool.cancel()
+            raise
+        if not original_size:
             raise HTTPException(status_code=400, detail="Original document is empty.")
-        if not adversarial_bytes:
+        if not adversarial_size:
             raise HTTPException(status_code=400, detail="Adversarial document is empty.")
 
-        original_tmp.write_bytes(original_bytes)
-        adversarial_tmp.write_bytes(adversarial_bytes)
-
         return prepare_stage5_uploaded_docs(
             scenario=scenario,
             original_pdf_path=original_tmp,
@@ -623,11 +882,12 @@ async def stage5_prepare_upload(
 
 
 @app.post("/api/stage5/doc")
-def stage5_doc(payload: Stage5DocRequest) -> dict[str, Any]:
+async def stage5_doc(payload: Stage5DocRequest) -> dict[str, Any]:
     api_key = _require_openai_api_key()
     try:
         base_dir = Path(payload.base_dir)
-        result = run_stage5_doc_eval(
+        result = await _run_in_pipeline_pool(
+            run_stage5_doc_eval,
             base_dir=base_dir,
             scenario=payload.scenario,
             adv_pdf=payload.adv_pdf,
@@ -635,6 +895,7 @@ def stage5_doc(payload: Stage5DocRequest) -> dict[str, Any]:
             trials=payload.trials,
             out_subdir=payload.out_subdir,
             api_key=api_key,
+            cache_trials=payload.cache_trials,
         )
         human_summary = summarize_doc_run_for_humans(result.get("doc_result") or {})
         return {
@@ -647,10 +908,11 @@ def stage5_doc(payload: Stage5DocRequest) -> dict[str, Any]:
 
 
 @app.post("/api/stage5/batch")
-def stage5_batch(payload: Stage5BatchRequest) -> dict[str, Any]:
+async def stage5_batch(payload: Stage5BatchRequest) -> dict[str, Any]:
     api_key = _require_openai_api_key()
     try:
-        result = run_stage5_batch_eval(
+        result = await _run_in_pipeline_pool(
+            run_stage5_batch_eval,
             base_root=payload.base_root,
             doc_ids=payload.doc_ids,
             model=payload.model,
@@ -686,7 +948,7 @@ def runs_docs(base_root: str = Query(str(PIPELINE_RUN_ROOT))) -> dict[str, Any]:
 @app.get("/api/runs/batch")
 def runs_batch(out_dir: str = Query("stage5_runs")) -> dict[str, Any]:
     try:
-        rows = list_stage5_batch_reports(out_dir)
+        rows = _list_stage5_batch_reports(out_dir)
         return {"items": rows, "count": len(rows)}
     except Exception as exc:
         log.exception("Failed loading batch reports: %s", exc)
@@ -705,27 +967,48 @@ class StructureDiffsRequest(BaseModel):
     model: str = "gpt-4o"
 
 
+@functools.lru_cache(maxsize=1)
+def _async_openai_client(api_key: str) -> AsyncOpenAI:
+    """Process-wide AsyncOpenAI client, so its connection pool (and TLS sessions) is reused across requests."""
+    return AsyncOpenAI(
+        api_key=api_key,
+        http_client=httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+            timeout=httpx.Timeout(600.0, connect=10.0),
+        ),
+    )
+
+
+@functools.lru_cache(maxsize=64)
+def _extract_pdf_text_cached(path: str, mtime_ns: int, size: int) -> str:
+    # Plain text without ligature/whitespace preservation; the mediabox clip
+    # stays so off-page text is still excluded, as with the default flags
+    with pymupdf.open(path) as doc:
+        parts: list[str] = [""] * doc.page_count
+        for i in range(doc.page_count):
+            parts[i] = doc.load_page(i).get_text("text", flags=pymupdf.TEXT_MEDIABOX_CLIP)
+    return "\n".join(parts)
+
+
+def _extract_pdf_text(pdf_path: Path) -> str:
+    """Plain text of a PDF ("" if missing or unreadable), cached until the file changes."""
+    try:
+        st = pdf_path.stat()
+    except OSError:
+        return ""
+    try:
+        return _extract_pdf_text_cached(str(pdf_path), st.st_mtime_ns, st.st_size)
+    except Exception:
+        return ""
+
+
 @app.post("/api/eval/qa")
-def eval_qa(payload: EvalQARequest) -> dict[str, Any]:
+async def eval_qa(payload: EvalQARequest) -> dict[str, Any]:
     """Run QA evaluation on both original and adversarial PDFs using GPT."""
-    api_key = _require_openai_api_key()
-    import fitz  # PyMuPDF
-    from openai import OpenAI
-    import json as json_module
-
+    client = _async_openai_client(_require_openai_api_key())
     base_dir = Path(payload.base_dir)
-    client = OpenAI(api_key=api_key)
-
-    def extract_text(pdf_path: Path) -> str:
-        if not pdf_path.exists():
-            return ""
-        try:
-            doc = fitz.open(str(pdf_path))
-            return "\n".join(page.get_text() for page in doc)
-        except Exception:
-            return ""
 
-    def ask_gpt(doc_text: str, questions: list[str]) -> list[dict]:
+    async def ask_gpt(doc_text: str, questions: list[str]) -> list[dict]:
         if not doc_text.strip():
             return [{"question": q, "answer": "Document text unavailable."} for q in questions]
         q_block = "\n".join(f"{i + 1}. {q}" for i, q in enumerate(questions))
@@ -735,7 +1018,7 @@ def eval_qa(payload: EvalQARequest) -> dict[str, Any]:
             f"DOCUMENT:\n{doc_text[:25000]}\n\nQUESTIONS:\n{q_block}"
         )
         try:
-            resp = client.chat.completions.create(
+            resp = await client.chat.completions.create(
                 model=payload.model,
                 messages=[
                     {
@@ -750,7 +1033,7 @@ def eval_qa(payload: EvalQARequest) -> dict[str, Any]:
                 response_format={"type": "json_object"},
                 max_completion_tokens=2000,
             )
-            data = json_module.loads(resp.choices[0].message.content)
+            data = orjson.loads(resp.choices[0].message.content)
             return data.get("answers", [])
         except Exception as exc:
             log.warning("QA GPT call failed: %s", exc)
@@ -764,10 +1047,17 @@ def eval_qa(payload: EvalQARequest) -> dict[str, Any]:
     adv_path = next((p for p in adv_candidates if p.exists()), adv_candidates[0])
 
     orig_path = base_dir / "original.pdf"
-    orig_text = extract_text(orig_path)
-    adv_text  = extract_text(adv_path)
-    orig_answers = ask_gpt(orig_text, payload.questions)
-    adv_answers  = ask_gpt(adv_text,  payload.questions)
+    # Both documents are independent: extract them, then query them, concurrently.
+    # Each is asked in its own request so neither document can leak into the
+    # other's answers
+    orig_text, adv_text = await asyncio.gather(
+        asyncio.to_thread(_extract_pdf_text, orig_path),
+        asyncio.to_thread(_extract_pdf_text, adv_path),
+    )
+    orig_answers, adv_answers = await asyncio.gather(
+        ask_gpt(orig_text, payload.questions),
+        ask_gpt(adv_text, payload.questions),
+    )
 
     return {
         "original":    {"answers": orig_answers, "doc_exists": orig_path.exists()},
@@ -776,17 +1066,13 @@ def eval_qa(payload: EvalQARequest) -> dict[str, Any]:
 
 
 @app.post("/api/eval/structure-diffs")
-def structure_diffs_endpoint(payload: StructureDiffsRequest) -> dict[str, Any]:
+async def structure_diffs_endpoint(payload: StructureDiffsRequest) -> dict[str, Any]:
     """Use GPT to structure and explain field-level diffs in human-readable form."""
-    api_key = _require_openai_api_key()
-    from openai import OpenAI
-    import json as json_module
-
-    client = OpenAI(api_key=api_key)
-    diffs_json = json_module.dumps(payload.field_diffs, indent=2)
+    client = _async_openai_client(_require_openai_api_key())
+    diffs_json = orjson.dumps(payload.field_diffs, option=orjson.OPT_INDENT_2).decode()
 
     try:
-        resp = client.chat.completions.create(
+        resp = await client.chat.completions.create(
             model=payload.model,
             messages=[
                 {
@@ -805,34 +1091,42 @@ def structure_diffs_endpoint(payload: StructureDiffsRequest) -> dict[str, Any]:
             response_format={"type": "json_object"},
             max_completion_tokens=2000,
         )
-        data = json_module.loads(resp.choices[0].message.content)
+        data = orjson.loads(resp.choices[0].message.content)
         return {"structured_fields": data.get("structured_fields", [])}
     except Exception as exc:
         log.warning("Structure diffs GPT call failed: %s", exc)
         return {"structured_fields": []}
 
 
-_EVAL_QA_CACHE: dict[str, Any] | None = None
+# (mtime_ns of eval_pdf_qa.json, entries keyed by lower-cased doc ID)
+_EVAL_QA_CACHE: tuple[int, dict[str, Any]] | None = None
 _EVAL_QA_PATH = PROJECT_ROOT / "eval_pdf_qa.json"
 
 
 def _load_eval_qa() -> dict[str, Any]:
+    """Load eval_pdf_qa.json keyed by lower-cased doc ID, re-reading it only when it changes."""
     global _EVAL_QA_CACHE
-    if _EVAL_QA_CACHE is None:
-        try:
-            import json as _j
-            _EVAL_QA_CACHE = _j.loads(_EVAL_QA_PATH.read_text()) if _EVAL_QA_PATH.exists() else {}
-        except Exception:
-            _EVAL_QA_CACHE = {}
-    return _EVAL_QA_CACHE
+    try:
+        mtime_ns = _EVAL_QA_PATH.stat().st_mtime_ns
+    except OSError:
+        return {}
+    cached = _EVAL_QA_CACHE
+    if cached is not None and cached[0] == mtime_ns:
+        return cached[1]
+    try:
+        raw = orjson.loads(_EVAL_QA_PATH.read_bytes())
+        db = {str(k).lower(): v for k, v in raw.items()} if isinstance(raw, dict) else {}
+    except Exception:
+        db = {}
+    _EVAL_QA_CACHE = (mtime_ns, db)
+    return db
 
 
 @app.get("/api/eval/preloaded-qa")
 def preloaded_qa(doc_id: str = Query(...)) -> dict[str, Any]:
     """Return preloaded QA questions and ground-truth answers for a document by its ID/filename stem."""
-    db = _load_eval_qa()
-    # Try exact key match first, then case-insensitive
-    entry = db.get(doc_id) or db.get(doc_id.lower())
+    # Keys are normalised at load time, so the lookup is case-insensitive
+    entry = _load_eval_qa().get(doc_id.lower())
     if not entry:
         return {"found": False, "doc_id": doc_id, "questions": []}
 
@@ -64,8 +64,8 @@ def run_analysis(pdf_path: str, query: str):
     print("\n📊 EXECUTION TRACE")
     print("─" * 80)
     for step in result.trace.steps:
-        step_name = step["step"]
-        data = step["data"]
+        step_name = step.step
+        data = step.data
         
         if step_name == "perception":
             print(f"  1. 📄 Parsed: {data['pages']} pages, {data['characters']:,} chars")
@@ -2,4 +2,17 @@
 Multi-Agent Supervisor Architecture for PDF Document Analysis.
 """
 
+import logging
+import sys
+
 __version__ = "1.0.0"
+
+# Verbose progress output from the orchestrator, router and agents goes
+# through the "src" logger; print it to stdout as plain messages, once
+_logger = logging.getLogger(__name__)
+if not _logger.handlers:
+    _handler = logging.StreamHandler(sys.stdout)
+    _handler.setFormatter(logging.Formatter("%(message)s"))
+    _logger.addHandler(_handler)
+    _logger.setLevel(logging.INFO)
+    _logger.propagate = False
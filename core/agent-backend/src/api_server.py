@@ -4,7 +4,6 @@ Provides REST and WebSocket endpoints for PDF document analysis.
 """
 
 import os
-import shutil
 import tempfile
 from pathlib import Path
 
@@ -17,11 +16,15 @@ load_dotenv(_project_root / ".env")
 from fastapi import FastAPI, WebSocket, HTTPException, UploadFile, File, Form
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
-from typing import List
+from typing import Any, Callable, Dict, Hashable, List
 import asyncio
 import json
+import time
 from datetime import datetime
 
+import orjson
+
+from src.cache import content_hash
 from src.multi_agent_orchestrator import create_orchestrator
 
 app = FastAPI(
@@ -41,6 +44,30 @@ app.add_middleware(
 # Global orchestrator
 orchestrator = None
 
+# Uploads up to this size are parsed from memory; larger ones are
+# copied to a temp file in chunks of UPLOAD_CHUNK_SIZE
+IN_MEMORY_UPLOAD_MAX_BYTES = 10 * 1024 * 1024
+UPLOAD_CHUNK_SIZE = 1 << 20
+
+# In-flight executions shared by concurrent identical requests
+_inflight: Dict[Hashable, "asyncio.Future[Any]"] = {}
+
+
+async def _run_coalesced(key: Hashable, func: Callable[..., Any], *args: Any) -> Any:
+    """
+    Run a blocking call in a worker thread, sharing it with identical concurrent requests.
+
+    Requests with the same key that arrive while a call is in flight await
+    its result instead of issuing their own LLM calls.
+    """
+    future = _inflight.get(key)
+    if future is None:
+        future = asyncio.ensure_future(asyncio.to_thread(func, *args))
+        _inflight[key] = future
+        future.add_done_callback(lambda _: _inflight.pop(key, None))
+    # Shield so one client disconnecting does not cancel the shared call
+    return await asyncio.shield(future)
+
 
 # ── Request / Response Models ──────────────────────────────────────────────────
 
@@ -67,6 +94,8 @@ async def startup_event():
     global orchestrator
     print("🚀 Initializing Multi-Agent Orchestrator...")
     orchestrator = create_orchestrator(verbose=False)
+    orchestrator.warm_agents()
+    await asyncio.to_thread(orchestrator.warm_connections)
     print("✅ Orchestrator ready")
 
 
@@ -101,15 +130,23 @@ async def analyze_pdf(
     if not file.filename.lower().endswith(".pdf"):
         raise HTTPException(status_code=400, detail="Only PDF files are supported")
 
-    # Save upload to temp file
-    tmp = tempfile.NamedTemporaryFile(delete=False, suffix=".pdf")
+    # Small uploads are parsed straight from memory; larger ones spill to a temp file
+    tmp_path = None
     try:
-        shutil.copyfileobj(file.file, tmp)
-        tmp.close()
-
-        start = datetime.now()
-        result = orchestrator.process(pdf_path=tmp.name, query=query)
-        elapsed_ms = (datetime.now() - start).total_seconds() * 1000
+        if file.size is not None and file.size <= IN_MEMORY_UPLOAD_MAX_BYTES:
+            pdf_path = file.filename
+            pdf_bytes = await file.read()
+        else:
+            pdf_bytes = None
+            with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp:
+                tmp_path = pdf_path = tmp.name
+                # Stream the upload in chunks; disk writes run off the event loop
+                while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                    await asyncio.to_thread(tmp.write, chunk)
+
+        start = time.perf_counter()
+        result = await orchestrator.aprocess(pdf_path=pdf_path, query=query, pdf_bytes=pdf_bytes)
+        elapsed_ms = (time.perf_counter() - start) * 1000
 
         return AnalyzeResponse(
             answer=result.answer,
@@ -117,12 +154,13 @@ async def analyze_pdf(
             evidence=result.evidence,
             routed_domain=result.routing_decision.primary_domain.value if result.routing_decision else "general",
             execution_time_ms=round(elapsed_ms, 1),
-            trace=result.trace.steps
+            trace=[step.to_dict() for step in result.trace.steps]
         )
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
     finally:
-        os.unlink(tmp.name)
+        if tmp_path:
+            os.unlink(tmp_path)
 
 
 # ── Text-Only Endpoint (no file upload) ───────────────────────────────────────
@@ -141,25 +179,15 @@ async def analyze_text(request: AnalyzeRequest):
         raise HTTPException(status_code=503, detail="Orchestrator not initialized")
 
     try:
-        start = datetime.now()
-
-        # Use the router + agent directly with raw text
-        supervisor = orchestrator.supervisor
+        start = time.perf_counter()
 
-        # Analyze and route
-        doc_analysis = supervisor.analyze_document(request.document_text)
-        routing = supervisor.route(request.query, request.document_text, doc_analysis)
-
-        # Dynamically spawn and execute a single domain agent
-        agent = orchestrator._create_agent(routing.primary_domain)
-        agent_result = agent.process(
-            query=request.query,
-            document_content=request.document_text,
-            context={"document_type": doc_analysis.document_type}
+        # Route + execute off the event loop; identical concurrent requests share one run
+        key = (content_hash(request.query), content_hash(request.document_text))
+        routing, agent_result = await _run_coalesced(
+            key, orchestrator.process_text, request.document_text, request.query
         )
-        del agent
 
-        elapsed_ms = (datetime.now() - start).total_seconds() * 1000
+        elapsed_ms = (time.perf_counter() - start) * 1000
 
         return AnalyzeResponse(
             answer=agent_result.answer,
@@ -186,6 +214,10 @@ async def websocket_analyze(websocket: WebSocket):
     await websocket.accept()
 
     try:
+        if not orchestrator:
+            await websocket.send_json({"type": "error", "message": "Orchestrator not initialized"})
+            return
+
         data = await websocket.receive_text()
         request = json.loads(data)
         pdf_path = request.get("pdf_path", "")
@@ -195,22 +227,10 @@ async def websocket_analyze(websocket: WebSocket):
             await websocket.send_json({"type": "error", "message": "pdf_path and query required"})
             return
 
-        # Run orchestrator (verbose mode will print, but we capture trace)
-        orch = create_orchestrator(verbose=False)
-        result = orch.process(pdf_path=pdf_path, query=query)
-
-        # Stream trace steps
-        for step in result.trace.steps:
-            await websocket.send_json({"type": "step", **step})
-            await asyncio.sleep(0.05)  # Small delay for visual effect
-
-        # Final result
-        await websocket.send_json({
-            "type": "complete",
-            "answer": result.answer,
-            "confidence": result.confidence,
-            "evidence": result.evidence,
-        })
+        # Reuse the shared orchestrator and forward trace events as they occur
+        # (encoded once with orjson, still sent as text frames)
+        async for event in orchestrator.aprocess_stream(pdf_path=pdf_path, query=query):
+            await websocket.send_text(orjson.dumps(event, default=str).decode())
 
     except Exception as e:
         try:
@@ -230,4 +250,17 @@ if __name__ == "__main__":
     print("📍 WebSocket:    ws://localhost:8000/analyze-stream")
     print("📍 API Docs:     http://localhost:8000/docs")
 
-    uvicorn.run(app, host="0.0.0.0", port=8000, log_level="info")
+    # Multiple workers need an import string rather than the app object.
+    # Each worker has its own rate limiter and caches, so API_WORKERS=N
+    # also multiplies the OPENAI_TPM/RPM budget; one worker by default.
+    # loop="auto" uses uvloop when installed (it is not on Windows)
+    uvicorn.run(
+        "src.api_server:app",
+        host="0.0.0.0",
+        port=8000,
+        loop="auto",
+        http="httptools",
+        log_level="warning",
+        access_log=False,
+        workers=int(os.environ.get("API_WORKERS", "1")),
+    )
@@ -0,0 +1,157 @@
+"""
+Cache Utilities
+===============
+Small in-process caches shared by the perception, routing and agent layers.
+
+LLM calls dominate request latency, so identical inputs (same document
+content, same query) are served from memory instead of re-calling the API.
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional, Tuple
+
+# On-disk caches (parsed documents, persisted LLM responses) live here
+DEFAULT_CACHE_DIR = os.environ.get("DOCUMIND_CACHE_DIR", ".documind_cache")
+
+_MISSING = object()
+
+
+def content_hash(text: str) -> str:
+    """Return a stable hex digest for a piece of text (used as a cache key)."""
+    return hashlib.sha256(text.encode("utf-8", "surrogatepass")).hexdigest()
+
+
+class LRUCache:
+    """
+    Bounded, thread-safe least-recently-used cache.
+
+    Once `maxsize` entries are stored, the least recently read or written
+    entry is evicted on the next insert. If `ttl` (seconds) is set, entries
+    older than that are treated as missing. If `maxbytes` is set, entries
+    are also evicted until the total of `sizeof(value)` fits within it
+    (`maxsize=None` bounds the cache by bytes alone).
+    """
+
+    def __init__(self, maxsize: Optional[int] = 128, ttl: Optional[float] = None,
+                 maxbytes: Optional[int] = None,
+                 sizeof: Optional[Callable[[Any], int]] = None):
+        if maxbytes is not None and sizeof is None:
+            raise ValueError("maxbytes requires a sizeof function")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.maxbytes = maxbytes
+        self.sizeof = sizeof
+        self._data: "OrderedDict[Hashable, Tuple[float, Any, int]]" = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Optional[Any] = None) -> Any:
+        """Return the cached value for key (marking it recently used), or default."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            stored_at, value, nbytes = entry
+            if self.ttl is not None and time.monotonic() - stored_at > self.ttl:
+                del self._data[key]
+                self._total_bytes -= nbytes
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def put(self, key: Hashable, value: Any):
+        """Store a value, evicting the least recently used entry if full."""
+        nbytes = self.sizeof(value) if self.sizeof is not None else 0
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self._total_bytes -= old[2]
+            self._data[key] = (time.monotonic(), value, nbytes)
+            self._total_bytes += nbytes
+            while self._data and (
+                (self.maxsize is not None and len(self._data) > self.maxsize)
+                or (self.maxbytes is not None and self._total_bytes > self.maxbytes)
+            ):
+                _, (_, _, evicted_bytes) = self._data.popitem(last=False)
+                self._total_bytes -= evicted_bytes
+
+    def clear(self):
+        """Remove all entries."""
+        with self._lock:
+            self._data.clear()
+            self._total_bytes = 0
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
+
+    @property
+    def total_bytes(self) -> int:
+        """Sum of sizeof() over the cached values (0 without a sizeof)."""
+        with self._lock:
+            return self._total_bytes
+
+
+class SQLiteCache:
+    """
+    Persistent string cache stored in a SQLite file.
+
+    Shared by every process that opens the same path, so results survive
+    restarts and repeated runs. Best effort: the database is created on
+    first use, and any SQLite/OS error behaves like a miss (get) or is
+    ignored (put). Entries older than `ttl` seconds are treated as missing.
+    """
+
+    def __init__(self, path: str, ttl: Optional[float] = None):
+        self.path = path
+        self.ttl = ttl
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path) or ".", mode=0o700, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value TEXT NOT NULL, ts REAL NOT NULL)"
+            )
+            self._conn = conn
+        return self._conn
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the stored value for key, or None if missing or expired."""
+        try:
+            with self._lock:
+                row = self._connection().execute(
+                    "SELECT value, ts FROM cache WHERE key = ?", (key,)
+                ).fetchone()
+        except (sqlite3.Error, OSError):
+            return None
+        if row is None:
+            return None
+        value, stored_at = row
+        if self.ttl is not None and time.time() - stored_at > self.ttl:
+            return None
+        return value
+
+    def put(self, key: str, value: str):
+        """Store (or replace) a value."""
+        try:
+            with self._lock:
+                conn = self._connection()
+                with conn:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO cache (key, value, ts) VALUES (?, ?, ?)",
+                        (key, value, time.time()),
+                    )
+        except (sqlite3.Error, OSError):
+            pass
@@ -0,0 +1,53 @@
+"""
+OpenAI Clients
+==============
+Process-wide OpenAI clients shared by the router and domain agents.
+
+Every client owns an httpx connection pool, so sharing one per API key
+lets all agents reuse the same keep-alive connections instead of each
+paying its own TLS handshakes.
+"""
+
+import asyncio
+import functools
+import threading
+import weakref
+from typing import Dict
+
+import httpx
+from openai import AsyncOpenAI, OpenAI
+
+_ASYNC_CLIENTS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, AsyncOpenAI]]" = (
+    weakref.WeakKeyDictionary()
+)
+_ASYNC_CLIENTS_LOCK = threading.Lock()
+
+
+@functools.lru_cache(maxsize=None)
+def get_openai_client(api_key: str) -> OpenAI:
+    """Return the shared synchronous client for an API key."""
+    return OpenAI(
+        api_key=api_key,
+        http_client=httpx.Client(
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20)
+        ),
+    )
+
+
+def get_async_openai_client(api_key: str) -> AsyncOpenAI:
+    """
+    Return the shared AsyncOpenAI client for an API key on the running loop.
+
+    Async connections are bound to the event loop that opened them, so
+    clients are kept per loop and dropped when the loop is garbage collected.
+    """
+    loop = asyncio.get_running_loop()
+    with _ASYNC_CLIENTS_LOCK:
+        clients = _ASYNC_CLIENTS.setdefault(loop, {})
+        client = clients.get(api_key)
+        if client is None:
+            client = clients[api_key] = AsyncOpenAI(
+                api_key=api_key,
+                http_client=httpx.AsyncClient(limits=httpx.Limits(max_connections=64)),
+            )
+        return client
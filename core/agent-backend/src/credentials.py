@@ -0,0 +1,30 @@
+"""
+Credentials
+===========
+OpenAI API key resolution shared by the orchestrator, router and domain agents.
+"""
+
+import functools
+import os
+
+
+@functools.lru_cache(maxsize=None)
+def resolve_api_key() -> str:
+    """
+    Get the OpenAI API key from the environment or keyring.
+
+    The result is cached for the life of the process, so the (potentially
+    slow, DBus-backed) keyring lookup happens at most once. Failures are
+    not cached.
+    """
+    key = os.environ.get("OPENAI_API_KEY")
+    if key:
+        return key
+    try:
+        import keyring
+        key = keyring.get_password("openai", "api_key")
+        if key:
+            return key
+    except ImportError:
+        pass
+    raise ValueError("No OpenAI API key found. Set OPENAI_API_KEY or use keyring.")
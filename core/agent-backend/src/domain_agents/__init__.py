@@ -2,17 +2,31 @@
 Domain Agents Package
 =====================
 Specialized worker agents for different business domains.
+
+Agent classes are imported lazily on first attribute access, so importing
+the base module does not load every domain agent.
 """
 
+import importlib
+import threading
+import weakref
+from typing import Optional, Tuple
+
+from ..credentials import resolve_api_key
 from .base import BaseDomainAgent, AgentResult, ToolCall
-from .healthcare import HealthcareAgent
-from .finance import FinanceAgent
-from .hr import HRAgent
-from .insurance import InsuranceAgent
-from .education import EducationAgent
-from .political import PoliticalAgent
+
+# Agent class name -> defining submodule
+_AGENT_MODULES = {
+    "HealthcareAgent": "healthcare",
+    "FinanceAgent": "finance",
+    "HRAgent": "hr",
+    "InsuranceAgent": "insurance",
+    "EducationAgent": "education",
+    "PoliticalAgent": "political",
+}
 
 __all__ = [
+    "get_agent",
     "BaseDomainAgent",
     "AgentResult", 
     "ToolCall",
@@ -23,3 +37,45 @@ __all__ = [
     "EducationAgent",
     "PoliticalAgent"
 ]
+
+
+def __getattr__(name):
+    module_name = _AGENT_MODULES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module = importlib.import_module(f".{module_name}", __name__)
+    return getattr(module, name)
+
+
+# Live agents by (domain, api_key, max_iterations, verbose); dropped once unused
+_AGENT_CACHE: "weakref.WeakValueDictionary[Tuple[str, str, int, bool], BaseDomainAgent]" = (
+    weakref.WeakValueDictionary()
+)
+_AGENT_CACHE_LOCK = threading.Lock()
+
+
+def get_agent(domain: str, api_key: Optional[str] = None, *, max_iterations: int = 5,
+              verbose: bool = False) -> BaseDomainAgent:
+    """
+    Return the shared agent for a domain, creating it if no caller holds one.
+    
+    Agents are stateless between queries, so callers asking for the same
+    domain and settings get the same instance (and its task cache).
+    
+    Args:
+        domain: Domain name, e.g. "finance" (the agent's submodule name)
+        api_key: OpenAI API key (resolved from env/keyring if omitted)
+        max_iterations: Maximum ReAct loop iterations
+        verbose: Log the ReAct loop
+    """
+    class_name = next((name for name, module in _AGENT_MODULES.items() if module == domain), None)
+    if class_name is None:
+        raise ValueError(f"Unknown domain: {domain!r}")
+    key = (domain, api_key or resolve_api_key(), max_iterations, verbose)
+    with _AGENT_CACHE_LOCK:
+        agent = _AGENT_CACHE.get(key)
+        if agent is None:
+            agent_class = __getattr__(class_name)
+            agent = agent_class(api_key=key[1], max_iterations=max_iterations, verbose=verbose)
+            _AGENT_CACHE[key] = agent
+        return agent
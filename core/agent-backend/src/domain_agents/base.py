@@ -5,25 +5,242 @@ Abstract base class for all domain-specific worker agents.
 Implements the ReAct (Reasoning + Acting) pattern for tool calling.
 """
 
+import asyncio
+import dataclasses
+import functools
+import importlib.resources
+from concurrent.futures import ThreadPoolExecutor
 import json
+import logging
 import os
+import re
+import string
+import tempfile
+import threading
+import time
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
-from typing import List, Dict, Any, Optional, Callable
+from typing import List, Dict, Any, Optional, Callable, Tuple, Union
 from enum import Enum
-from openai import OpenAI
 
+import orjson
+from openai import AsyncOpenAI, RateLimitError
 
-@dataclass
+from ..cache import LRUCache, content_hash
+from ..clients import get_async_openai_client, get_openai_client
+from ..credentials import resolve_api_key
+
+try:
+    import tiktoken
+except ImportError:  # optional: fall back to character-based truncation
+    tiktoken = None
+
+logger = logging.getLogger(__name__)
+
+# Document excerpt budget per agent prompt (~6000 characters of English text)
+MAX_DOCUMENT_TOKENS = 1500
+_CHARS_PER_TOKEN = 4
+
+# Built-in meta-tool that fans independent tool calls out to a thread pool
+BATCH_TOOL_NAME = "batch"
+BATCH_TOOL_MAX_WORKERS = 8
+
+# Opt-in cache of LLM responses for identical conversations (repeat and eval workloads)
+RESPONSE_CACHE_ENABLED = os.environ.get("RESPONSE_CACHE_ENABLED", "").lower() in ("1", "true", "yes")
+# Opt-in reuse of finished answers for repeated tasks (see BaseDomainAgent.TASK_CACHE_SIZE)
+TASK_CACHE_ENABLED = os.environ.get("DOCUMIND_TASK_CACHE", "").lower() in ("1", "true", "yes")
+_RESPONSE_CACHE = LRUCache(maxsize=500, ttl=3600)
+
+
+class RateLimiter:
+    """
+    Token buckets for the account's tokens-per-minute and requests-per-minute.
+    
+    Callers reserve capacity before each LLM call and wait while either bucket
+    is empty, so parallel agents stay under the limits instead of triggering
+    429s and retry-after sleeps. After a 429, backoff() halves both limits
+    for a while.
+    """
+    
+    def __init__(self, tpm: int, rpm: int, backoff_seconds: float = 60.0):
+        self.tpm = tpm
+        self.rpm = rpm
+        self.backoff_seconds = backoff_seconds
+        self.available_tokens = float(tpm)
+        self.available_requests = float(rpm)
+        self.last_update_ts = time.monotonic()
+        self._backoff_until = 0.0
+        self._lock = threading.Lock()
+    
+    def _limits(self, now: float) -> Tuple[float, float]:
+        scale = 0.5 if now < self._backoff_until else 1.0
+        return self.tpm * scale, self.rpm * scale
+    
+    def _reserve(self, tokens: int, requests: int) -> float:
+        """Take capacity if available; otherwise return seconds to wait before retrying."""
+        with self._lock:
+            now = time.monotonic()
+            tpm, rpm = self._limits(now)
+            elapsed = now - self.last_update_ts
+            self.last_update_ts = now
+            self.available_tokens = min(tpm, self.available_tokens + elapsed * tpm / 60)
+            self.available_requests = min(rpm, self.available_requests + elapsed * rpm / 60)
+            
+            # A single call larger than the whole budget only waits for a full bucket
+            tokens = min(tokens, tpm)
+            requests = min(requests, rpm)
+            if self.available_tokens >= tokens and self.available_requests >= requests:
+                self.available_tokens -= tokens
+                self.available_requests -= requests
+                return 0.0
+            return max(
+                (tokens - self.available_tokens) * 60 / tpm,
+                (requests - self.available_requests) * 60 / rpm,
+            )
+    
+    def acquire(self, tokens: int, requests: int = 1):
+        """Block until the buckets have room for this call."""
+        while (wait := self._reserve(tokens, requests)) > 0:
+            time.sleep(wait)
+    
+    async def aacquire(self, tokens: int, requests: int = 1):
+        """Async version of acquire()."""
+        while (wait := self._reserve(tokens, requests)) > 0:
+            await asyncio.sleep(wait)
+    
+    def backoff(self):
+        """Halve both limits for backoff_seconds (called after a 429)."""
+        with self._lock:
+            self._backoff_until = time.monotonic() + self.backoff_seconds
+            self.available_tokens = min(self.available_tokens, self.tpm / 2)
+            self.available_requests = min(self.available_requests, self.rpm / 2)
+
+
+# Shared by every agent in the process, since the limits are per account
+_RATE_LIMITER = RateLimiter(
+    tpm=int(os.environ.get("OPENAI_TPM", "90000")),
+    rpm=int(os.environ.get("OPENAI_RPM", "3500")),
+)
+# Completion budget assumed when estimating a call's token cost
+_COMPLETION_TOKEN_ESTIMATE = 500
+
+
+@functools.lru_cache(maxsize=8)
+def _encoding_for(model: str):
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding("o200k_base")
+
+
+# Token-truncated document excerpts keyed by (content hash, budget, model);
+# only the excerpt is kept, never the full document
+_TRUNCATION_CACHE = LRUCache(maxsize=32)
+
+
+def _truncate_by_tokens(text: str, max_tokens: int, model: str) -> str:
+    """
+    First max_tokens tokens of text (memoized, so repeat queries on the same
+    document skip re-tokenization). Without tiktoken, approximates with
+    4 characters per token.
+    """
+    # Every token covers at least one character
+    if len(text) <= max_tokens:
+        return text
+    if tiktoken is None:
+        return text[:max_tokens * _CHARS_PER_TOKEN]
+    key = (content_hash(text), max_tokens, model)
+    excerpt = _TRUNCATION_CACHE.get(key)
+    if excerpt is None:
+        encoding = _encoding_for(model)
+        tokens = encoding.encode(text, disallowed_special=())
+        excerpt = text if len(tokens) <= max_tokens else encoding.decode(tokens[:max_tokens])
+        _TRUNCATION_CACHE.put(key, excerpt)
+    return excerpt
+
+
+def load_instructions(domain_name: str) -> str:
+    """Read a domain's prompt instructions from instructions/<domain_name>.txt."""
+    text = importlib.resources.files(__package__).joinpath("instructions").joinpath(f"{domain_name}.txt").read_text(encoding="utf-8")
+    return text.removesuffix("\n")
+
+
+def _dumps_text(value: Any) -> str:
+    """JSON-encode model/tool output as text (orjson; unknown types via str())."""
+    return orjson.dumps(value, default=str, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
+@functools.lru_cache(maxsize=None)
+def _compile_prompt(template: str) -> Tuple[Tuple[str, Optional[str]], ...]:
+    """Split a str.format template once into (literal, field name) pairs ({{ }} already unescaped)."""
+    return tuple(
+        (literal, field) for literal, field, _spec, _conversion in string.Formatter().parse(template)
+    )
+
+
+def _render_prompt(template: str, **fields: str) -> str:
+    """Equivalent to template.format(**fields) for plain {name} fields, without re-parsing."""
+    return "".join(
+        literal + fields[field] if field is not None else literal
+        for literal, field in _compile_prompt(template)
+    )
+
+
+class _StreamedReply:
+    """
+    Accumulates a streamed ReAct reply and spots an early tool call.
+    
+    Once the model has emitted a non-null "action" followed by a complete
+    "action_input", the rest of the reply (a "final_answer": null tail) is
+    unused, so feed() returns the reply closed at that point and the caller
+    can stop reading the stream.
+    """
+    
+    _ACTION_INPUT_KEY = re.compile(r'"action_input"\s*:\s*')
+    _DECODER = json.JSONDecoder()
+    
+    def __init__(self):
+        self.text = ""
+        self._value_start: Optional[int] = None
+    
+    def feed(self, chunk: Any) -> Optional[str]:
+        """Add one stream chunk; return the complete reply if it is already decided."""
+        if not chunk.choices or not chunk.choices[0].delta.content:
+            return None
+        self.text += chunk.choices[0].delta.content
+        
+        if self._value_start is None:
+            match = self._ACTION_INPUT_KEY.search(self.text)
+            if match is None:
+                return None
+            self._value_start = match.end()
+        try:
+            _, end = self._DECODER.raw_decode(self.text, self._value_start)
+            reply = self.text[:end] + "}"
+            data = json.loads(reply)
+        except ValueError:
+            return None
+        if not isinstance(data, dict) or not data.get("action") or "final_answer" in data:
+            return None
+        return reply
+
+
+def _estimate_tokens(messages: List[Dict[str, str]]) -> int:
+    """Rough token cost of a chat call (~4 characters per token plus the reply)."""
+    return sum(len(m["content"]) for m in messages) // 4 + _COMPLETION_TOKEN_ESTIMATE
+
+
+@dataclass(slots=True)
 class ToolCall:
     """Represents a tool invocation."""
     tool_name: str
     arguments: Dict[str, Any]
     result: Optional[Any] = None
     error: Optional[str] = None
+    result_text: Optional[str] = None  # result serialized once for the observation and logs
 
 
-@dataclass
+@dataclass(slots=True)
 class ReasoningStep:
     """A single step in the ReAct loop."""
     thought: str
@@ -32,7 +249,7 @@ class ReasoningStep:
     observation: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class AgentResult:
     """Result from a domain agent execution."""
     success: bool
@@ -58,6 +275,16 @@ class BaseDomainAgent(ABC):
     # Override in subclasses
     DOMAIN_NAME: str = "base"
     DOMAIN_DESCRIPTION: str = "Base domain agent"
+    DOMAIN_INSTRUCTIONS: str = ""
+    
+    # Finished answers kept per agent for repeated (query, document, context) tasks;
+    # 0 disables. Off unless DOCUMIND_TASK_CACHE is set: agents are shared
+    # process-wide, and replayed answers would hide run-to-run variation
+    TASK_CACHE_SIZE: int = 256 if TASK_CACHE_ENABLED else 0
+    TASK_CACHE_TTL: float = 3600
+    
+    # Tools section of the prompt for agents that register no tools (all shipped domain agents)
+    TOOLS_DESCRIPTION: str = "No tools available. Analyze based on document content only."
     
     # ReAct system prompt template
     REACT_SYSTEM_PROMPT = """You are a specialized {domain_name} agent with expertise in {domain_description}.
@@ -100,37 +327,24 @@ Rules:
             max_iterations: Maximum ReAct loop iterations
             verbose: Print detailed logging of ReAct loop
         """
-        self.api_key = api_key or self._get_api_key()
-        self.client = OpenAI(api_key=self.api_key)
+        self.api_key = api_key or resolve_api_key()
+        self.client = get_openai_client(self.api_key)
         self.model = "gpt-4o"
         self.max_iterations = max_iterations
         self.verbose = verbose
         self.tools: Dict[str, Callable] = {}
+        self._system_prompt: Optional[str] = None
+        self._task_cache = LRUCache(maxsize=self.TASK_CACHE_SIZE, ttl=self.TASK_CACHE_TTL)
         self._register_tools()
-    
-    def _get_api_key(self) -> str:
-        """Get API key from environment or keyring."""
-        key = os.environ.get("OPENAI_API_KEY")
-        if key:
-            return key
-        try:
-            import keyring
-            key = keyring.get_password("openai", "api_key")
-            if key:
-                return key
-        except ImportError:
-            pass
-        raise ValueError("No OpenAI API key found")
-    
+
     @abstractmethod
     def _register_tools(self):
         """Register domain-specific tools. Override in subclasses."""
         pass
     
-    @abstractmethod
     def get_domain_instructions(self) -> str:
-        """Get domain-specific instructions for the agent. Override in subclasses."""
-        pass
+        """Get domain-specific instructions for the agent (DOMAIN_INSTRUCTIONS unless overridden)."""
+        return self.DOMAIN_INSTRUCTIONS
     
     def register_tool(self, name: str, func: Callable, description: str, parameters: Dict[str, Any]):
         """
@@ -147,11 +361,23 @@ Rules:
             "description": description,
             "parameters": parameters
         }
+        self._system_prompt = None
+        
+        # Agents with several tools get the parallel "batch" meta-tool
+        if name != BATCH_TOOL_NAME and BATCH_TOOL_NAME not in self.tools and len(self.tools) >= 2:
+            self.register_tool(
+                BATCH_TOOL_NAME,
+                self._batch_tool,
+                "Run several independent tool calls in parallel and get all results in one step. "
+                "Prefer this over separate steps when the calls don't depend on each other's output. "
+                'invocations: [{"tool_name": "...", "arguments": {...}}, ...]',
+                {"invocations": {"type": "array"}}
+            )
     
     def get_tools_description(self) -> str:
         """Get formatted description of available tools."""
         if not self.tools:
-            return "No tools available. Analyze based on document content only."
+            return self.TOOLS_DESCRIPTION
         
         descriptions = []
         for name, tool in self.tools.items():
@@ -161,11 +387,18 @@ Rules:
         
         return "\n".join(descriptions)
     
-    def _log(self, message: str, indent: int = 6):
-        """Log message if verbose mode is on."""
-        if self.verbose:
-            prefix = " " * indent
-            print(f"{prefix}{message}")
+    def _log_enabled(self) -> bool:
+        return self.verbose and logger.isEnabledFor(logging.INFO)
+    
+    def _log(self, message: Union[str, Callable[[], str]], indent: int = 6):
+        """
+        Log message if verbose mode is on.
+        
+        Pass a zero-argument callable to defer expensive formatting
+        (e.g. json.dumps of tool input) until it is known to be logged.
+        """
+        if self._log_enabled():
+            logger.info("%s%s", " " * indent, message() if callable(message) else message)
 
     @staticmethod
     def _as_text(value: Any) -> str:
@@ -175,7 +408,7 @@ Rules:
         if isinstance(value, str):
             return value
         try:
-            return json.dumps(value, ensure_ascii=False)
+            return _dumps_text(value)
         except Exception:
             return str(value)
 
@@ -220,34 +453,141 @@ Rules:
             func = self.tools[tool_name]["function"]
             result = func(**arguments)
             tool_call.result = result
-            result_preview = str(result)[:200]
-            self._log(f"📤 Result: {result_preview}", indent=10)
+            tool_call.result_text = _dumps_text(result) if isinstance(result, (dict, list)) else str(result)
+            self._log(lambda: f"📤 Result: {tool_call.result_text[:200]}", indent=10)
         except Exception as e:
             tool_call.error = str(e)
             self._log(f"❌ Tool error: {str(e)}", indent=10)
         
         return tool_call
     
+    def _batch_tool(self, invocations: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Execute several tool invocations concurrently; results keep the request order."""
+        if not isinstance(invocations, list) or not invocations:
+            raise ValueError("invocations must be a non-empty list")
+        
+        def run(invocation: Any) -> Dict[str, Any]:
+            invocation = self._as_mapping(invocation)
+            tool_name = self._as_text(invocation.get("tool_name", ""))
+            if tool_name == BATCH_TOOL_NAME:
+                return {"tool_name": tool_name, "error": "batch cannot be nested"}
+            tool_call = self.execute_tool(tool_name, self._as_mapping(invocation.get("arguments", {})))
+            if tool_call.error:
+                return {"tool_name": tool_name, "error": tool_call.error}
+            return {"tool_name": tool_name, "result": tool_call.result}
+        
+        with ThreadPoolExecutor(max_workers=min(BATCH_TOOL_MAX_WORKERS, len(invocations))) as pool:
+            return list(pool.map(run, invocations))
+    
     def _build_system_prompt(self) -> str:
-        """Build the complete system prompt for this agent."""
-        return self.REACT_SYSTEM_PROMPT.format(
-            domain_name=self.DOMAIN_NAME,
-            domain_description=self.DOMAIN_DESCRIPTION,
-            domain_specific_instructions=self.get_domain_instructions(),
-            tools_description=self.get_tools_description()
-        )
+        """Build the complete system prompt for this agent (cached until a tool is registered)."""
+        if self._system_prompt is None:
+            self._system_prompt = _render_prompt(
+                self.REACT_SYSTEM_PROMPT,
+                domain_name=self.DOMAIN_NAME,
+                domain_description=self.DOMAIN_DESCRIPTION,
+                domain_specific_instructions=self.get_domain_instructions(),
+                tools_description=self.get_tools_description()
+            )
+        return self._system_prompt
+    
+    def _response_cache_key(self, messages: List[Dict[str, str]]) -> Optional[str]:
+        """
+        Cache key for an LLM call, or None if the call must not be cached.
+        
+        Turns that carry tool observations are never cached, since tool
+        output can differ between runs.
+        """
+        if not RESPONSE_CACHE_ENABLED:
+            return None
+        if any(m["role"] == "user" and m["content"].startswith("Observation:") for m in messages):
+            return None
+        return content_hash("\0".join([self.model] + [m["content"] for m in messages]))
     
     def _call_llm(self, messages: List[Dict[str, str]]) -> str:
         """Make an LLM call."""
-        response = self.client.chat.completions.create(
-            model=self.model,
-            messages=messages,
-            temperature=0.1,
-            response_format={"type": "json_object"}
-        )
-        return response.choices[0].message.content
+        key = self._response_cache_key(messages)
+        if key is not None:
+            cached = _RESPONSE_CACHE.get(key)
+            if cached is not None:
+                self._log(f"│    ⚡ LLM response cache hit")
+                return cached
+        
+        _RATE_LIMITER.acquire(_estimate_tokens(messages))
+        try:
+            stream = self.client.chat.completions.create(
+                model=self.model,
+                messages=messages,
+                temperature=0.1,
+                response_format={"type": "json_object"},
+                user=self._prompt_cache_user(messages),
+                stream=True
+            )
+        except RateLimitError:
+            _RATE_LIMITER.backoff()
+            raise
+        
+        reply = _StreamedReply()
+        content = None
+        try:
+            for chunk in stream:
+                content = reply.feed(chunk)
+                if content is not None:
+                    break
+        finally:
+            stream.response.close()
+        if content is None:
+            content = reply.text
+        
+        if key is not None:
+            _RESPONSE_CACHE.put(key, content)
+        return content
+    
+    def _get_async_client(self) -> AsyncOpenAI:
+        """Shared AsyncOpenAI client for the running event loop."""
+        return get_async_openai_client(self.api_key)
+    
+    async def _acall_llm(self, messages: List[Dict[str, str]]) -> str:
+        """Async version of _call_llm()."""
+        key = self._response_cache_key(messages)
+        if key is not None:
+            cached = _RESPONSE_CACHE.get(key)
+            if cached is not None:
+                self._log(f"│    ⚡ LLM response cache hit")
+                return cached
+        
+        await _RATE_LIMITER.aacquire(_estimate_tokens(messages))
+        try:
+            stream = await self._get_async_client().chat.completions.create(
+                model=self.model,
+                messages=messages,
+                temperature=0.1,
+                response_format={"type": "json_object"},
+                user=self._prompt_cache_user(messages),
+                stream=True
+            )
+        except RateLimitError:
+            _RATE_LIMITER.backoff()
+            raise
+        
+        reply = _StreamedReply()
+        content = None
+        try:
+            async for chunk in stream:
+                content = reply.feed(chunk)
+                if content is not None:
+                    break
+        finally:
+            await stream.response.aclose()
+        if content is None:
+            content = reply.text
+        
+        if key is not None:
+            _RESPONSE_CACHE.put(key, content)
+        return content
     
-    def process(self, query: str, document_content: str, context: Optional[Dict[str, Any]] = None) -> AgentResult:
+    def process(self, query: str, document_content: str, context: Optional[Dict[str, Any]] = None,
+                use_cache: bool = True) -> AgentResult:
         """
         Process a query using the ReAct pattern.
         
@@ -255,124 +595,341 @@ Rules:
             query: The user's question
             document_content: The document text to analyze
             context: Optional additional context
+            use_cache: Whether to consult and fill the task cache
             
         Returns:
             AgentResult with answer and reasoning trace
         """
-        system_prompt = self._build_system_prompt()
-        
-        # Build initial user message
-        user_message = f"""Document Content:
-{document_content[:6000]}
-
-Query: {query}"""
-        
-        if context:
-            user_message += f"\n\nAdditional Context: {json.dumps(context)}"
-        
-        messages = [
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": user_message}
-        ]
+        task_key = self._task_key(query, document_content, context) if use_cache else None
+        cached = self._cached_task_result(task_key)
+        if cached is not None:
+            return cached
         
+        messages = self._start_react(query, document_content, context)
         tool_calls: List[ToolCall] = []
         reasoning_trace: List[ReasoningStep] = []
         
-        self._log(f"")
-        self._log(f"┌─ ReAct Loop Started (max {self.max_iterations} iterations)")
-        self._log(f"│  Domain: {self.DOMAIN_NAME} | Model: {self.model}")
-        self._log(f"│  Tools available: {list(self.tools.keys())}")
-        self._log(f"│  Query: {query[:100]}{'...' if len(query) > 100 else ''}")
-        
-        # ReAct loop
         for iteration in range(self.max_iterations):
-            self._log(f"│")
-            self._log(f"├─── Iteration {iteration + 1}/{self.max_iterations}")
-            self._log(f"│    📡 Calling LLM...")
+            self._log_iteration(iteration)
             response = self._call_llm(messages)
             
-            try:
-                data = json.loads(response)
-            except json.JSONDecodeError:
-                self._log(f"│    ⚠️  LLM returned non-JSON, wrapping as final answer")
-                data = {"thought": response, "action": None, "final_answer": {"answer": response, "confidence": 0.5, "evidence": []}}
+            step, final_answer = self._parse_response(response)
+            if final_answer and not step.action:
+                result = self._final_result(step, final_answer, iteration, tool_calls, reasoning_trace)
+                self._store_task_result(task_key, result)
+                return result
+            if not step.action:
+                self._end_without_action(step, reasoning_trace)
+                break
             
-            thought = self._as_text(data.get("thought", ""))
-            action_raw = data.get("action")
-            action = self._as_text(action_raw).strip() if action_raw is not None else None
-            if action == "":
-                action = None
-            action_input = self._as_mapping(data.get("action_input", {}))
-            final_answer_raw = data.get("final_answer")
-            final_answer = final_answer_raw if isinstance(final_answer_raw, dict) else None
+            self._log_action(step)
+            tool_call = self.execute_tool(step.action, step.action_input or {})
+            self._observe(step, tool_call, response, messages, tool_calls, reasoning_trace)
+        
+        return self._incomplete_result(tool_calls, reasoning_trace)
+    
+    async def aprocess(self, query: str, document_content: str, context: Optional[Dict[str, Any]] = None,
+                       use_cache: bool = True) -> AgentResult:
+        """
+        Async version of process().
+        
+        LLM calls go through AsyncOpenAI and tools run in the default executor,
+        so several agents can run concurrently under asyncio.gather().
+        """
+        task_key = self._task_key(query, document_content, context) if use_cache else None
+        cached = self._cached_task_result(task_key)
+        if cached is not None:
+            return cached
+        
+        messages = self._start_react(query, document_content, context)
+        tool_calls: List[ToolCall] = []
+        reasoning_trace: List[ReasoningStep] = []
+        loop = asyncio.get_running_loop()
+        
+        for iteration in range(self.max_iterations):
+            self._log_iteration(iteration)
+            response = await self._acall_llm(messages)
             
-            self._log(f"│    💭 THINK: {thought[:200]}{'...' if len(thought) > 200 else ''}")
+            step, final_answer = self._parse_response(response)
+            if final_answer and not step.action:
+                result = self._final_result(step, final_answer, iteration, tool_calls, reasoning_trace)
+                self._store_task_result(task_key, result)
+                return result
+            if not step.action:
+                self._end_without_action(step, reasoning_trace)
+                break
             
-            step = ReasoningStep(
-                thought=thought,
-                action=action,
-                action_input=action_input
+            self._log_action(step)
+            tool_call = await loop.run_in_executor(
+                None, functools.partial(self.execute_tool, step.action, step.action_input or {})
             )
+            self._observe(step, tool_call, response, messages, tool_calls, reasoning_trace)
+        
+        return self._incomplete_result(tool_calls, reasoning_trace)
+    
+    def _task_key(self, query: str, document_content: str,
+                  context: Optional[Dict[str, Any]]) -> Tuple[str, str, str]:
+        """Cache key for a whole task (the domain is implied, the cache is per agent)."""
+        return content_hash(query), content_hash(document_content), _dumps_text(context) if context else ""
+    
+    def _cached_task_result(self, task_key: Optional[Tuple[str, str, str]]) -> Optional[AgentResult]:
+        """Previously successful result for this task, marked as cached, or None."""
+        if task_key is None or not self.TASK_CACHE_SIZE:
+            return None
+        result = self._task_cache.get(task_key)
+        if result is None:
+            return None
+        self._log(f"⚡ Task cache hit — skipping ReAct loop")
+        return dataclasses.replace(result, metadata={**result.metadata, "cached": True})
+    
+    def _store_task_result(self, task_key: Optional[Tuple[str, str, str]], result: AgentResult):
+        """Remember a finished answer for its task (no-op if the task cache is off or bypassed)."""
+        if task_key is not None and self.TASK_CACHE_SIZE:
+            self._task_cache.put(task_key, result)
+    
+    def process_batch(self, items: List[Tuple[str, str]], *, poll_interval: float = 30) -> List[AgentResult]:
+        """
+        Answer many (query, document_content) pairs through the OpenAI Batch API.
+        
+        Batch requests are billed at a discount but may take up to 24h, so this
+        suits offline/eval workloads. Each item gets a single LLM turn, which
+        means it is only available to agents without tools.
+        
+        Args:
+            items: (query, document_content) pairs
+            poll_interval: Seconds between batch status checks
             
-            # Check if agent wants to give final answer
-            if final_answer and not action:
-                step.observation = "Final answer provided"
-                reasoning_trace.append(step)
-                
-                answer_text = self._as_text(final_answer.get("answer", ""))
-                try:
-                    confidence = float(final_answer.get("confidence", 0.5))
-                except (TypeError, ValueError):
-                    confidence = 0.5
-                confidence = max(0.0, min(1.0, confidence))
-                evidence = self._as_evidence_list(final_answer.get("evidence", []))
-                
-                self._log(f"│    ✅ FINAL ANSWER (after {iteration + 1} iteration(s))")
-                self._log(f"│    📊 Confidence: {confidence * 100:.0f}%")
-                self._log(f"│    📝 Answer preview: {answer_text[:150]}{'...' if len(answer_text) > 150 else ''}")
-                if evidence:
-                    self._log(f"│    📎 Evidence ({len(evidence)} items):")
-                    for ev in evidence[:3]:
-                        self._log(f"│       • {str(ev)[:120]}")
-                self._log(f"└─ ReAct Loop Complete")
-                
-                return AgentResult(
-                    success=True,
-                    answer=answer_text,
-                    confidence=confidence,
-                    evidence=evidence,
-                    tool_calls=tool_calls,
-                    reasoning_trace=reasoning_trace,
-                    metadata={"domain": self.DOMAIN_NAME, "iterations": iteration + 1}
-                )
-            
-            # Execute tool if requested
-            if action:
-                self._log(f"│    🎬 ACT: {action}")
-                self._log(f"│    📥 Input: {json.dumps(action_input)[:200]}")
-                
-                tool_call = self.execute_tool(action, action_input or {})
-                tool_calls.append(tool_call)
-                
-                if tool_call.error:
-                    observation = f"Error: {tool_call.error}"
-                    self._log(f"│    👁️  OBSERVE: ❌ {observation[:200]}")
-                else:
-                    observation = f"Result: {json.dumps(tool_call.result) if isinstance(tool_call.result, (dict, list)) else str(tool_call.result)}"
-                    self._log(f"│    👁️  OBSERVE: {observation[:200]}{'...' if len(observation) > 200 else ''}")
-                
-                step.observation = observation
-                reasoning_trace.append(step)
-                
-                # Add observation to conversation
-                messages.append({"role": "assistant", "content": response})
-                messages.append({"role": "user", "content": f"Observation: {observation}\n\nContinue your analysis."})
+        Returns:
+            One AgentResult per item, in input order
+        """
+        if self.tools:
+            raise ValueError(f"{self.__class__.__name__} has tools; process_batch() only supports tool-less agents")
+        if not items:
+            return []
+        
+        # Bulk jobs usually ask many questions of few documents, so truncate,
+        # build and hash each distinct document's prefix only once
+        prefixes: Dict[str, Tuple[List[Dict[str, str]], str]] = {}
+        for _, document_content in items:
+            if document_content not in prefixes:
+                prefix = self._document_prefix(document_content)
+                prefixes[document_content] = (prefix, self._prompt_cache_user(prefix))
+        
+        with tempfile.NamedTemporaryFile("w+b", suffix=".jsonl") as f:
+            for i, (query, document_content) in enumerate(items):
+                prefix, cache_user = prefixes[document_content]
+                request = {
+                    "custom_id": f"req_{i}",
+                    "method": "POST",
+                    "url": "/v1/chat/completions",
+                    "body": {
+                        "model": self.model,
+                        "messages": prefix + [self._query_turn(query, None)],
+                        "temperature": 0.1,
+                        "response_format": {"type": "json_object"},
+                        "user": cache_user,
+                    },
+                }
+                f.write(orjson.dumps(request) + b"\n")
+            f.flush()
+            f.seek(0)
+            input_file = self.client.files.create(file=f, purpose="batch")
+        
+        batch = self.client.batches.create(
+            input_file_id=input_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h",
+        )
+        self._log(f"📦 Submitted batch {batch.id} ({len(items)} requests)")
+        while batch.status not in ("completed", "failed", "expired", "cancelled"):
+            time.sleep(poll_interval)
+            batch = self.client.batches.retrieve(batch.id)
+        if batch.status != "completed":
+            raise RuntimeError(f"Batch {batch.id} ended with status {batch.status!r}")
+        
+        responses: Dict[str, str] = {}
+        if batch.output_file_id:
+            for line in self.client.files.content(batch.output_file_id).text.splitlines():
+                if not line.strip():
+                    continue
+                record = orjson.loads(line)
+                response = record.get("response") or {}
+                if response.get("status_code") == 200:
+                    responses[record["custom_id"]] = response["body"]["choices"][0]["message"]["content"]
+        
+        results = []
+        for i in range(len(items)):
+            response = responses.get(f"req_{i}")
+            reasoning_trace: List[ReasoningStep] = []
+            if response is None:
+                results.append(self._batch_failure("Batch request failed", "batch_error", reasoning_trace))
+                continue
+            step, final_answer = self._parse_response(response)
+            if final_answer:
+                results.append(self._final_result(step, final_answer, 0, [], reasoning_trace))
             else:
-                # No action and no final answer - unexpected
-                self._log(f"│    ⚠️  No action and no final answer — breaking loop")
                 reasoning_trace.append(step)
-                break
+                results.append(self._batch_failure("No final answer in batch response", "no_final_answer", reasoning_trace))
+        return results
+    
+    def _batch_failure(self, answer: str, reason: str, reasoning_trace: List[ReasoningStep]) -> AgentResult:
+        """Unsuccessful AgentResult for one process_batch() item."""
+        return AgentResult(
+            success=False,
+            answer=answer,
+            confidence=0.0,
+            evidence=[],
+            tool_calls=[],
+            reasoning_trace=reasoning_trace,
+            metadata={"domain": self.DOMAIN_NAME, "iterations": 1, "reason": reason}
+        )
+    
+    def _start_react(self, query: str, document_content: str,
+                     context: Optional[Dict[str, Any]]) -> List[Dict[str, str]]:
+        """Build the initial conversation for a ReAct run and log its header."""
+        messages = self._initial_messages(query, document_content, context)
+        
+        if self._log_enabled():
+            self._log(f"")
+            self._log(f"┌─ ReAct Loop Started (max {self.max_iterations} iterations)")
+            self._log(f"│  Domain: {self.DOMAIN_NAME} | Model: {self.model}")
+            self._log(f"│  Tools available: {list(self.tools.keys())}")
+            self._log(f"│  Query: {query[:100]}{'...' if len(query) > 100 else ''}")
+        return messages
+    
+    def _initial_messages(self, query: str, document_content: str,
+                          context: Optional[Dict[str, Any]]) -> List[Dict[str, str]]:
+        """
+        Opening turns of a ReAct conversation.
         
+        The document excerpt gets its own turn ahead of the query, so the
+        system prompt + document prefix is byte-identical for every call on
+        the same document and can be served from OpenAI's prompt cache.
+        """
+        return self._document_prefix(document_content) + [self._query_turn(query, context)]
+    
+    def _document_prefix(self, document_content: str) -> List[Dict[str, str]]:
+        """System prompt, document excerpt and acknowledgement turns (shared by every query on a document)."""
+        excerpt = _truncate_by_tokens(document_content, MAX_DOCUMENT_TOKENS, self.model)
+        return [
+            {"role": "system", "content": self._build_system_prompt()},
+            {"role": "user", "content": f"Document Content:\n{excerpt}"},
+            {"role": "assistant", "content": "Understood. Ready for query."}
+        ]
+    
+    @staticmethod
+    def _query_turn(query: str, context: Optional[Dict[str, Any]]) -> Dict[str, str]:
+        query_message = f"Query: {query}"
+        if context:
+            query_message += f"\n\nAdditional Context: {json.dumps(context)}"
+        return {"role": "user", "content": query_message}
+    
+    @staticmethod
+    def _prompt_cache_user(messages: List[Dict[str, str]]) -> str:
+        """Stable per-document id so calls sharing a prefix reach the same prompt cache."""
+        return content_hash(messages[1]["content"])[:16]
+    
+    def _log_iteration(self, iteration: int):
+        self._log(f"│")
+        self._log(f"├─── Iteration {iteration + 1}/{self.max_iterations}")
+        self._log(f"│    📡 Calling LLM...")
+    
+    def _parse_response(self, response: str) -> Tuple[ReasoningStep, Optional[Dict[str, Any]]]:
+        """Parse one LLM turn into a reasoning step and its final answer (if any)."""
+        try:
+            data = orjson.loads(response)
+        except orjson.JSONDecodeError:
+            data = None
+        if not isinstance(data, dict):
+            self._log(f"│    ⚠️  LLM returned non-JSON, wrapping as final answer")
+            data = {"thought": response, "action": None, "final_answer": {"answer": response, "confidence": 0.5, "evidence": []}}
+        
+        thought = self._as_text(data.get("thought", ""))
+        action_raw = data.get("action")
+        action = self._as_text(action_raw).strip() if action_raw is not None else None
+        if action == "":
+            action = None
+        action_input = self._as_mapping(data.get("action_input", {}))
+        final_answer_raw = data.get("final_answer")
+        final_answer = final_answer_raw if isinstance(final_answer_raw, dict) else None
+        
+        self._log(lambda: f"│    💭 THINK: {thought[:200]}{'...' if len(thought) > 200 else ''}")
+        
+        step = ReasoningStep(
+            thought=thought,
+            action=action,
+            action_input=action_input
+        )
+        return step, final_answer
+    
+    def _final_result(self, step: ReasoningStep, final_answer: Dict[str, Any], iteration: int,
+                      tool_calls: List[ToolCall], reasoning_trace: List[ReasoningStep]) -> AgentResult:
+        """Build the successful AgentResult for a final answer."""
+        step.observation = "Final answer provided"
+        reasoning_trace.append(step)
+        
+        answer_text = self._as_text(final_answer.get("answer", ""))
+        try:
+            confidence = float(final_answer.get("confidence", 0.5))
+        except (TypeError, ValueError):
+            confidence = 0.5
+        confidence = max(0.0, min(1.0, confidence))
+        evidence = self._as_evidence_list(final_answer.get("evidence", []))
+        
+        if self._log_enabled():
+            self._log(f"│    ✅ FINAL ANSWER (after {iteration + 1} iteration(s))")
+            self._log(f"│    📊 Confidence: {confidence * 100:.0f}%")
+            self._log(f"│    📝 Answer preview: {answer_text[:150]}{'...' if len(answer_text) > 150 else ''}")
+            if evidence:
+                self._log(f"│    📎 Evidence ({len(evidence)} items):")
+                for ev in evidence[:3]:
+                    self._log(f"│       • {str(ev)[:120]}")
+            self._log(f"└─ ReAct Loop Complete")
+        
+        return AgentResult(
+            success=True,
+            answer=answer_text,
+            confidence=confidence,
+            evidence=evidence,
+            tool_calls=tool_calls,
+            reasoning_trace=reasoning_trace,
+            metadata={"domain": self.DOMAIN_NAME, "iterations": iteration + 1}
+        )
+    
+    def _end_without_action(self, step: ReasoningStep, reasoning_trace: List[ReasoningStep]):
+        # No action and no final answer - unexpected
+        self._log(f"│    ⚠️  No action and no final answer — breaking loop")
+        reasoning_trace.append(step)
+    
+    def _log_action(self, step: ReasoningStep):
+        self._log(f"│    🎬 ACT: {step.action}")
+        self._log(lambda: f"│    📥 Input: {_dumps_text(step.action_input)[:200]}")
+    
+    def _observe(self, step: ReasoningStep, tool_call: ToolCall, response: str,
+                 messages: List[Dict[str, str]], tool_calls: List[ToolCall],
+                 reasoning_trace: List[ReasoningStep]):
+        """Record a tool call's outcome and feed it back into the conversation."""
+        tool_calls.append(tool_call)
+        
+        if tool_call.error:
+            observation = f"Error: {tool_call.error}"
+            self._log(lambda: f"│    👁️  OBSERVE: ❌ {observation[:200]}")
+        else:
+            result_text = tool_call.result_text
+            if result_text is None:  # ToolCall built outside execute_tool()
+                result_text = _dumps_text(tool_call.result) if isinstance(tool_call.result, (dict, list)) else str(tool_call.result)
+            observation = f"Result: {result_text}"
+            self._log(lambda: f"│    👁️  OBSERVE: {observation[:200]}{'...' if len(observation) > 200 else ''}")
+        
+        step.observation = observation
+        reasoning_trace.append(step)
+        
+        # Add observation to conversation
+        messages.append({"role": "assistant", "content": response})
+        messages.append({"role": "user", "content": f"Observation: {observation}\n\nContinue your analysis."})
+    
+    def _incomplete_result(self, tool_calls: List[ToolCall], reasoning_trace: List[ReasoningStep]) -> AgentResult:
+        """Result when the loop ends without a final answer."""
         # Max iterations reached without final answer
         self._log(f"│")
         self._log(f"└─ ⚠️  ReAct Loop: Max iterations ({self.max_iterations}) reached without final answer")
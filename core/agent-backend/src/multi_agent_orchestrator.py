@@ -6,24 +6,27 @@ Central orchestrator implementing the Multi-Agent Supervisor architecture.
 Flow:
 1. Perception Layer: Parse PDF and extract content
 2. Router/Supervisor: Classify intent and select domain agent
-3. Domain Agent: Execute specialized analysis (single agent, dynamically spawned)
+3. Domain Agent: Execute specialized analysis (single agent per query, reused across queries)
 """
 
+import asyncio
+import logging
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
-from typing import List, Dict, Any, Optional, Type
+from typing import AsyncIterator, Callable, List, Dict, Any, Optional, Tuple
 from enum import Enum
 
 # Import all layers
-from .perception import PerceptionLayer
-from .router import SupervisorAgent, RoutingDecision, Domain
+from .cache import LRUCache, content_hash
+from .credentials import resolve_api_key
+from .perception import ParsedDocument, PerceptionLayer
+from .router import SupervisorAgent, RoutingDecision, DocumentAnalysis, Domain
+from .domain_agents import get_agent
 from .domain_agents.base import BaseDomainAgent, AgentResult
-from .domain_agents.healthcare import HealthcareAgent
-from .domain_agents.finance import FinanceAgent
-from .domain_agents.hr import HRAgent
-from .domain_agents.insurance import InsuranceAgent
-from .domain_agents.education import EducationAgent
-from .domain_agents.political import PoliticalAgent
+
+logger = logging.getLogger(__name__)
 
 
 class ExecutionStatus(Enum):
@@ -37,16 +40,31 @@ class ExecutionStatus(Enum):
     ERROR = "error"
 
 
+@dataclass(slots=True)
+class TraceStep:
+    """A single recorded pipeline step."""
+    step: str
+    data: Any
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the step as a plain dict (for JSON responses)."""
+        return {"step": self.step, "data": self.data}
+
+
 @dataclass
 class ExecutionTrace:
     """Trace of the execution pipeline."""
     status: ExecutionStatus = ExecutionStatus.PENDING
-    steps: List[Dict[str, Any]] = field(default_factory=list)
+    steps: List[TraceStep] = field(default_factory=list)
     errors: List[str] = field(default_factory=list)
+    on_step: Optional[Callable[[TraceStep], None]] = field(default=None, repr=False)
     
     def add_step(self, step_name: str, data: Any):
-        """Add a step to the trace."""
-        self.steps.append({"step": step_name, "data": data})
+        """Add a step to the trace (and notify the on_step listener, if any)."""
+        step = TraceStep(step_name, data)
+        self.steps.append(step)
+        if self.on_step is not None:
+            self.on_step(step)
     
     def add_error(self, error: str):
         """Add an error to the trace."""
@@ -76,18 +94,18 @@ class MultiAgentOrchestrator:
     3. Routes to the appropriate domain agent via supervisor
     4. Returns the agent’s answer directly (no composer)
     
-    Agents are spawned dynamically and released after use
-    to avoid holding multiple agents in memory.
+    Domain agents are stateless between queries, so one instance per
+    domain is created on first use and reused for later requests.
     """
     
-    # Map domains to agent classes
-    DOMAIN_AGENTS: Dict[Domain, Type[BaseDomainAgent]] = {
-        Domain.HEALTHCARE: HealthcareAgent,
-        Domain.FINANCE: FinanceAgent,
-        Domain.HR: HRAgent,
-        Domain.INSURANCE: InsuranceAgent,
-        Domain.EDUCATION: EducationAgent,
-        Domain.POLITICAL: PoliticalAgent
+    # Map domains to domain_agents modules (get_agent() names); imported on first use
+    DOMAIN_AGENTS: Dict[Domain, str] = {
+        Domain.HEALTHCARE: "healthcare",
+        Domain.FINANCE: "finance",
+        Domain.HR: "hr",
+        Domain.INSURANCE: "insurance",
+        Domain.EDUCATION: "education",
+        Domain.POLITICAL: "political"
     }
     
     def __init__(self, api_key: Optional[str] = None, verbose: bool = True):
@@ -98,52 +116,194 @@ class MultiAgentOrchestrator:
             api_key: OpenAI API key (will try keyring if not provided)
             verbose: Print progress messages
         """
-        self.api_key = api_key or self._get_api_key()
+        self.api_key = api_key or resolve_api_key()
         self.verbose = verbose
         
         # Initialize layers
         self.perception = PerceptionLayer()
         self.supervisor = SupervisorAgent(api_key=self.api_key, verbose=self.verbose)
-    
-    def _get_api_key(self) -> str:
-        """Get API key from environment or keyring."""
-        key = os.environ.get("OPENAI_API_KEY")
-        if key:
-            return key
-        try:
-            import keyring
-            key = keyring.get_password("openai", "api_key")
-            if key:
-                return key
-        except ImportError:
-            pass
-        raise ValueError("No OpenAI API key found. Set OPENAI_API_KEY or use keyring.")
+        
+        # Routing decisions keyed by (query hash, document hash)
+        self._routing_cache = LRUCache(maxsize=1024, ttl=3600)
+        
+        # One reusable agent instance per domain (created on first use)
+        self._agents: Dict[Domain, BaseDomainAgent] = {}
+        self._agents_lock = threading.Lock()
     
     def _log(self, message: str):
         """Log message if verbose mode is on."""
-        if self.verbose:
-            print(message)
+        if self.verbose and logger.isEnabledFor(logging.INFO):
+            logger.info(message)
     
     def _create_agent(self, domain: Domain) -> BaseDomainAgent:
-        """Dynamically create a single agent for the given domain."""
-        agent_class = self.DOMAIN_AGENTS.get(domain)
-        if agent_class:
-            return agent_class(api_key=self.api_key, verbose=self.verbose)
-        # Fallback to finance agent for GENERAL domain
-        return FinanceAgent(api_key=self.api_key, verbose=self.verbose)
+        """Return the agent for the given domain, creating it on first use."""
+        agent = self._agents.get(domain)
+        if agent is not None:
+            return agent
+        with self._agents_lock:
+            agent = self._agents.get(domain)
+            if agent is None:
+                module_name = self.DOMAIN_AGENTS.get(domain, self.DOMAIN_AGENTS[Domain.FINANCE])
+                agent = get_agent(module_name, self.api_key, verbose=self.verbose)
+                self._agents[domain] = agent
+            return agent
+    
+    def warm_agents(self):
+        """Instantiate every domain agent up front (e.g. at server startup)."""
+        for domain in self.DOMAIN_AGENTS:
+            self._create_agent(domain)
+    
+    def warm_connections(self):
+        """
+        Open the HTTPS connections to the OpenAI API ahead of the first query.
+        
+        Each client keeps its connection pool, so a cheap models.list() call
+        per client moves the TLS handshake out of the first request. Failures
+        are logged and ignored; the first real call will simply connect then.
+        """
+        # Agents and the supervisor normally share one client per API key
+        all_clients = [self.supervisor.client] + [agent.client for agent in self._agents.values()]
+        clients = list({id(client): client for client in all_clients}.values())
+        
+        def warm(client):
+            try:
+                client.models.list()
+            except Exception as e:
+                logger.warning("OpenAI connection warm-up failed: %s", e)
+        
+        with ThreadPoolExecutor(max_workers=len(clients)) as pool:
+            list(pool.map(warm, clients))
+    
+    def _execution_domains(self, routing: RoutingDecision) -> List[Domain]:
+        """Return the domains to run: the primary, plus secondaries if multi-agent."""
+        domains = [routing.primary_domain]
+        if routing.requires_multi_agent:
+            domains.extend(routing.secondary_domains)
+        
+        # Several domains can share an agent (e.g. GENERAL falls back to finance)
+        unique: List[Domain] = []
+        seen = set()
+        for domain in domains:
+            module_name = self.DOMAIN_AGENTS.get(domain, self.DOMAIN_AGENTS[Domain.FINANCE])
+            if module_name not in seen:
+                seen.add(module_name)
+                unique.append(domain)
+        return unique
+    
+    def _run_agents(self, domains: List[Domain], query: str, document_text: str,
+                    context: Dict[str, Any], use_cache: bool = True) -> List[Tuple[Domain, AgentResult]]:
+        """
+        Run the agents for the given domains, concurrently if there are several.
+        
+        Args:
+            domains: Domains to run (primary first)
+            query: User's question about the document
+            document_text: Full document text
+            context: Extra context passed to each agent
+            use_cache: Whether agents may answer from their task cache
+            
+        Returns:
+            List of (domain, AgentResult) in the same order as domains
+        """
+        def run(domain: Domain) -> AgentResult:
+            return self._create_agent(domain).process(
+                query=query,
+                document_content=document_text,
+                context=context,
+                use_cache=use_cache
+            )
+        
+        if len(domains) == 1:
+            return [(domains[0], run(domains[0]))]
+        
+        # Agent calls are I/O-bound (LLM requests), so threads overlap them
+        with ThreadPoolExecutor(max_workers=len(domains)) as pool:
+            return list(zip(domains, pool.map(run, domains)))
+    
+    @staticmethod
+    def _merge_results(results: List[Tuple[Domain, AgentResult]]) -> AgentResult:
+        """
+        Merge the results of several agents into one.
+        
+        The highest-confidence answer wins; evidence, tool calls and
+        reasoning steps from every agent are kept.
+        """
+        if len(results) == 1:
+            return results[0][1]
+        
+        best_domain, best = max(results, key=lambda item: item[1].confidence)
+        evidence: List[str] = []
+        for _, result in results:
+            evidence.extend(e for e in result.evidence if e not in evidence)
+        
+        return AgentResult(
+            success=best.success,
+            answer=best.answer,
+            confidence=best.confidence,
+            evidence=evidence,
+            tool_calls=[call for _, result in results for call in result.tool_calls],
+            reasoning_trace=[step for _, result in results for step in result.reasoning_trace],
+            metadata={
+                **best.metadata,
+                "answered_by": best_domain.value,
+                "agents": {domain.value: result.confidence for domain, result in results}
+            }
+        )
+    
+    def analyze_and_route(self, query: str, document_text: str,
+                          doc_hash: Optional[str] = None,
+                          use_cache: bool = True) -> Tuple[DocumentAnalysis, RoutingDecision]:
+        """
+        Analyze the document and route the query in one supervisor LLM call.
+        
+        Results are cached per (query, document) so repeated questions skip
+        the supervisor entirely.
+        
+        Args:
+            query: User's question about the document
+            document_text: Full document text
+            doc_hash: Precomputed content hash of document_text (optional)
+            use_cache: Whether to consult and fill the routing cache
+            
+        Returns:
+            Tuple of (DocumentAnalysis, RoutingDecision)
+        """
+        doc_hash = doc_hash or content_hash(document_text)
+        key = (content_hash(query), doc_hash)
+        if use_cache:
+            cached = self._routing_cache.get(key)
+            if cached is not None:
+                self._log("   ↩️  Using cached routing decision")
+                return cached
+        
+        result = self.supervisor.analyze_and_route(query, document_text, cache_key=doc_hash)
+        if use_cache:
+            self._routing_cache.put(key, result)
+        return result
     
-    def process(self, pdf_path: str, query: str) -> OrchestratorResult:
+    def process(self, pdf_path: str, query: str,
+                on_step: Optional[Callable[[TraceStep], None]] = None,
+                pdf_bytes: Optional[bytes] = None,
+                parsed_doc: Optional[ParsedDocument] = None,
+                use_cache: bool = True) -> OrchestratorResult:
         """
         Process a PDF document with a user query.
         
         Args:
-            pdf_path: Path to the PDF file
+            pdf_path: Path to the PDF file (only used as the filename if pdf_bytes or parsed_doc is given)
             query: User's question about the document
+            on_step: Optional callback invoked with each trace step as it is recorded
+            pdf_bytes: Optional in-memory PDF content, parsed without reading pdf_path
+            parsed_doc: Optional already-parsed document (e.g. from perception.process_document()),
+                used as-is so repeated queries over one PDF skip the perception layer
+            use_cache: Whether routing and agent answers may come from (and fill)
+                the routing and task caches; pass False when each call must be a
+                fresh, independent run
             
         Returns:
             OrchestratorResult with complete response and trace
         """
-        trace = ExecutionTrace()
+        trace = ExecutionTrace(on_step=on_step)
         agent_result: Optional[AgentResult] = None
         routing_decision = None
         
@@ -155,7 +315,13 @@ class MultiAgentOrchestrator:
             self._log("=" * 80)
             self._log(f"   📂 File: {pdf_path}")
             
-            parsed_doc = self.perception.process_document(pdf_path)
+            if parsed_doc is None:
+                if pdf_bytes is not None:
+                    parsed_doc = self.perception.process_document_bytes(
+                        pdf_bytes, filename=os.path.basename(pdf_path)
+                    )
+                else:
+                    parsed_doc = self.perception.process_document(pdf_path)
             self._log(f"   ✓ Parsed {parsed_doc.metadata.page_count} pages ({parsed_doc.metadata.total_characters:,} chars)")
             
             trace.add_step("perception", {
@@ -170,22 +336,11 @@ class MultiAgentOrchestrator:
             self._log("🧭 STEP 2 │ ROUTER/SUPERVISOR: Analyzing intent")
             self._log("=" * 80)
             
-            # First, analyze the document
-            self._log("\n   ─── Phase 2a: Document Analysis ───")
-            doc_analysis = self.supervisor.analyze_document(
-                parsed_doc.full_text, 
-                cache_key=pdf_path
-            )
+            # Analyze the document and route the query in a single LLM call
+            self._log("\n   ─── Phase 2a/2b: Document Analysis + Query Routing ───")
+            doc_analysis, routing_decision = self.analyze_and_route(query, parsed_doc.full_text, use_cache=use_cache)
             self._log(f"   📋 Document type: {doc_analysis.document_type}")
             self._log(f"   🏷️  Detected domains: {[d.value for d in doc_analysis.detected_domains]}")
-            
-            # Then, route the query
-            self._log("\n   ─── Phase 2b: Query Routing ───")
-            routing_decision = self.supervisor.route(
-                query, 
-                parsed_doc.full_text,
-                doc_analysis
-            )
             self._log(f"   🎯 Primary domain: {routing_decision.primary_domain.value}")
             self._log(f"   📊 Confidence: {routing_decision.confidence * 100:.0f}%")
             self._log(f"   💭 Reasoning: {routing_decision.reasoning}")
@@ -205,34 +360,30 @@ class MultiAgentOrchestrator:
             self._log("⚡ STEP 3 │ DOMAIN AGENT EXECUTION")
             self._log("=" * 80)
             
-            # Dynamically spawn a single agent for the primary domain
-            domain = routing_decision.primary_domain
-            self._log(f"\n   🤖 Spawning [{domain.value.upper()}] agent...")
-            
-            agent = self._create_agent(domain)
-            self._log(f"      Agent: {agent.__class__.__name__}")
-            
-            # Execute agent
-            agent_result = agent.process(
-                query=query,
-                document_content=parsed_doc.full_text,
-                context={"document_type": doc_analysis.document_type}
-            )
-            
-            # Release agent immediately
-            del agent
+            # Dispatch to the (cached) agent for the primary domain, plus the
+            # secondary domains when the router asks for multiple agents
+            domains = self._execution_domains(routing_decision)
+            context = {"document_type": doc_analysis.document_type}
+            for domain in domains:
+                self._log(f"\n   🤖 Dispatching to [{domain.value.upper()}] agent...")
+                self._log(f"      Agent: {self._create_agent(domain).__class__.__name__}")
             
-            # Display result
-            status_icon = "✓" if agent_result.success else "✗"
-            self._log(f"      {status_icon} Confidence: {agent_result.confidence * 100:.0f}%")
+            results = self._run_agents(domains, query, parsed_doc.full_text, context, use_cache)
             
-            if agent_result.reasoning_trace:
-                self._log(f"      💭 Reasoning steps: {len(agent_result.reasoning_trace)}")
+            for domain, result in results:
+                # Display result
+                status_icon = "✓" if result.success else "✗"
+                self._log(f"      {status_icon} [{domain.value.upper()}] Confidence: {result.confidence * 100:.0f}%")
+                
+                if result.reasoning_trace:
+                    self._log(f"      💭 Reasoning steps: {len(result.reasoning_trace)}")
+                
+                trace.add_step(f"agent_{domain.value}", {
+                    "success": result.success,
+                    "confidence": result.confidence
+                })
             
-            trace.add_step(f"agent_{domain.value}", {
-                "success": agent_result.success,
-                "confidence": agent_result.confidence
-            })
+            agent_result = self._merge_results(results)
             
             trace.status = ExecutionStatus.COMPLETE
             
@@ -267,6 +418,80 @@ class MultiAgentOrchestrator:
                 agent_result=agent_result
             )
     
+    def process_text(self, document_text: str, query: str) -> Tuple[RoutingDecision, AgentResult]:
+        """
+        Route and answer a query over pre-extracted document text (no PDF parsing).
+        
+        Args:
+            document_text: The document text to analyze
+            query: User's question about the document
+            
+        Returns:
+            Tuple of (RoutingDecision, AgentResult)
+        """
+        doc_analysis, routing = self.analyze_and_route(query, document_text)
+        results = self._run_agents(
+            self._execution_domains(routing),
+            query,
+            document_text,
+            {"document_type": doc_analysis.document_type}
+        )
+        return routing, self._merge_results(results)
+    
+    async def aprocess(self, pdf_path: str, query: str, pdf_bytes: Optional[bytes] = None) -> OrchestratorResult:
+        """
+        Async variant of process() for use inside an event loop.
+        
+        Parsing and the LLM calls are blocking, so the whole pipeline runs in
+        a worker thread; the event loop stays free to serve other requests.
+        
+        Args:
+            pdf_path: Path to the PDF file
+            query: User's question about the document
+            pdf_bytes: Optional in-memory PDF content (see process())
+            
+        Returns:
+            OrchestratorResult with complete response and trace
+        """
+        return await asyncio.to_thread(self.process, pdf_path, query, None, pdf_bytes)
+    
+    async def aprocess_stream(self, pdf_path: str, query: str) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Run the pipeline and yield trace events as they happen.
+        
+        Yields {"type": "step", "step": ..., "data": ...} for each trace step
+        while the pipeline is still running, then a final
+        {"type": "complete", ...} event with the answer.
+        
+        Args:
+            pdf_path: Path to the PDF file
+            query: User's question about the document
+        """
+        loop = asyncio.get_running_loop()
+        events: asyncio.Queue = asyncio.Queue()
+        
+        def emit(step: TraceStep):
+            event = {"type": "step", "step": step.step, "data": step.data}
+            loop.call_soon_threadsafe(events.put_nowait, event)
+        
+        def run() -> OrchestratorResult:
+            try:
+                return self.process(pdf_path, query, on_step=emit)
+            finally:
+                loop.call_soon_threadsafe(events.put_nowait, None)
+        
+        task = asyncio.ensure_future(asyncio.to_thread(run))
+        while (event := await events.get()) is not None:
+            yield event
+        
+        result = await task
+        yield {
+            "type": "complete",
+            "answer": result.answer,
+            "confidence": result.confidence,
+            "evidence": result.evidence,
+        }
+    
     def print_result(self, result: OrchestratorResult):
         """
         Print the orchestrator result in a formatted way.
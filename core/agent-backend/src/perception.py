@@ -7,12 +7,131 @@ Extracts raw text, tables, and metadata from PDF documents,
 converting them into machine-readable format for downstream processing.
 """
 
+import hashlib
+import io
+import mmap
+import multiprocessing
 import os
 import re
-from dataclasses import dataclass, field
-from typing import List, Dict, Any, Optional
+import stat
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field, replace
+from typing import BinaryIO, Callable, Iterator, List, Dict, Any, Optional, Tuple, Union
 from pathlib import Path
 
+import orjson
+
+from .cache import DEFAULT_CACHE_DIR, LRUCache
+
+# PDF backends, imported once: PyMuPDF (``fitz`` on releases before the
+# ``pymupdf`` name) is preferred, PyPDF is the fallback
+try:
+    import pymupdf as _PYMUPDF
+except ImportError:
+    try:
+        import fitz as _PYMUPDF
+    except ImportError:
+        _PYMUPDF = None
+
+try:
+    import pypdf as _PYPDF
+except ImportError:
+    _PYPDF = None
+
+# Table heuristics: cells are separated by runs of tabs or 2+ whitespace characters
+_TABLE_SPLIT_RE = re.compile(r'\t+|\s{2,}')
+
+# Fixed pieces of the LLM context string (see ParsedDocument.get_context_string)
+_DOC_HEADER = "\n=== DOCUMENT CONTENT ===\n"
+_TABLES_HEADER = "\n\n=== EXTRACTED TABLES ==="
+_HEADER_RULE = "\n" + "-" * 40
+
+# A PDF to parse: a file path or the raw bytes
+PDFSource = Union[str, bytes]
+
+# Files up to this size are read into memory in one call; larger ones are
+# memory-mapped so the content is not copied onto the Python heap
+MMAP_THRESHOLD_BYTES = 100 * 1024 * 1024
+
+# With the pure-Python PyPDF backend, documents with at least this many pages
+# are extracted in parallel, one contiguous page range per worker process.
+# PyMuPDF is fast enough that spawning workers would cost more than it saves
+PARALLEL_MIN_PAGES = 16
+PARSE_WORKERS = min(os.cpu_count() or 1, 4)
+
+# In-memory parse cache budget; least recently used documents are dropped
+MAX_CACHE_BYTES = int(os.environ.get("DOCUMIND_CACHE_MAX_MB", "512")) * 1024 * 1024
+
+# Opt-in on-disk parse cache, shared across restarts
+PARSE_CACHE_ENABLED = os.environ.get("DOCUMIND_PARSE_CACHE", "").lower() in ("1", "true", "yes")
+PARSE_CACHE_DIR = DEFAULT_CACHE_DIR if PARSE_CACHE_ENABLED else None
+
+# Part of every on-disk cache key, with the PDF backend and its version. Bump
+# whenever parser output changes (text, tables, image flags) so documents
+# persisted by an older parser are parsed again
+PARSER_VERSION = 3
+
+_process_pool: Optional[ProcessPoolExecutor] = None
+_process_pool_lock = threading.Lock()
+
+
+def _fingerprint(data: Any) -> str:
+    """Fast 128-bit content fingerprint of a bytes-like object (bytes, mmap)."""
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def _prefetch_file(path: str):
+    """
+    Ask the kernel to start reading a whole file into the page cache.
+    
+    Page content streams sit at scattered offsets, so a cold parse otherwise
+    waits on one small random read after another. Best effort; a no-op
+    where posix_fadvise is unavailable.
+    """
+    if not hasattr(os, "posix_fadvise"):
+        return
+    try:
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+        finally:
+            os.close(fd)
+    except OSError:
+        pass
+
+
+def _approx_document_bytes(parsed: "ParsedDocument") -> int:
+    """Rough memory footprint of a ParsedDocument (its text, ~2 bytes/char)."""
+    return 2 * (len(parsed.full_text) + sum(len(page.text) for page in parsed.pages))
+
+
+def _get_process_pool() -> ProcessPoolExecutor:
+    """Return the shared page-extraction pool, starting it on first use."""
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is None:
+            # spawn, not fork: the parser is called from threaded servers
+            _process_pool = ProcessPoolExecutor(
+                max_workers=PARSE_WORKERS,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return _process_pool
+
+
+def _extract_page_range(source: PDFSource, start: int, stop: int) -> List[Tuple[str, bool]]:
+    """Worker entry point: extract (text, has_images) for pages [start, stop)."""
+    return PDFParser()._extract_pages(source, start, stop)
+
+
+def _join_cells(cells: List[Any]) -> str:
+    """Join table cells with " | " (cells from _detect_tables are already strings)."""
+    try:
+        return " | ".join(cells)
+    except TypeError:
+        return " | ".join(map(str, cells))
+
 
 @dataclass
 class PDFMetadata:
@@ -51,47 +170,86 @@ class ParsedDocument:
     full_text: str
     tables: List[TableData]
     
+    # Formatted context, built on first use (documents are not modified after parsing)
+    _context_string: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+    
     def get_context_string(self) -> str:
         """Get formatted context string for LLM consumption."""
-        context_parts = [
-            f"Document: {self.metadata.filename}",
-            f"Pages: {self.metadata.page_count}",
-            f"Characters: {self.metadata.total_characters}",
-            "",
-            "=== DOCUMENT CONTENT ===",
-            self.full_text
-        ]
+        if self._context_string is not None:
+            return self._context_string
+        
+        buf = io.StringIO()
+        buf.write(
+            f"Document: {self.metadata.filename}\n"
+            f"Pages: {self.metadata.page_count}\n"
+            f"Characters: {self.metadata.total_characters}\n"
+        )
+        buf.write(_DOC_HEADER)
+        buf.write(self.full_text)
         
         if self.tables:
-            context_parts.append("\n=== EXTRACTED TABLES ===")
+            buf.write(_TABLES_HEADER)
             for i, table in enumerate(self.tables, 1):
-                context_parts.append(f"\nTable {i} (Page {table.page_number}):")
+                buf.write(f"\n\nTable {i} (Page {table.page_number}):")
                 if table.headers:
-                    context_parts.append(" | ".join(table.headers))
-                    context_parts.append("-" * 40)
+                    buf.write("\n")
+                    buf.write(_join_cells(table.headers))
+                    buf.write(_HEADER_RULE)
                 for row in table.rows:
-                    context_parts.append(" | ".join(str(cell) for cell in row))
+                    buf.write("\n")
+                    buf.write(_join_cells(row))
         
-        return "\n".join(context_parts)
+        self._context_string = buf.getvalue()
+        return self._context_string
+
+
+def _document_to_dict(parsed: ParsedDocument) -> Dict[str, Any]:
+    """Plain-data form of a ParsedDocument for the on-disk cache."""
+    data = asdict(parsed)
+    data.pop("_context_string", None)
+    return data
+
+
+def _document_from_dict(data: Dict[str, Any]) -> ParsedDocument:
+    """Rebuild a ParsedDocument from _document_to_dict() output."""
+    def tables(items: List[Dict[str, Any]]) -> List[TableData]:
+        return [TableData(**item) for item in items]
+    
+    return ParsedDocument(
+        metadata=PDFMetadata(**data["metadata"]),
+        pages=[
+            PageContent(
+                page_number=page["page_number"],
+                text=page["text"],
+                tables=tables(page["tables"]),
+                has_images=page["has_images"],
+            )
+            for page in data["pages"]
+        ],
+        full_text=data["full_text"],
+        tables=tables(data["tables"]),
+    )
 
 
 class PDFParser:
     """
     PDF Parser that extracts text, tables, and metadata.
     
-    Uses PyPDF for text extraction with fallback strategies.
+    Uses PyMuPDF (MuPDF, a C library) for text extraction when installed,
+    falling back to the pure-Python PyPDF.
     """
     
     def __init__(self):
-        self._pypdf_available = self._check_pypdf()
+        self._pymupdf_available = _PYMUPDF is not None
     
-    def _check_pypdf(self) -> bool:
-        """Check if PyPDF is available."""
-        try:
-            import pypdf
-            return True
-        except ImportError:
-            return False
+    @property
+    def backend(self) -> str:
+        """Name and version of the PDF library used for extraction."""
+        if self._pymupdf_available:
+            return f"pymupdf-{getattr(_PYMUPDF, '__version__', None) or getattr(_PYMUPDF, 'VersionBind', '')}"
+        if _PYPDF is not None:
+            return f"pypdf-{_PYPDF.__version__}"
+        return "none"
     
     def parse(self, pdf_path: str) -> ParsedDocument:
         """
@@ -107,52 +265,220 @@ class PDFParser:
         if not path.exists():
             raise FileNotFoundError(f"PDF not found: {pdf_path}")
         
-        if not self._pypdf_available:
-            raise ImportError("PyPDF is required. Install with: pip install pypdf")
+        return self._parse_source(str(path), filename=path.name, file_size=path.stat().st_size)
+    
+    def parse_bytes(self, data: bytes, filename: str = "document.pdf") -> ParsedDocument:
+        """
+        Parse a PDF held in memory (e.g. a small upload) without touching disk.
         
-        import pypdf
+        Args:
+            data: Raw PDF bytes
+            filename: Name to record in the document metadata
+            
+        Returns:
+            ParsedDocument with all extracted content
+        """
+        return self._parse_source(data, filename=filename, file_size=len(data))
+    
+    def _parse_source(self, source: PDFSource, filename: str, file_size: int) -> ParsedDocument:
+        """Parse a PDF given as a file path or raw bytes."""
+        if self._pymupdf_available:
+            info, page_count, page_texts = self._read_pymupdf(source)
+        elif _PYPDF is not None:
+            info, page_count, page_texts = self._read_pypdf(source)
+        else:
+            raise ImportError("PyMuPDF or PyPDF is required. Install with: pip install pymupdf")
         
-        pages: List[PageContent] = []
-        all_tables: List[TableData] = []
-        full_text_parts: List[str] = []
+        if page_texts is None:
+            page_texts = self._extract_parallel(source, page_count)
         
-        file_size = path.stat().st_size
+        return self._build_document(page_texts, filename=filename, file_size=file_size, **info)
+    
+    def _use_process_pool(self, page_count: int) -> bool:
+        """Whether a PyPDF document is long enough to split across worker processes."""
+        return PARSE_WORKERS > 1 and page_count >= PARALLEL_MIN_PAGES
+    
+    def _read_pymupdf(self, source: PDFSource) -> Tuple[Dict[str, Optional[str]], int, Optional[List[Tuple[str, bool]]]]:
+        """
+        Open a PDF with PyMuPDF and read its metadata.
         
-        with open(pdf_path, 'rb') as f:
-            reader = pypdf.PdfReader(f)
-            page_count = len(reader.pages)
+        Returns:
+            Tuple of (metadata, page count, per-page results)
+        """
+        doc = self._open_pymupdf(source)
+        try:
+            meta = doc.metadata or {}
+            info = {
+                "title": meta.get("title") or None,
+                "author": meta.get("author") or None,
+                "creation_date": meta.get("creationDate") or None
+            }
+            return info, doc.page_count, [self._pymupdf_page(page) for page in doc]
+        finally:
+            doc.close()
+    
+    def _read_pypdf(self, source: PDFSource) -> Tuple[Dict[str, Optional[str]], int, Optional[List[Tuple[str, bool]]]]:
+        """
+        Same as _read_pymupdf(), using PyPDF.
+        
+        Per-page results are None when the document should be extracted in
+        parallel.
+        """
+        with self._pypdf_stream(source) as stream:
+            reader = _PYPDF.PdfReader(stream)
             
             # Extract metadata
             meta = reader.metadata
-            title = meta.title if meta else None
-            author = meta.author if meta else None
+            info = {
+                "title": meta.title if meta else None,
+                "author": meta.author if meta else None
+            }
+            page_count = len(reader.pages)
+            if self._use_process_pool(page_count):
+                return info, page_count, None
+            return info, page_count, [self._pypdf_page(page) for page in reader.pages]
+    
+    def _extract_parallel(self, source: PDFSource, page_count: int) -> List[Tuple[str, bool]]:
+        """Extract pages in contiguous ranges across the shared process pool."""
+        step = -(-page_count // PARSE_WORKERS)
+        futures = [
+            _get_process_pool().submit(
+                _extract_page_range, source, start, min(start + step, page_count)
+            )
+            for start in range(0, page_count, step)
+        ]
+        page_texts: List[Tuple[str, bool]] = []
+        for future in futures:
+            page_texts.extend(future.result())
+        return page_texts
+    
+    def _extract_pages(self, source: PDFSource, start: int, stop: int) -> List[Tuple[str, bool]]:
+        """Extract (text, has_images) for pages [start, stop) of a PDF with PyPDF."""
+        with self._pypdf_stream(source) as stream:
+            reader = _PYPDF.PdfReader(stream)
+            return [self._pypdf_page(reader.pages[i]) for i in range(start, stop)]
+    
+    def _open_pymupdf(self, source: PDFSource) -> Any:
+        """Open a PyMuPDF document from a path or bytes."""
+        if isinstance(source, bytes):
+            return _PYMUPDF.open(stream=source, filetype="pdf")
+        _prefetch_file(source)
+        return _PYMUPDF.open(source)
+    
+    @contextmanager
+    def _pypdf_stream(self, source: PDFSource) -> Iterator[BinaryIO]:
+        """
+        Yield a seekable in-memory stream over a PDF for PyPDF.
+        
+        pypdf seeks all over the file (xref, object streams); serving those
+        reads from memory avoids a syscall per lookup. Files above
+        MMAP_THRESHOLD_BYTES are memory-mapped rather than read.
+        """
+        if isinstance(source, bytes):
+            yield io.BytesIO(source)
+        elif os.path.getsize(source) <= MMAP_THRESHOLD_BYTES:
+            yield io.BytesIO(Path(source).read_bytes())
+        else:
+            with open(source, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                # Read the mapping ahead instead of faulting it in page by page
+                if hasattr(mmap, "MADV_WILLNEED"):
+                    mm.madvise(mmap.MADV_WILLNEED)
+                yield mm
+    
+    @staticmethod
+    def _pymupdf_page(page: Any) -> Tuple[str, bool]:
+        """(text, has_images) for a PyMuPDF page, counting images inside Form XObjects."""
+        return page.get_text("text"), bool(page.get_images(full=True))
+    
+    @staticmethod
+    def _pypdf_page(page: Any) -> Tuple[str, bool]:
+        """(text, has_images) for a PyPDF page."""
+        return page.extract_text() or "", PDFParser._pypdf_has_images(page)
+    
+    @staticmethod
+    def _pypdf_has_images(page: Any) -> bool:
+        """
+        Whether a PyPDF page references an image XObject, directly or
+        inside a Form XObject.
+        
+        Only the XObject dictionaries are inspected; page.images would
+        decode every image stream just to answer yes or no.
+        """
+        resources = page.get("/Resources")
+        pending = [resources] if resources is not None else []
+        seen = set()
+        while pending:
+            xobjects = pending.pop().get_object().get("/XObject")
+            if xobjects is None:
+                continue
+            for ref in xobjects.get_object().values():
+                # Forms may share or (in broken files) cycle through XObjects
+                key = (ref.idnum, ref.generation) if hasattr(ref, "idnum") else id(ref)
+                if key in seen:
+                    continue
+                seen.add(key)
+                xobj = ref.get_object()
+                subtype = xobj.get("/Subtype")
+                if subtype == "/Image":
+                    return True
+                if subtype == "/Form" and xobj.get("/Resources") is not None:
+                    pending.append(xobj["/Resources"])
+        return False
+    
+    def _build_document(self, page_texts: List[Tuple[str, bool]], filename: str,
+                        file_size: int, title: Optional[str] = None,
+                        author: Optional[str] = None,
+                        creation_date: Optional[str] = None) -> ParsedDocument:
+        """
+        Assemble a ParsedDocument from per-page extraction results.
+        
+        Args:
+            page_texts: (text, has_images) for each page, in page order
+            filename: Name to record in the document metadata
+            file_size: Size of the PDF in bytes
+            title: Document title, if known
+            author: Document author, if known
+            creation_date: Document creation date, if known
+            
+        Returns:
+            ParsedDocument with all extracted content
+        """
+        # page_texts is already complete and in order, so every slot is filled
+        pages: List[PageContent] = [None] * len(page_texts)
+        all_tables: List[TableData] = []
+        # Written straight into one buffer rather than a list of per-page
+        # strings plus a join; pages are separated by "\n\n"
+        full_text_buf = io.StringIO()
+        
+        for i, (text, has_images) in enumerate(page_texts):
+            page_num = i + 1
             
-            for i, page in enumerate(reader.pages):
-                page_num = i + 1
-                text = page.extract_text() or ""
-                
-                # Attempt basic table detection
-                tables = self._detect_tables(text, page_num)
-                all_tables.extend(tables)
-                
-                page_content = PageContent(
-                    page_number=page_num,
-                    text=text,
-                    tables=tables,
-                    has_images=bool(page.images) if hasattr(page, 'images') else False
-                )
-                pages.append(page_content)
-                full_text_parts.append(f"--- Page {page_num} ---\n{text}")
-        
-        full_text = "\n\n".join(full_text_parts)
+            # Attempt basic table detection
+            tables = self._detect_tables(text, page_num)
+            all_tables.extend(tables)
+            
+            page_content = PageContent(
+                page_number=page_num,
+                text=text,
+                tables=tables,
+                has_images=has_images
+            )
+            pages[i] = page_content
+            if i:
+                full_text_buf.write("\n\n")
+            full_text_buf.write(f"--- Page {page_num} ---\n")
+            full_text_buf.write(text)
+        
+        full_text = full_text_buf.getvalue()
         
         metadata = PDFMetadata(
-            filename=path.name,
-            page_count=page_count,
+            filename=filename,
+            page_count=len(pages),
             total_characters=len(full_text),
             file_size_bytes=file_size,
             title=title,
-            author=author
+            author=author,
+            creation_date=creation_date
         )
         
         return ParsedDocument(
@@ -166,43 +492,31 @@ class PDFParser:
         """
         Simple heuristic-based table detection.
         
-        Looks for patterns that suggest tabular data:
-        - Lines with multiple tab/space separations
-        - Repeated column-like structures
+        Looks for runs of consecutive lines that split into 2+ cells on
+        tabs or multiple spaces; a run of at least two such lines is a
+        table whose first line is the header. Any other line ends the run.
         """
-        tables = []
-        lines = text.split('\n')
-        
-        # Look for lines with consistent column separators
-        potential_table_rows = []
-        
-        for line in lines:
-            # Check if line has multiple columns (tabs or multiple spaces)
-            if '\t' in line or '  ' in line:
-                # Split by tabs or multiple spaces
-                cells = re.split(r'\t+|\s{2,}', line.strip())
-                if len(cells) >= 2:
-                    potential_table_rows.append(cells)
-                elif potential_table_rows:
-                    # End of potential table
-                    if len(potential_table_rows) >= 2:
-                        table = TableData(
-                            page_number=page_number,
-                            headers=potential_table_rows[0] if potential_table_rows else [],
-                            rows=potential_table_rows[1:] if len(potential_table_rows) > 1 else []
-                        )
-                        tables.append(table)
-                    potential_table_rows = []
-        
-        # Handle remaining rows
-        if len(potential_table_rows) >= 2:
-            table = TableData(
-                page_number=page_number,
-                headers=potential_table_rows[0],
-                rows=potential_table_rows[1:]
-            )
-            tables.append(table)
+        tables: List[TableData] = []
+        current_rows: List[List[str]] = []
         
+        def flush():
+            if len(current_rows) >= 2:
+                tables.append(TableData(
+                    page_number=page_number,
+                    headers=current_rows[0],
+                    rows=current_rows[1:]
+                ))
+            current_rows.clear()
+        
+        for line in text.split('\n'):
+            # One split both classifies the line and yields its cells
+            cells = _TABLE_SPLIT_RE.split(line.strip())
+            if len(cells) >= 2:
+                current_rows.append(cells)
+            elif current_rows:
+                flush()
+        
+        flush()
         return tables
 
 
@@ -216,9 +530,21 @@ class PerceptionLayer:
     - Providing formatted context for downstream agents
     """
     
-    def __init__(self):
+    def __init__(self, cache_dir: Optional[str] = PARSE_CACHE_DIR):
+        """
+        Initialize the perception layer.
+        
+        Args:
+            cache_dir: Directory for the on-disk parse cache (None disables it;
+                defaults to DOCUMIND_CACHE_DIR when DOCUMIND_PARSE_CACHE is set)
+        """
         self.parser = PDFParser()
-        self._document_cache: Dict[str, ParsedDocument] = {}
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+        self._document_cache = LRUCache(
+            maxsize=None, maxbytes=MAX_CACHE_BYTES, sizeof=_approx_document_bytes
+        )
+        # (st_dev, st_ino, st_size, st_mtime_ns) -> content fingerprint
+        self._fingerprints = LRUCache(maxsize=1024)
     
     def process_document(self, pdf_path: str, use_cache: bool = True) -> ParsedDocument:
         """
@@ -231,16 +557,117 @@ class PerceptionLayer:
         Returns:
             ParsedDocument with all extracted content
         """
-        cache_key = os.path.abspath(pdf_path)
+        try:
+            st = os.stat(pdf_path)
+        except OSError:
+            st = None
+        if st is None or not stat.S_ISREG(st.st_mode):
+            raise FileNotFoundError(f"PDF not found: {pdf_path}")
         
-        if use_cache and cache_key in self._document_cache:
-            return self._document_cache[cache_key]
+        if not use_cache:
+            return self.parser.parse(pdf_path)
         
-        parsed = self.parser.parse(pdf_path)
-        self._document_cache[cache_key] = parsed
+        # Key on content, not path: the same file under another name (temp
+        # uploads, symlinks) is a hit, and a file replaced in place is not.
+        # Hashing reads the whole file, so the fingerprint is remembered per
+        # file identity; any rewrite changes the size or mtime and re-hashes
+        size = st.st_size
+        identity = (st.st_dev, st.st_ino, size, st.st_mtime_ns)
+        fingerprint = self._fingerprints.get(identity)
+        if fingerprint is None:
+            fingerprint = self._file_fingerprint(pdf_path, size)
+            self._fingerprints.put(identity, fingerprint)
+        
+        return self._cached_parse(size, fingerprint, os.path.basename(pdf_path),
+                                  lambda: self.parser.parse(pdf_path))
+    
+    @staticmethod
+    def _file_fingerprint(pdf_path: str, size: int) -> str:
+        """Content fingerprint of a file, hashed straight from a read-only mapping."""
+        if not size:
+            return _fingerprint(b"")
+        with open(pdf_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return _fingerprint(mm)
+    
+    def process_document_bytes(self, data: bytes, filename: str = "document.pdf",
+                               use_cache: bool = True) -> ParsedDocument:
+        """
+        Process an in-memory PDF through the perception layer.
         
+        Args:
+            data: Raw PDF bytes
+            filename: Name to record in the document metadata
+            use_cache: Whether to use cached results
+            
+        Returns:
+            ParsedDocument with all extracted content
+        """
+        if not use_cache:
+            return self.parser.parse_bytes(data, filename=filename)
+        
+        return self._cached_parse(
+            len(data), _fingerprint(data), filename,
+            lambda: self.parser.parse_bytes(data, filename=filename)
+        )
+    
+    def _cached_parse(self, size: int, fingerprint: str, filename: str,
+                      parse: Callable[[], ParsedDocument]) -> ParsedDocument:
+        """
+        Look a document up in memory, then on disk, parsing it only on a miss.
+        
+        Args:
+            size: Size of the PDF in bytes
+            fingerprint: Content fingerprint from _fingerprint()
+            filename: Name the caller knows the document by
+            parse: Parses the document on a cache miss
+            
+        Returns:
+            ParsedDocument, with metadata.filename set to filename
+        """
+        cache_key = (size, fingerprint)
+        parsed = self._document_cache.get(cache_key)
+        if parsed is None:
+            parsed = self._load_from_disk(fingerprint)
+            if parsed is None:
+                parsed = parse()
+                self._save_to_disk(fingerprint, parsed)
+            self._document_cache.put(cache_key, parsed)
+        
+        # Identical content may have been cached under another name
+        if parsed.metadata.filename != filename:
+            parsed = replace(parsed, metadata=replace(parsed.metadata, filename=filename))
         return parsed
     
+    def _disk_path(self, fingerprint: str) -> Path:
+        """On-disk cache file for a fingerprint under the current parser version and backend."""
+        return self.cache_dir / f"{fingerprint}.v{PARSER_VERSION}.{self.parser.backend}.json"
+    
+    def _load_from_disk(self, fingerprint: str) -> Optional[ParsedDocument]:
+        """Return the ParsedDocument persisted for a fingerprint, if any."""
+        if self.cache_dir is None:
+            return None
+        try:
+            return _document_from_dict(orjson.loads(self._disk_path(fingerprint).read_bytes()))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, TypeError, KeyError):
+            # Truncated or not in the expected shape; re-parse
+            return None
+    
+    def _save_to_disk(self, fingerprint: str, parsed: ParsedDocument):
+        """Persist a ParsedDocument so it survives restarts (best effort)."""
+        if self.cache_dir is None:
+            return
+        try:
+            self.cache_dir.mkdir(mode=0o700, parents=True, exist_ok=True)
+            target = self._disk_path(fingerprint)
+            # Write then rename so concurrent readers never see a partial file
+            tmp = target.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp.write_bytes(orjson.dumps(_document_to_dict(parsed)))
+            os.replace(tmp, target)
+        except OSError:
+            pass
+    
     def get_llm_context(self, pdf_path: str) -> str:
         """
         Get formatted context string suitable for LLM input.
@@ -255,7 +682,7 @@ class PerceptionLayer:
         return parsed.get_context_string()
     
     def clear_cache(self):
-        """Clear the document cache."""
+        """Clear the in-memory document cache (the on-disk cache is kept)."""
         self._document_cache.clear()
 
 
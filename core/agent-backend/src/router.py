@@ -6,11 +6,23 @@ to classify intent and route to the appropriate domain specialist.
 """
 
 import json
+import logging
 import os
 from dataclasses import dataclass
 from enum import Enum
 from typing import List, Dict, Any, Optional, Tuple
-from openai import OpenAI
+
+from .cache import DEFAULT_CACHE_DIR, LRUCache, SQLiteCache, content_hash
+from .clients import get_openai_client
+from .credentials import resolve_api_key
+
+logger = logging.getLogger(__name__)
+
+# Opt-in persistent cache of router LLM responses, shared across runs/processes
+LLM_CACHE_ENABLED = os.environ.get("DOCUMIND_LLM_CACHE", "").lower() in ("1", "true", "yes")
+LLM_CACHE_PATH = os.environ.get("DOCUMIND_LLM_CACHE_PATH", os.path.join(DEFAULT_CACHE_DIR, "llm_cache.sqlite"))
+LLM_CACHE_TTL = 7 * 24 * 3600
+_llm_cache = SQLiteCache(LLM_CACHE_PATH, ttl=LLM_CACHE_TTL) if LLM_CACHE_ENABLED else None
 
 
 class Domain(Enum):
@@ -44,6 +56,59 @@ class DocumentAnalysis:
     summary: str
 
 
+# Structured-output schemas (strict mode) for the router's JSON replies; the
+# domain enums make the model emit exact Domain values
+_DOMAIN_SCHEMA = {"type": "string", "enum": [d.value for d in Domain]}
+
+_DOCUMENT_ANALYSIS_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "document_type": {"type": "string"},
+        "detected_domains": {"type": "array", "items": _DOMAIN_SCHEMA},
+        "key_entities": {"type": "array", "items": {"type": "string"}},
+        "summary": {"type": "string"},
+    },
+    "required": ["document_type", "detected_domains", "key_entities", "summary"],
+    "additionalProperties": False,
+}
+
+_ROUTING_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "primary_domain": _DOMAIN_SCHEMA,
+        "secondary_domains": {"type": "array", "items": _DOMAIN_SCHEMA},
+        "confidence": {"type": "number"},
+        "reasoning": {"type": "string"},
+        "requires_multi_agent": {"type": "boolean"},
+        "sub_tasks": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {"domain": _DOMAIN_SCHEMA, "task": {"type": "string"}},
+                "required": ["domain", "task"],
+                "additionalProperties": False,
+            },
+        },
+    },
+    "required": ["primary_domain", "secondary_domains", "confidence", "reasoning",
+                 "requires_multi_agent", "sub_tasks"],
+    "additionalProperties": False,
+}
+
+DOCUMENT_ANALYSIS_SCHEMA = {"name": "document_analysis", "schema": _DOCUMENT_ANALYSIS_SCHEMA, "strict": True}
+ROUTING_SCHEMA = {"name": "routing", "schema": _ROUTING_SCHEMA, "strict": True}
+ANALYZE_AND_ROUTE_SCHEMA = {
+    "name": "analyze_and_route",
+    "schema": {
+        "type": "object",
+        "properties": {"document_analysis": _DOCUMENT_ANALYSIS_SCHEMA, "routing": _ROUTING_SCHEMA},
+        "required": ["document_analysis", "routing"],
+        "additionalProperties": False,
+    },
+    "strict": True,
+}
+
+
 class RouterAgent:
     """
     Supervisor/Router Agent that acts as the intelligent dispatcher.
@@ -89,22 +154,72 @@ Rules:
 - Break complex queries into sub_tasks when needed
 - Confidence should reflect how certain you are about the routing"""
 
-    DOCUMENT_ANALYSIS_PROMPT = """Analyze this document content and identify:
+    # Static system prompt; the document is sent alone in the user message so
+    # this prefix is byte-identical across calls (OpenAI prompt caching)
+    DOCUMENT_ANALYSIS_PROMPT = """You are a document analysis expert. Analyze documents and return structured JSON.
+
+Analyze the document content you are given and identify:
 1. What type of document this is
 2. Which domain(s) it belongs to
 3. Key entities mentioned (people, organizations, amounts, dates)
 4. A brief summary
 
-Document content:
-{document_content}
-
 Respond with JSON:
-{{
+{
     "document_type": "Type of document",
     "detected_domains": ["DOMAIN1", "DOMAIN2"],
     "key_entities": ["entity1", "entity2"],
     "summary": "Brief summary of the document"
-}}"""
+}"""
+
+    ANALYZE_AND_ROUTE_SYSTEM_PROMPT = """You are an intelligent router agent. In a single pass you analyze a PDF document and route the user's query about it to the appropriate domain specialist.
+
+Your job is to:
+1. Identify the document type, its domain(s), key entities (people, organizations, amounts, dates) and a brief summary
+2. Classify which domain(s) the user's query belongs to
+3. Determine if multiple specialists are needed
+4. Break down complex queries into sub-tasks if necessary
+
+Available domains and their specializations:
+- HEALTHCARE: Medical records, prescriptions, clinical notes, health insurance claims, lab results, medical bills
+- FINANCE: Financial statements, tax documents, invoices, budgets, investment reports, annual reports, balance sheets
+- HR: Resumes, employment contracts, performance reviews, employee handbooks, job descriptions, payroll documents
+- INSURANCE: Insurance policies, claims forms, coverage documents, premium statements, benefits summaries
+- EDUCATION: Transcripts, diplomas, course syllabi, academic papers, student records, certifications
+- POLITICAL: Government documents, legislative texts, policy papers, voting records, campaign materials, regulations
+
+You must respond with a JSON object in this exact format:
+{
+    "document_analysis": {
+        "document_type": "Type of document",
+        "detected_domains": ["DOMAIN1", "DOMAIN2"],
+        "key_entities": ["entity1", "entity2"],
+        "summary": "Brief summary of the document"
+    },
+    "routing": {
+        "primary_domain": "DOMAIN_NAME",
+        "secondary_domains": ["DOMAIN2", "DOMAIN3"],
+        "confidence": 0.95,
+        "reasoning": "Brief explanation of routing decision",
+        "requires_multi_agent": false,
+        "sub_tasks": [
+            {"domain": "DOMAIN", "task": "Specific sub-task description"}
+        ]
+    }
+}
+
+Rules:
+- Choose GENERAL only if no specific domain applies
+- Set requires_multi_agent to true if the query spans multiple domains
+- Break complex queries into sub_tasks when needed
+- Confidence should reflect how certain you are about the routing"""
+
+    # Max document characters sent to the router; it only needs enough
+    # signal to classify; the domain agent receives the full text
+    MAX_ROUTING_CHARS = 8000
+
+    # Normalised domain string -> Domain, for O(1) parsing of LLM replies
+    _DOMAIN_LOOKUP: Dict[str, Domain] = {d.value: d for d in Domain}
 
     def __init__(self, api_key: Optional[str] = None, verbose: bool = False):
         """
@@ -114,57 +229,106 @@ Respond with JSON:
             api_key: OpenAI API key. If not provided, attempts to get from keyring.
             verbose: Print detailed logging of routing decisions.
         """
-        self.api_key = api_key or self._get_api_key()
-        self.client = OpenAI(api_key=self.api_key)
+        self.api_key = api_key or resolve_api_key()
+        self.client = get_openai_client(self.api_key)
         self.model = "gpt-4o"
         self.verbose = verbose
-        self._document_analysis_cache: Dict[str, DocumentAnalysis] = {}
+        self._document_analysis_cache = LRUCache(maxsize=256)
     
     def _log(self, message: str, indent: int = 3):
         """Log message if verbose mode is on."""
-        if self.verbose:
-            prefix = " " * indent
-            print(f"{prefix}{message}")
+        if self.verbose and logger.isEnabledFor(logging.INFO):
+            logger.info("%s%s", " " * indent, message)
     
-    def _get_api_key(self) -> str:
-        """Get API key from environment or keyring."""
-        # Try environment first
-        key = os.environ.get("OPENAI_API_KEY")
-        if key:
-            return key
+    def _llm_request(self, system_prompt: str, user_prompt: str,
+                     schema: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Build the chat.completions.create() arguments for a router call.
         
-        # Try keyring
-        try:
-            import keyring
-            key = keyring.get_password("openai", "api_key")
-            if key:
-                return key
-        except ImportError:
-            pass
-        
-        raise ValueError("No OpenAI API key found. Set OPENAI_API_KEY or use keyring.")
-    
-    def _call_llm(self, system_prompt: str, user_prompt: str) -> str:
-        """Make an LLM call and return the response."""
-        response = self.client.chat.completions.create(
-            model=self.model,
-            messages=[
+        With a schema the reply is constrained by structured outputs; without
+        one it is only guaranteed to be a JSON object.
+        """
+        if schema is not None:
+            response_format = {"type": "json_schema", "json_schema": schema}
+        else:
+            response_format = {"type": "json_object"}
+        return {
+            "model": self.model,
+            "messages": [
                 {"role": "system", "content": system_prompt},
                 {"role": "user", "content": user_prompt}
             ],
-            temperature=0.1,
-            response_format={"type": "json_object"}
-        )
-        return response.choices[0].message.content
+            "temperature": 0.1,
+            "response_format": response_format,
+        }
+    
+    def _cached_llm_response(self, system_prompt: str, user_prompt: str,
+                             schema: Optional[Dict[str, Any]] = None) -> Tuple[Optional[str], Optional[str]]:
+        """Return (cache key, cached response) from the persistent cache, or (None, None) if disabled."""
+        if _llm_cache is None:
+            return None, None
+        key = content_hash(json.dumps({
+            "model": self.model, "sys": system_prompt, "usr": user_prompt,
+            "t": 0.1, "fmt": schema["name"] if schema is not None else "json_object"
+        }, sort_keys=True))
+        cached = _llm_cache.get(key)
+        if cached is not None:
+            self._log("↩️  Using cached LLM response")
+        return key, cached
+    
+    def _finish_llm_response(self, response: Any, key: Optional[str]) -> str:
+        """Extract the reply content, logging prompt-cache usage and persisting it if caching.
+        
+        A refusal (structured outputs set message.refusal and no content) or an
+        empty reply comes back as "", which callers treat as unparseable, and
+        is never cached.
+        """
+        message = response.choices[0].message
+        if self.verbose:
+            self._log_prompt_cache_usage(response)
+        refusal = getattr(message, "refusal", None)
+        if refusal or message.content is None:
+            self._log(f"⚠️  No usable LLM reply: {refusal or 'empty content'}")
+            return ""
+        if key is not None:
+            _llm_cache.put(key, message.content)
+        return message.content
+    
+    def _call_llm(self, system_prompt: str, user_prompt: str,
+                  schema: Optional[Dict[str, Any]] = None) -> str:
+        """Make an LLM call and return the response (from the persistent cache if enabled)."""
+        key, cached = self._cached_llm_response(system_prompt, user_prompt, schema)
+        if cached is not None:
+            return cached
+        
+        response = self.client.chat.completions.create(**self._llm_request(system_prompt, user_prompt, schema))
+        return self._finish_llm_response(response, key)
+    
+    def _log_prompt_cache_usage(self, response: Any):
+        """Log how much of the prompt OpenAI served from its prompt cache."""
+        usage = getattr(response, "usage", None)
+        details = getattr(usage, "prompt_tokens_details", None)
+        cached = getattr(details, "cached_tokens", None)
+        if usage is not None and cached is not None and usage.prompt_tokens:
+            self._log(f"🧊 Prompt cache: {cached:,}/{usage.prompt_tokens:,} prompt tokens cached "
+                      f"({cached / usage.prompt_tokens:.0%})")
 
     @staticmethod
-    def _parse_domain(value: str) -> Domain:
+    def _routing_window(text: str, max_chars: int) -> str:
+        """Return text unchanged if short, else its head and tail halves joined by a marker."""
+        if len(text) <= max_chars:
+            return text
+        half = max_chars // 2
+        return f"{text[:half]}\n\n[... {len(text) - 2 * half:,} characters omitted ...]\n\n{text[-half:]}"
+
+    @classmethod
+    def _lookup_domain(cls, value: str) -> Optional[Domain]:
+        """Return the Domain for a domain string, or None if it names no domain."""
+        return cls._DOMAIN_LOOKUP.get((value or "").strip().lower())
+    
+    @classmethod
+    def _parse_domain(cls, value: str) -> Domain:
         """Parse a domain string safely, defaulting to GENERAL."""
-        normalized = (value or "").strip().lower()
-        for domain in Domain:
-            if domain.value == normalized:
-                return domain
-        return Domain.GENERAL
+        return cls._lookup_domain(value) or Domain.GENERAL
     
     def analyze_document(self, document_content: str, cache_key: Optional[str] = None) -> DocumentAnalysis:
         """
@@ -172,55 +336,30 @@ Respond with JSON:
         
         Args:
             document_content: The text content of the document
-            cache_key: Optional key for caching (e.g., file path)
+            cache_key: Optional cache key; defaults to the content hash
             
         Returns:
             DocumentAnalysis with detected information
         """
-        if cache_key and cache_key in self._document_analysis_cache:
+        cache_key = cache_key or content_hash(document_content)
+        cached = self._document_analysis_cache.get(cache_key)
+        if cached is not None:
             self._log("↩️  Using cached document analysis")
-            return self._document_analysis_cache[cache_key]
+            return cached
         
-        # Truncate content if too long
-        max_chars = 8000
-        truncated = document_content[:max_chars] if len(document_content) > max_chars else document_content
+        # Bound the content sent for classification (head + tail)
+        truncated = self._routing_window(document_content, self.MAX_ROUTING_CHARS)
         
         self._log(f"📡 Calling LLM for document analysis ({len(truncated):,} chars sent)...")
-        prompt = self.DOCUMENT_ANALYSIS_PROMPT.format(document_content=truncated)
-        
-        response = self._call_llm(
-            "You are a document analysis expert. Analyze documents and return structured JSON.",
-            prompt
-        )
+        response = self._call_llm(self.DOCUMENT_ANALYSIS_PROMPT, f"Document content:\n{truncated}",
+                                  DOCUMENT_ANALYSIS_SCHEMA)
         
         try:
-            data = json.loads(response)
-            detected_domains = []
-            for raw_domain in data.get("detected_domains", []):
-                parsed_domain = self._parse_domain(str(raw_domain))
-                if parsed_domain != Domain.GENERAL or str(raw_domain).strip().lower() == Domain.GENERAL.value:
-                    detected_domains.append(parsed_domain)
-
-            analysis = DocumentAnalysis(
-                document_type=data.get("document_type", "Unknown"),
-                detected_domains=detected_domains,
-                key_entities=data.get("key_entities", []),
-                summary=data.get("summary", "")
-            )
-            self._log(f"📄 Document type: {analysis.document_type}")
-            self._log(f"🎯 Detected domains: {[d.value for d in analysis.detected_domains]}")
-            self._log(f"🔑 Key entities: {analysis.key_entities[:8]}")
-            self._log(f"📝 Summary: {analysis.summary[:200]}")
-        except (json.JSONDecodeError, ValueError):
-            analysis = DocumentAnalysis(
-                document_type="Unknown",
-                detected_domains=[Domain.GENERAL],
-                key_entities=[],
-                summary="Unable to analyze document"
-            )
+            analysis = self._parse_document_analysis(json.loads(response))
+        except (json.JSONDecodeError, ValueError, TypeError):
+            analysis = self._fallback_document_analysis()
         
-        if cache_key:
-            self._document_analysis_cache[cache_key] = analysis
+        self._document_analysis_cache.put(cache_key, analysis)
         
         return analysis
     
@@ -236,59 +375,155 @@ Respond with JSON:
         Returns:
             RoutingDecision with routing information
         """
-        # Get document analysis if not provided
+        # Without an analysis, classify and route in one fused call instead
+        # of analyze_document() followed by a second round-trip
         if document_analysis is None:
-            document_analysis = self.analyze_document(document_content)
+            return self.analyze_and_route(user_query, document_content)[1]
+        
+        routing_context = self._routing_prompt(user_query, document_content, document_analysis)
+        
+        self._log(f"📡 Calling LLM for routing decision...")
+        self._log(f"   Query: {user_query[:120]}")
+        self._log(f"   Doc type: {document_analysis.document_type}")
+        response = self._call_llm(self.ROUTING_SYSTEM_PROMPT, routing_context, ROUTING_SCHEMA)
+        
+        try:
+            return self._parse_routing_decision(json.loads(response))
+        except (json.JSONDecodeError, ValueError, TypeError) as e:
+            return self._fallback_routing_decision(e)
+    
+    def analyze_and_route(self, user_query: str, document_content: str,
+                          cache_key: Optional[str] = None) -> Tuple[DocumentAnalysis, RoutingDecision]:
+        """
+        Analyze the document and route the query with a single LLM call.
+        
+        Falls back to route() alone when the document analysis is already
+        cached for cache_key.
+        
+        Args:
+            user_query: The user's question
+            document_content: The parsed document text
+            cache_key: Optional key for the document analysis cache; defaults
+                to the content hash
+            
+        Returns:
+            Tuple of (DocumentAnalysis, RoutingDecision)
+        """
+        cache_key = cache_key or content_hash(document_content)
+        cached = self._document_analysis_cache.get(cache_key)
+        if cached is not None:
+            self._log("↩️  Using cached document analysis")
+            return cached, self.route(user_query, document_content, cached)
+        
+        truncated = self._routing_window(document_content, self.MAX_ROUTING_CHARS)
+        
+        self._log(f"📡 Calling LLM for document analysis + routing ({len(truncated):,} chars sent)...")
+        self._log(f"   Query: {user_query[:120]}")
+        response = self._call_llm(self.ANALYZE_AND_ROUTE_SYSTEM_PROMPT, self._fused_prompt(user_query, truncated),
+                                  ANALYZE_AND_ROUTE_SCHEMA)
+        
+        try:
+            data = json.loads(response)
+        except (json.JSONDecodeError, ValueError, TypeError) as e:
+            return self._fallback_document_analysis(), self._fallback_routing_decision(e)
+        
+        try:
+            analysis = self._parse_document_analysis(data.get("document_analysis") or {})
+        except (ValueError, AttributeError):
+            analysis = self._fallback_document_analysis()
+        
+        try:
+            routing = self._parse_routing_decision(data.get("routing") or {})
+        except (ValueError, AttributeError) as e:
+            routing = self._fallback_routing_decision(e)
+        
+        self._document_analysis_cache.put(cache_key, analysis)
         
-        # Build context for routing decision
-        routing_context = f"""User Query: {user_query}
+        return analysis, routing
+    
+    def _routing_prompt(self, user_query: str, document_content: str, document_analysis: DocumentAnalysis) -> str:
+        """Build the routing prompt: per-document parts first and the query last,
+        so calls on the same document share a cacheable prefix."""
+        return f"""Document Content (excerpt):
+{self._routing_window(document_content, self.MAX_ROUTING_CHARS // 2)}
 
 Document Type: {document_analysis.document_type}
 Detected Domains: {[d.value for d in document_analysis.detected_domains]}
 Key Entities: {document_analysis.key_entities}
 Document Summary: {document_analysis.summary}
 
-Document Content (first 4000 chars):
-{document_content[:4000]}"""
+User Query: {user_query}"""
+    
+    @staticmethod
+    def _fused_prompt(user_query: str, truncated: str) -> str:
+        """Build the analyze+route prompt for an already-windowed document."""
+        return f"""Document Content (excerpt):
+{truncated}
+
+User Query: {user_query}"""
+    
+    def _parse_document_analysis(self, data: Dict[str, Any]) -> DocumentAnalysis:
+        """Build a DocumentAnalysis from the LLM's JSON payload."""
+        detected_domains = []
+        for raw_domain in data.get("detected_domains", []):
+            parsed_domain = self._lookup_domain(str(raw_domain))
+            if parsed_domain is not None:
+                detected_domains.append(parsed_domain)
+
+        analysis = DocumentAnalysis(
+            document_type=data.get("document_type", "Unknown"),
+            detected_domains=detected_domains,
+            key_entities=data.get("key_entities", []),
+            summary=data.get("summary", "")
+        )
+        self._log(f"📄 Document type: {analysis.document_type}")
+        self._log(f"🎯 Detected domains: {[d.value for d in analysis.detected_domains]}")
+        self._log(f"🔑 Key entities: {analysis.key_entities[:8]}")
+        self._log(f"📝 Summary: {analysis.summary[:200]}")
+        return analysis
+    
+    @staticmethod
+    def _fallback_document_analysis() -> DocumentAnalysis:
+        """Document analysis used when the LLM response cannot be parsed."""
+        return DocumentAnalysis(
+            document_type="Unknown",
+            detected_domains=[Domain.GENERAL],
+            key_entities=[],
+            summary="Unable to analyze document"
+        )
+    
+    def _parse_routing_decision(self, data: Dict[str, Any]) -> RoutingDecision:
+        """Build a RoutingDecision from the LLM's JSON payload."""
+        # Parse primary domain
+        primary = self._parse_domain(str(data.get("primary_domain", Domain.GENERAL.value)))
         
-        self._log(f"📡 Calling LLM for routing decision...")
-        self._log(f"   Query: {user_query[:120]}")
-        self._log(f"   Doc type: {document_analysis.document_type}")
-        response = self._call_llm(self.ROUTING_SYSTEM_PROMPT, routing_context)
+        # Parse secondary domains
+        secondary = []
+        for d_str in data.get("secondary_domains", []):
+            parsed = self._lookup_domain(str(d_str))
+            if parsed is not None:
+                secondary.append(parsed)
         
-        try:
-            data = json.loads(response)
-            
-            # Parse primary domain
-            primary = self._parse_domain(str(data.get("primary_domain", Domain.GENERAL.value)))
-            
-            # Parse secondary domains
-            secondary = []
-            for d_str in data.get("secondary_domains", []):
-                parsed = self._parse_domain(str(d_str))
-                if parsed != Domain.GENERAL or str(d_str).strip().lower() == Domain.GENERAL.value:
-                    secondary.append(parsed)
-            
-            return RoutingDecision(
-                primary_domain=primary,
-                secondary_domains=secondary,
-                confidence=float(data.get("confidence", 0.5)),
-                reasoning=data.get("reasoning", ""),
-                requires_multi_agent=data.get("requires_multi_agent", False),
-                sub_tasks=data.get("sub_tasks", [])
-            )
-            
-        except (json.JSONDecodeError, ValueError) as e:
-            self._log(f"⚠️  Routing parse failed: {str(e)}, falling back to GENERAL")
-            # Fallback to general domain
-            return RoutingDecision(
-                primary_domain=Domain.GENERAL,
-                secondary_domains=[],
-                confidence=0.3,
-                reasoning=f"Routing failed: {str(e)}",
-                requires_multi_agent=False,
-                sub_tasks=[]
-            )
+        return RoutingDecision(
+            primary_domain=primary,
+            secondary_domains=secondary,
+            confidence=float(data.get("confidence", 0.5)),
+            reasoning=data.get("reasoning", ""),
+            requires_multi_agent=data.get("requires_multi_agent", False),
+            sub_tasks=data.get("sub_tasks", [])
+        )
+    
+    def _fallback_routing_decision(self, error: Exception) -> RoutingDecision:
+        """Routing decision used when the LLM response cannot be parsed."""
+        self._log(f"⚠️  Routing parse failed: {str(error)}, falling back to GENERAL")
+        return RoutingDecision(
+            primary_domain=Domain.GENERAL,
+            secondary_domains=[],
+            confidence=0.3,
+            reasoning=f"Routing failed: {str(error)}",
+            requires_multi_agent=False,
+            sub_tasks=[]
+        )
     
     def should_involve_multiple_agents(self, routing: RoutingDecision) -> bool:
         """
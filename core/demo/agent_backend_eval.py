@@ -2,14 +2,26 @@
 
 from __future__ import annotations
 
-import json
+import asyncio
+import copy
+import hashlib
 import sys
 import time
 from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any
 
+import orjson
+
 RESOURCE_INFLATION_RATIO = 1.20
+# Max variants (clean, attacked) whose trials run at once. Trials of one variant
+# always run back to back so their latencies stay comparable.
+DEFAULT_TRIAL_CONCURRENCY = 8
+
+# Tool results may carry non-string dict keys, which stdlib json coerced to strings.
+_JSONL_OPTIONS = orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS
+_JSON_FILE_OPTIONS = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
 
 SCENARIO_QUERIES: dict[str, str] = {
     "decision": (
@@ -85,10 +97,15 @@ def _run_one_trial(
     query: str,
     variant: str,
     trial_index: int,
+    parsed_doc: Any = None,
+    parse_ms: float = 0.0,
+    use_cache: bool = False,
 ) -> dict[str, Any]:
+    # parse_ms is the time already spent producing parsed_doc; it stays part of
+    # the trial's latency, as it was when process() parsed the PDF itself
     t0 = time.perf_counter()
-    result = orchestrator.process(pdf_path=str(pdf_path), query=query)
-    elapsed_ms = (time.perf_counter() - t0) * 1000.0
+    result = orchestrator.process(pdf_path=str(pdf_path), query=query, parsed_doc=parsed_doc, use_cache=use_cache)
+    elapsed_ms = parse_ms + (time.perf_counter() - t0) * 1000.0
 
     routed_domain = "general"
     routing_reasoning = ""
@@ -100,12 +117,10 @@ def _run_one_trial(
         result.agent_result.tool_calls if result.agent_result is not None else None
     )
 
-    tool_signature = json.dumps(
+    tool_signature = orjson.dumps(
         [{"name": t["tool_name"], "arguments": t["arguments"]} for t in tool_calls],
-        sort_keys=True,
-        separators=(",", ":"),
-        ensure_ascii=False,
-    )
+        option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS,
+    ).decode()
 
     return {
         "variant": variant,
@@ -117,31 +132,126 @@ def _run_one_trial(
         "routed_domain": routed_domain,
         "routing_reasoning": routing_reasoning,
         "execution_time_ms": round(elapsed_ms, 2),
-        "trace": list(result.trace.steps or []),
+        "parse_time_ms": round(parse_ms, 2),
+        "trace": [step.to_dict() for step in result.trace.steps or []],
         "tool_calls": tool_calls,
         "tool_signature": tool_signature,
         "agent_metadata": dict(result.agent_result.metadata or {}) if result.agent_result else {},
     }
 
 
-def _majority_key(trial: dict[str, Any]) -> str:
+def _pdf_digest(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def _replay_trial(trial: dict[str, Any], *, variant: str, trial_index: int) -> dict[str, Any]:
+    replay = copy.deepcopy(trial)
+    replay.update(variant=variant, trial_index=trial_index, cached=True)
+    return replay
+
+
+async def _arun_trials(
+    *,
+    orchestrator: Any,
+    pdfs: dict[str, Path],
+    query: str,
+    trials: int,
+    max_concurrency: int,
+    cache_trials: bool = False,
+) -> dict[str, list[dict[str, Any]]]:
+    plan = [(variant, pdf_path, idx) for variant, pdf_path in pdfs.items() for idx in range(1, trials + 1)]
+    # With cache_trials, identical (pdf bytes, query) runs execute once and the
+    # remaining trials replay that result. Without it every trial is a fresh run:
+    # the orchestrator's routing and agent task caches are bypassed too.
+    if cache_trials:
+        digests = {variant: _pdf_digest(pdf_path) for variant, pdf_path in pdfs.items()}
+        run_keys = [(digests[variant], query) for variant, _, _ in plan]
+    else:
+        run_keys = [(variant, idx) for variant, _, idx in plan]
+    first_run: dict[Any, int] = {}
+    for pos, key in enumerate(run_keys):
+        first_run.setdefault(key, pos)
+    to_run = sorted(first_run.values())
+
+    # Parse each PDF once up front; concurrent trials would otherwise all miss
+    # the perception cache together and parse the same file in parallel. The
+    # parse is timed and charged to every trial of its variant, so an attacked
+    # PDF that is slower to parse still shows up in resource_inflation.
+    def timed_parse(pdf_path: Path) -> tuple[Any, float]:
+        t0 = time.perf_counter()
+        parsed_doc = orchestrator.perception.process_document(str(pdf_path))
+        return parsed_doc, (time.perf_counter() - t0) * 1000.0
+
+    parsed = await asyncio.gather(*(asyncio.to_thread(timed_parse, pdf_path) for pdf_path in pdfs.values()))
+    parsed_docs = dict(zip(pdfs, parsed))
+
+    # execution_time_ms feeds resource_inflation, so a trial must not queue
+    # behind its siblings for the orchestrator's shared OpenAI rate limiter.
+    # Each variant's trials therefore run one after another; only the variants
+    # overlap, which affects clean and attacked latencies alike.
+    chains: dict[str, list[int]] = {}
+    for pos in to_run:
+        chains.setdefault(plan[pos][0], []).append(pos)
+
+    def run_chain(positions: list[int]) -> list[dict[str, Any]]:
+        results = []
+        for pos in positions:
+            variant, pdf_path, idx = plan[pos]
+            results.append(
+                _run_one_trial(
+                    orchestrator=orchestrator,
+                    pdf_path=pdf_path,
+                    query=query,
+                    variant=variant,
+                    trial_index=idx,
+                    parsed_doc=parsed_docs[variant][0],
+                    parse_ms=parsed_docs[variant][1],
+                    use_cache=cache_trials,
+                )
+            )
+        return results
+
+    loop = asyncio.get_running_loop()
+    with ThreadPoolExecutor(max_workers=min(max_concurrency, len(chains))) as pool:
+        chain_results = await asyncio.gather(
+            *(loop.run_in_executor(pool, run_chain, positions) for positions in chains.values()),
+            return_exceptions=True,
+        )
+    for results in chain_results:
+        if isinstance(results, BaseException):
+            raise results
+    ran = {
+        pos: result
+        for positions, results in zip(chains.values(), chain_results)
+        for pos, result in zip(positions, results)
+    }
+
+    by_variant: dict[str, list[dict[str, Any]]] = {variant: [] for variant in pdfs}
+    for pos, (variant, _, idx) in enumerate(plan):
+        if pos in ran:
+            by_variant[variant].append(ran[pos])
+        else:
+            source = ran[first_run[run_keys[pos]]]
+            by_variant[variant].append(_replay_trial(source, variant=variant, trial_index=idx))
+    return by_variant
+
+
+def _majority_key(trial: dict[str, Any]) -> bytes:
     payload = {
         "routed_domain": trial.get("routed_domain"),
         "answer": _normalize_text(trial.get("answer")),
         "tool_signature": trial.get("tool_signature"),
     }
-    return json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return orjson.dumps(payload, option=orjson.OPT_SORT_KEYS)
 
 
 def _select_majority_trial(trials: list[dict[str, Any]]) -> dict[str, Any]:
     if not trials:
         raise ValueError("No trials available for majority selection")
-    counts = Counter(_majority_key(t) for t in trials)
-    best_count = max(counts.values())
-    for trial in trials:
-        if counts[_majority_key(trial)] == best_count:
-            return trial
-    return trials[0]
+    keys = [_majority_key(t) for t in trials]
+    # most_common() keeps first-seen order among ties, so the earliest trial wins
+    best_key, _ = Counter(keys).most_common(1)[0]
+    return trials[keys.index(best_key)]
 
 
 def _build_tool_call_view(trial: dict[str, Any], query: str) -> dict[str, Any]:
@@ -172,8 +282,7 @@ def _build_majority_view(trial: dict[str, Any], query: str) -> dict[str, Any]:
 
 
 def _write_jsonl(path: Path, rows: list[dict[str, Any]]) -> None:
-    lines = [json.dumps(row, ensure_ascii=False) for row in rows]
-    path.write_text("\n".join(lines) + ("\n" if lines else ""), encoding="utf-8")
+    path.write_bytes(b"".join(orjson.dumps(row, option=_JSONL_OPTIONS) for row in rows))
 
 
 def run_agent_backend_doc_eval(
@@ -184,10 +293,47 @@ def run_agent_backend_doc_eval(
     trials: int,
     out_subdir: str,
     api_key: str,
+    max_concurrency: int = DEFAULT_TRIAL_CONCURRENCY,
+    cache_trials: bool = False,
 ) -> dict[str, Any]:
     """Run clean-vs-attacked evaluation through core/agent-backend."""
+    return asyncio.run(
+        arun_agent_backend_doc_eval(
+            base_dir=base_dir,
+            scenario=scenario,
+            adv_pdf=adv_pdf,
+            trials=trials,
+            out_subdir=out_subdir,
+            api_key=api_key,
+            max_concurrency=max_concurrency,
+            cache_trials=cache_trials,
+        )
+    )
+
+
+async def arun_agent_backend_doc_eval(
+    *,
+    base_dir: Path,
+    scenario: str,
+    adv_pdf: str | None,
+    trials: int,
+    out_subdir: str,
+    api_key: str,
+    max_concurrency: int = DEFAULT_TRIAL_CONCURRENCY,
+    cache_trials: bool = False,
+) -> dict[str, Any]:
+    """Run clean-vs-attacked evaluation, the two variants' trials concurrently.
+
+    Trials of the same variant run sequentially so their measured latencies
+    do not include waiting on each other for the shared rate limiter.
+
+    cache_trials runs each distinct (PDF content, query) pair once and replays
+    it for the remaining trials; leave it off when trials should sample variance.
+    """
     if trials < 1:
         raise ValueError("trials must be >= 1")
+    if max_concurrency < 1:
+        raise ValueError("max_concurrency must be >= 1")
 
     base_dir = Path(base_dir)
     clean_pdf = base_dir / "original.pdf"
@@ -203,27 +349,16 @@ def run_agent_backend_doc_eval(
     create_orchestrator = _load_orchestrator_factory()
     orchestrator = create_orchestrator(api_key=api_key, verbose=False)
 
-    clean_trials: list[dict[str, Any]] = []
-    attacked_trials: list[dict[str, Any]] = []
-    for idx in range(1, trials + 1):
-        clean_trials.append(
-            _run_one_trial(
-                orchestrator=orchestrator,
-                pdf_path=clean_pdf,
-                query=query,
-                variant="clean",
-                trial_index=idx,
-            )
-        )
-        attacked_trials.append(
-            _run_one_trial(
-                orchestrator=orchestrator,
-                pdf_path=attacked_pdf,
-                query=query,
-                variant="attacked",
-                trial_index=idx,
-            )
-        )
+    by_variant = await _arun_trials(
+        orchestrator=orchestrator,
+        pdfs={"clean": clean_pdf, "attacked": attacked_pdf},
+        query=query,
+        trials=trials,
+        max_concurrency=max_concurrency,
+        cache_trials=cache_trials,
+    )
+    clean_trials = by_variant["clean"]
+    attacked_trials = by_variant["attacked"]
 
     clean_majority = _select_majority_trial(clean_trials)
     attacked_majority = _select_majority_trial(attacked_trials)
@@ -312,7 +447,7 @@ def run_agent_backend_doc_eval(
 
     _write_jsonl(clean_trials_path, clean_trials)
     _write_jsonl(attacked_trials_path, attacked_trials)
-    doc_result_path.write_text(json.dumps(doc_result, indent=2, ensure_ascii=False), encoding="utf-8")
+    doc_result_path.write_bytes(orjson.dumps(doc_result, option=_JSON_FILE_OPTIONS))
 
     doc_metrics = {
         "doc_id": base_dir.name,
@@ -329,7 +464,7 @@ def run_agent_backend_doc_eval(
         "latency_inflation_ratio": round(latency_inflation_ratio, 4),
         "resource_inflation_threshold": RESOURCE_INFLATION_RATIO,
     }
-    doc_metrics_path.write_text(json.dumps(doc_metrics, indent=2, ensure_ascii=False), encoding="utf-8")
+    doc_metrics_path.write_bytes(orjson.dumps(doc_metrics, option=_JSON_FILE_OPTIONS))
 
     return {
         "doc_id": base_dir.name,
@@ -2,11 +2,13 @@
 
 from __future__ import annotations
 
+import hashlib
 import json
 import logging
+import os
 import shutil
 import uuid
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass
 from pathlib import Path
 from typing import Any
 
@@ -131,52 +133,64 @@ class StageStatus:
 def list_pdf_candidates(project_root: str | Path = ".") -> list[str]:
     """List candidate PDF files for demo selection."""
     root = Path(project_root)
-    candidates: list[Path] = []
-    for rel in ["pdfs/text_documents", "pdfs/sample", "pdfs"]:
-        target = root / rel
-        if not target.is_dir():
-            continue
-        for pdf in sorted(target.glob("*.pdf")):
-            candidates.append(pdf)
-    # Remove duplicates while preserving order
     seen: set[str] = set()
     out: list[str] = []
-    for p in candidates:
-        resolved = str(p.resolve())
-        if resolved in seen:
+    for rel in ["pdfs/text_documents", "pdfs/sample", "pdfs"]:
+        target = root / rel
+        try:
+            with os.scandir(target) as it:
+                # Filter on the name before touching the filesystem again
+                names = sorted(e.name for e in it if e.name.endswith(".pdf") and not e.name.startswith("."))
+        except (FileNotFoundError, NotADirectoryError):
             continue
-        seen.add(resolved)
-        out.append(str(p))
+        for name in names:
+            path = os.path.join(target, name)
+            # Remove duplicates (e.g. via symlinks) while preserving order
+            resolved = os.path.realpath(path)
+            if resolved in seen:
+                continue
+            seen.add(resolved)
+            out.append(path)
     return out
 
 
+def _scan_subdirs(root: Path, *, reverse: bool = False) -> list[os.DirEntry]:
+    """Subdirectories of root as DirEntry objects, sorted by name (empty if root is missing)."""
+    try:
+        with os.scandir(root) as it:
+            entries = [e for e in it if e.is_dir()]
+    except (FileNotFoundError, NotADirectoryError):
+        return []
+    entries.sort(key=lambda e: e.name, reverse=reverse)
+    return entries
+
+
 def list_processed_doc_dirs(base_root: str | Path = PIPELINE_RUN_ROOT) -> list[Path]:
     """List document directories that have clean baseline text."""
     root = Path(base_root)
     if not root.is_absolute():
         root = (Path.cwd() / root).resolve()
-    if not root.is_dir():
-        return []
-    out: list[Path] = []
-    for child in sorted(root.iterdir()):
-        if not child.is_dir():
-            continue
-        baseline = child / "byte_extraction" / "pymupdf" / "full_text.txt"
-        if baseline.is_file():
-            out.append(child)
-    return out
+    baseline = os.path.join("byte_extraction", "pymupdf", "full_text.txt")
+    return [
+        Path(entry.path)
+        for entry in _scan_subdirs(root)
+        if os.path.isfile(os.path.join(entry.path, baseline))
+    ]
 
 
 def get_doc_stage_status(base_dir: Path) -> dict[str, bool]:
     """Return stage artifact availability for one document directory."""
+    base = os.fspath(base_dir)
+    isfile = os.path.isfile
+    join = os.path.join
     return {
-        "stage1": (base_dir / "byte_extraction" / "pymupdf" / "full_text.txt").is_file(),
-        "stage2": (base_dir / "stage2" / "openai" / "analysis.json").is_file(),
-        "stage3": (base_dir / "stage3" / "openai" / "manipulation_plan.json").is_file(),
-        "stage4": (base_dir / "stage4" / "final_overlay.pdf").is_file(),
+        "stage1": isfile(join(base, "byte_extraction", "pymupdf", "full_text.txt")),
+        "stage2": isfile(join(base, "stage2", "openai", "analysis.json")),
+        "stage3": isfile(join(base, "stage3", "openai", "manipulation_plan.json")),
+        "stage4": isfile(join(base, "stage4", "final_overlay.pdf")),
         "stage5": (
-            (base_dir / "agent_backend_eval" / "doc_result.json").is_file()
-            or (base_dir / "stage5_eval" / "doc_result.json").is_file()
+            isfile(join(base, "agent_backend_eval", "doc_result.json"))
+            or isfile(join(base, "stage5_eval", "doc_result.json"))
         ),
     }
 
@@ -318,23 +332,90 @@ def run_stage1(
     )
 
 
+# Files up to this size are hashed in full; larger ones (images) by
+# size + mtime + their first 4 KiB
+_FINGERPRINT_FULL_MAX_BYTES = 1 << 20
+_STAGE_CACHE_FILENAME = ".input_fingerprint.json"
+
+
+def _stage1_inputs(base_dir: Path) -> list[Path]:
+    """Step 1 artifacts read by Stages 2 and 3."""
+    pymupdf_dir = base_dir / "byte_extraction" / "pymupdf"
+    paths = [pymupdf_dir / name for name in ("full_markdown.md", "full_text.txt", "pages.json")]
+    images_dir = pymupdf_dir / "images"
+    if images_dir.is_dir():
+        paths.extend(sorted(images_dir.iterdir()))
+    return paths
+
+
+def _fingerprint_inputs(base_dir: Path, paths: list[Path], *params: str) -> str:
+    """Hash the given input files (and call parameters such as the model) into one digest."""
+    digest = hashlib.blake2b(digest_size=16)
+    for param in params:
+        digest.update(param.encode("utf-8") + b"\0")
+    for path in paths:
+        if not path.is_file():
+            continue
+        st = path.stat()
+        digest.update(str(path.relative_to(base_dir)).encode("utf-8") + b"\0")
+        if st.st_size <= _FINGERPRINT_FULL_MAX_BYTES:
+            digest.update(path.read_bytes())
+        else:
+            digest.update(f"{st.st_size}:{st.st_mtime_ns}".encode("ascii"))
+            with path.open("rb") as fh:
+                digest.update(fh.read(4096))
+    return digest.hexdigest()
+
+
+def _load_cached_stage(stage_dir: Path, input_hash: str, output_path: Path) -> StageStatus | None:
+    """Return the recorded StageStatus if the stage last ran on identical inputs."""
+    if not output_path.is_file():
+        return None
+    try:
+        cached = json.loads((stage_dir / _STAGE_CACHE_FILENAME).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if not isinstance(cached, dict) or cached.get("input_hash") != input_hash:
+        return None
+    try:
+        return StageStatus(**cached["stage"])
+    except (KeyError, TypeError):
+        return None
+
+
+def _save_cached_stage(stage_dir: Path, input_hash: str, status: StageStatus) -> None:
+    payload = {"input_hash": input_hash, "stage": asdict(status)}
+    (stage_dir / _STAGE_CACHE_FILENAME).write_text(json.dumps(payload, indent=2), encoding="utf-8")
+
+
 def run_stage2(
     *,
     base_dir: Path,
     model: str,
     api_key: str,
+    force: bool = False,
 ) -> StageStatus:
-    """Execute Stage 2 analysis."""
+    """Execute Stage 2 analysis (skipped when Step 1 outputs and model are unchanged, unless force)."""
+    stage_dir = base_dir / "stage2"
+    input_hash = _fingerprint_inputs(base_dir, _stage1_inputs(base_dir), model)
+    if not force:
+        cached = _load_cached_stage(stage_dir, input_hash, stage_dir / "openai" / "analysis.json")
+        if cached is not None:
+            log.info("Stage 2 skipped; inputs unchanged. base_dir=%s", base_dir)
+            return cached
+
     log.info("Stage 2 start. base_dir=%s model=%s", base_dir, model)
     result = run_stage2_openai(base_dir, model=model, api_key=api_key)
     out_path = str(result.get("output_path"))
     log.info("Stage 2 complete. output=%s", out_path)
-    return StageStatus(
+    status = StageStatus(
         stage="stage2",
         status="completed",
         message="Stage 2 analysis generated.",
         artifacts=[out_path],
     )
+    _save_cached_stage(stage_dir, input_hash, status)
+    return status
 
 
 def run_stage3(
@@ -342,18 +423,30 @@ def run_stage3(
     base_dir: Path,
     model: str,
     api_key: str,
+    force: bool = False,
 ) -> StageStatus:
-    """Execute Stage 3 planning."""
+    """Execute Stage 3 planning (skipped when Stage 2/Step 1 outputs and model are unchanged, unless force)."""
+    stage_dir = base_dir / "stage3"
+    inputs = [base_dir / "stage2" / "openai" / "analysis.json", *_stage1_inputs(base_dir)]
+    input_hash = _fingerprint_inputs(base_dir, inputs, model)
+    if not force:
+        cached = _load_cached_stage(stage_dir, input_hash, stage_dir / "openai" / "manipulation_plan.json")
+        if cached is not None:
+            log.info("Stage 3 skipped; inputs unchanged. base_dir=%s", base_dir)
+            return cached
+
     log.info("Stage 3 start. base_dir=%s model=%s", base_dir, model)
     result = run_stage3_openai(base_dir, model=model, api_key=api_key)
     out_path = str(result.get("output_path"))
     log.info("Stage 3 complete. output=%s total_attacks=%s", out_path, result.get("total_attacks"))
-    return StageStatus(
+    status = StageStatus(
         stage="stage3",
         status="completed",
         message=f"Stage 3 manipulation plan generated ({result.get('total_attacks', 0)} attacks).",
         artifacts=[out_path],
     )
+    _save_cached_stage(stage_dir, input_hash, status)
+    return status
 
 
 def run_stage4_with_mechanism(
@@ -438,6 +531,7 @@ def run_stage5_doc_eval(
     trials: int,
     out_subdir: str,
     api_key: str,
+    cache_trials: bool = False,
 ) -> dict[str, Any]:
     """Run single-document clean-vs-attacked evaluation via agent-backend."""
     log.info(
@@ -457,6 +551,7 @@ def run_stage5_doc_eval(
         trials=trials,
         out_subdir=out_subdir,
         api_key=api_key,
+        cache_trials=cache_trials,
     )
     log.info(
         "Agent-backend eval complete. doc_id=%s scenario=%s compromised=%s",
@@ -643,28 +738,23 @@ def collect_stage5_doc_runs(base_root: str | Path = PIPELINE_RUN_ROOT) -> list[d
 
 def list_stage5_batch_reports(out_dir: str | Path = "stage5_runs") -> list[dict[str, Any]]:
     """List generated Stage 5 batch report directories."""
-    root = Path(out_dir)
-    if not root.is_dir():
-        return []
     rows: list[dict[str, Any]] = []
-    for run_dir in sorted(root.iterdir(), reverse=True):
-        if not run_dir.is_dir():
-            continue
-        overall = run_dir / "overall_metrics.json"
-        paper = run_dir / "paper_table.md"
-        if not overall.is_file():
+    for entry in _scan_subdirs(Path(out_dir), reverse=True):
+        overall = os.path.join(entry.path, "overall_metrics.json")
+        paper = os.path.join(entry.path, "paper_table.md")
+        if not os.path.isfile(overall):
             continue
         summary: dict[str, Any] = {}
         try:
-            summary = json.loads(overall.read_text(encoding="utf-8"))
+            summary = json.loads(Path(overall).read_text(encoding="utf-8"))
         except Exception:
             pass
         rows.append(
             {
-                "run_id": run_dir.name,
-                "path": str(run_dir),
-                "overall_metrics": str(overall),
-                "paper_table": str(paper) if paper.is_file() else None,
+                "run_id": entry.name,
+                "path": entry.path,
+                "overall_metrics": overall,
+                "paper_table": paper if os.path.isfile(paper) else None,
                 "eligible_docs": summary.get("eligible_docs"),
                 "attack_success_rate": summary.get("attack_success_rate"),
                 "severity_weighted_vulnerability_score": summary.get("severity_weighted_vulnerability_score"),
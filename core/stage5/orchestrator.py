@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import json
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
@@ -18,6 +19,9 @@ PROJECT_ROOT = Path(__file__).resolve().parents[2]
 DEFAULT_SCENARIO_SPECS_PATH = PROJECT_ROOT / "configs" / "stage5" / "scenario_specs.json"
 DEFAULT_DEMO_BATCH_PATH = PROJECT_ROOT / "configs" / "stage5" / "demo_batch.json"
 DEFAULT_SEVERITY_WEIGHTS_PATH = PROJECT_ROOT / "configs" / "stage5" / "severity_weights.json"
+# Documents in a batch are independent (each writes under its own base_dir)
+# and LLM-bound, so up to this many are evaluated at once
+BATCH_MAX_CONCURRENCY = 8
 DEFAULT_SEVERITY_WEIGHTS = {
     "critical": 4,
     "high": 3,
@@ -219,15 +223,10 @@ def run_stage5_batch(
 
     severity_weights = load_severity_weights(severity_weights_path)
 
-    doc_results: list[DocEvaluationResult] = []
-    per_doc_paths: dict[str, dict[str, str]] = {}
-
-    for doc_id in selected_doc_ids:
-        base_dir = root / doc_id
-        spec = specs[doc_id]
-        doc_result, output_paths = _run_doc_with_spec(
-            base_dir=base_dir,
-            spec=spec,
+    def _run_one(doc_id: str) -> tuple[DocEvaluationResult, dict[str, str]]:
+        return _run_doc_with_spec(
+            base_dir=root / doc_id,
+            spec=specs[doc_id],
             adv_pdf=None,
             model=model,
             trials=trials,
@@ -235,8 +234,16 @@ def run_stage5_batch(
             api_key=api_key,
             severity_weights=severity_weights,
         )
-        doc_results.append(doc_result)
-        per_doc_paths[doc_id] = output_paths
+
+    doc_results: list[DocEvaluationResult] = []
+    per_doc_paths: dict[str, dict[str, str]] = {}
+
+    workers = min(BATCH_MAX_CONCURRENCY, len(selected_doc_ids))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        # map() yields in submission order, so results stay aligned with doc_ids
+        for doc_id, (doc_result, output_paths) in zip(selected_doc_ids, pool.map(_run_one, selected_doc_ids)):
+            doc_results.append(doc_result)
+            per_doc_paths[doc_id] = output_paths
 
     run_id = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")
     batch_result: BatchEvaluationResult = aggregate_batch_results(
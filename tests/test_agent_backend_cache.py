@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+_BACKEND_ROOT = Path(__file__).resolve().parents[1] / "core" / "agent-backend"
+if str(_BACKEND_ROOT) not in sys.path:
+    sys.path.insert(0, str(_BACKEND_ROOT))
+
+from src.cache import LRUCache, SQLiteCache, content_hash  # noqa: E402
+
+
+class AgentBackendCacheTests(unittest.TestCase):
+    def test_content_hash_is_stable_and_content_sensitive(self) -> None:
+        self.assertEqual(content_hash("invoice"), content_hash("invoice"))
+        self.assertNotEqual(content_hash("invoice"), content_hash("invoice "))
+
+    def test_lru_cache_evicts_by_total_bytes(self) -> None:
+        cache = LRUCache(maxsize=None, maxbytes=10, sizeof=len)
+        cache.put("a", "xxxx")
+        cache.put("b", "xxxx")
+        cache.put("a", "xxxxx")  # replacing an entry re-counts its size
+        self.assertEqual(cache.total_bytes, 9)
+
+        cache.put("c", "xxxx")
+
+        self.assertNotIn("b", cache)
+        self.assertIn("a", cache)
+        self.assertIn("c", cache)
+        self.assertEqual(cache.total_bytes, 9)
+
+    def test_lru_cache_evicts_least_recently_used(self) -> None:
+        cache = LRUCache(maxsize=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        self.assertEqual(cache.get("a"), 1)  # "a" is now most recently used
+        cache.put("c", 3)
+
+        self.assertIn("a", cache)
+        self.assertNotIn("b", cache)
+        self.assertEqual(cache.get("c"), 3)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(len(cache), 2)
+
+    def test_lru_cache_expires_entries_after_ttl(self) -> None:
+        cache = LRUCache(maxsize=4, ttl=10)
+        with patch("src.cache.time.monotonic", return_value=100.0):
+            cache.put("route", "finance")
+        with patch("src.cache.time.monotonic", return_value=105.0):
+            self.assertEqual(cache.get("route"), "finance")
+        with patch("src.cache.time.monotonic", return_value=111.0):
+            self.assertIsNone(cache.get("route"))
+        self.assertEqual(len(cache), 0)
+
+    def test_sqlite_cache_persists_across_instances_and_expires(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = str(Path(tmp) / "nested" / "llm.sqlite")
+            with patch("src.cache.time.time", return_value=1000.0):
+                SQLiteCache(path, ttl=60).put("key", '{"primary_domain": "finance"}')
+
+            reopened = SQLiteCache(path, ttl=60)
+            with patch("src.cache.time.time", return_value=1030.0):
+                self.assertEqual(reopened.get("key"), '{"primary_domain": "finance"}')
+                self.assertIsNone(reopened.get("other"))
+            with patch("src.cache.time.time", return_value=1061.0):
+                self.assertIsNone(reopened.get("key"))
+
+
+if __name__ == "__main__":
+    unittest.main()
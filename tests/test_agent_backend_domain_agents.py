@@ -0,0 +1,373 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import sys
+import threading
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+_BACKEND_ROOT = Path(__file__).resolve().parents[1] / "core" / "agent-backend"
+if str(_BACKEND_ROOT) not in sys.path:
+    sys.path.insert(0, str(_BACKEND_ROOT))
+
+from src.cache import LRUCache, content_hash  # noqa: E402
+from src.domain_agents import base, get_agent  # noqa: E402
+from src.domain_agents.base import BaseDomainAgent, RateLimiter  # noqa: E402
+
+
+_SCRIPT = [
+    json.dumps({"thought": "Add the totals", "action": "add", "action_input": {"a": 2, "b": 3}}),
+    json.dumps({"thought": "Done", "final_answer": {"answer": "5", "confidence": 0.9, "evidence": ["2 + 3"]}}),
+]
+
+
+class _ScriptedAgent(BaseDomainAgent):
+    """Agent with one tool whose LLM replays a fixed ReAct script."""
+
+    DOMAIN_NAME = "test"
+
+    def __init__(self) -> None:
+        super().__init__(api_key="dummy")
+        self._responses = list(_SCRIPT)
+        self.calls: list[list[dict]] = []
+
+    def _register_tools(self):
+        self.register_tool("add", lambda a, b: a + b, "Add two numbers", {"a": {"type": "number"}, "b": {"type": "number"}})
+
+    def get_domain_instructions(self) -> str:
+        return "Answer arithmetic questions."
+
+    def _call_llm(self, messages):
+        self.calls.append([dict(m) for m in messages])
+        return self._responses.pop(0)
+
+    async def _acall_llm(self, messages):
+        return self._call_llm(messages)
+
+
+class _FakeStream:
+    """Chat completion stream stand-in that yields a reply in small chunks."""
+
+    def __init__(self, text: str, chunk_size: int = 7) -> None:
+        self.chunks_read = 0
+        self.closed = False
+        self.response = SimpleNamespace(close=self._close)
+        self._pieces = [text[i:i + chunk_size] for i in range(0, len(text), chunk_size)]
+
+    def _close(self) -> None:
+        self.closed = True
+
+    def __iter__(self):
+        for piece in self._pieces:
+            self.chunks_read += 1
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=piece))])
+
+
+class _CountingCompletions:
+    """chat.completions stand-in that always streams the same JSON reply."""
+
+    def __init__(self, reply: str = json.dumps({"thought": "ok", "final_answer": {"answer": "ok"}})) -> None:
+        self.calls = 0
+        self.reply = reply
+        self.streams: list[_FakeStream] = []
+
+    def create(self, **kwargs):
+        assert kwargs["stream"] is True
+        self.calls += 1
+        self.streams.append(_FakeStream(self.reply))
+        return self.streams[-1]
+
+
+class _ToolLessAgent(_ScriptedAgent):
+    def _register_tools(self):
+        pass
+
+
+class _FakeBatchClient:
+    """files/batches stand-in that answers every request with its own query."""
+
+    def __init__(self) -> None:
+        self.requests: list[dict] = []
+        self.files = SimpleNamespace(create=self._create_file, content=self._file_content)
+        self.batches = SimpleNamespace(create=self._create_batch, retrieve=self._retrieve_batch)
+
+    def _create_file(self, *, file, purpose):
+        self.requests = [json.loads(line) for line in file.read().splitlines()]
+        return SimpleNamespace(id="file_in")
+
+    def _create_batch(self, **_kwargs):
+        return SimpleNamespace(id="batch_1", status="in_progress")
+
+    def _retrieve_batch(self, batch_id):
+        return SimpleNamespace(id=batch_id, status="completed", output_file_id="file_out")
+
+    def _file_content(self, file_id):
+        lines = []
+        # Reply out of order and drop the last request to exercise the mapping
+        for request in reversed(self.requests[:-1]):
+            query = request["body"]["messages"][-1]["content"].rsplit("Query: ", 1)[1]
+            body = {"choices": [{"message": {"content": json.dumps({"thought": "t", "final_answer": {"answer": query}})}}]}
+            lines.append(json.dumps({"custom_id": request["custom_id"], "response": {"status_code": 200, "body": body}}))
+        return SimpleNamespace(text="\n".join(lines))
+
+
+class AgentBackendDomainAgentTests(unittest.TestCase):
+    def test_aprocess_matches_process(self) -> None:
+        sync_agent = _ScriptedAgent()
+        async_agent = _ScriptedAgent()
+
+        expected = sync_agent.process("What is the total?", "2 and 3")
+        result = asyncio.run(async_agent.aprocess("What is the total?", "2 and 3"))
+
+        self.assertTrue(result.success)
+        self.assertEqual(result.answer, "5")
+        self.assertEqual(result.answer, expected.answer)
+        self.assertEqual([c.result for c in result.tool_calls], [5])
+        self.assertEqual(result.metadata, expected.metadata)
+        self.assertEqual(async_agent.calls, sync_agent.calls)
+        self.assertEqual(async_agent.calls[1][-1]["content"], "Observation: Result: 5\n\nContinue your analysis.")
+
+    def test_initial_messages_share_a_document_prefix_across_queries(self) -> None:
+        agent = _ScriptedAgent()
+
+        first = agent._initial_messages("q1", "doc text", None)
+        second = agent._initial_messages("q2", "doc text", {"page": 1})
+
+        self.assertEqual(first[:3], second[:3])
+        self.assertEqual(first[-1]["content"], "Query: q1")
+        self.assertEqual(second[-1]["content"], 'Query: q2\n\nAdditional Context: {"page": 1}')
+        self.assertEqual(agent._prompt_cache_user(first), agent._prompt_cache_user(second))
+
+    def test_repeated_task_is_answered_from_the_task_cache(self) -> None:
+        with patch.object(_ScriptedAgent, "TASK_CACHE_SIZE", 256):
+            agent = _ScriptedAgent()
+
+            first = agent.process("What is the total?", "2 and 3")
+            again = agent.process("What is the total?", "2 and 3")
+
+            self.assertEqual(len(agent.calls), 2)
+            self.assertEqual(again.answer, first.answer)
+            self.assertTrue(again.metadata["cached"])
+            self.assertNotIn("cached", first.metadata)
+            with self.assertRaises(IndexError):
+                agent.process("What is the total?", "2 and 3", context={"page": 2})
+
+    def test_task_cache_is_skipped_when_disabled_or_bypassed(self) -> None:
+        with patch.object(_ScriptedAgent, "TASK_CACHE_SIZE", 0):
+            agent = _ScriptedAgent()
+            agent.process("What is the total?", "2 and 3")
+            with self.assertRaises(IndexError):
+                agent.process("What is the total?", "2 and 3")
+
+        with patch.object(_ScriptedAgent, "TASK_CACHE_SIZE", 256):
+            agent = _ScriptedAgent()
+            agent.process("What is the total?", "2 and 3", use_cache=False)
+            with self.assertRaises(IndexError):
+                agent.process("What is the total?", "2 and 3")
+
+    def test_response_cache_skips_observation_turns(self) -> None:
+        agent = _ScriptedAgent()
+        completions = _CountingCompletions()
+        agent.client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+        first_turn = [{"role": "system", "content": "sys"}, {"role": "user", "content": "Query: q"}]
+        observed = first_turn + [
+            {"role": "assistant", "content": "{}"},
+            {"role": "user", "content": "Observation: Result: 5\n\nContinue your analysis."},
+        ]
+
+        with patch.object(base, "RESPONSE_CACHE_ENABLED", True), \
+                patch.object(base, "_RESPONSE_CACHE", base.LRUCache(maxsize=500)):
+            BaseDomainAgent._call_llm(agent, first_turn)
+            BaseDomainAgent._call_llm(agent, first_turn)
+            BaseDomainAgent._call_llm(agent, observed)
+            BaseDomainAgent._call_llm(agent, observed)
+
+        self.assertEqual(completions.calls, 3)
+
+    def test_agents_share_one_client_per_api_key(self) -> None:
+        first, second = _ScriptedAgent(), _ToolLessAgent()
+
+        self.assertIs(first.client, second.client)
+
+        async def async_clients():
+            return first._get_async_client(), second._get_async_client()
+
+        async_first, async_second = asyncio.run(async_clients())
+        self.assertIs(async_first, async_second)
+        self.assertIsNot(asyncio.run(async_clients())[0], async_first)
+
+    def test_system_prompt_is_built_once_until_a_tool_is_registered(self) -> None:
+        agent = _ScriptedAgent()
+
+        prompt = agent._build_system_prompt()
+        self.assertIs(agent._build_system_prompt(), prompt)
+        self.assertEqual(prompt, agent.REACT_SYSTEM_PROMPT.format(
+            domain_name=agent.DOMAIN_NAME,
+            domain_description=agent.DOMAIN_DESCRIPTION,
+            domain_specific_instructions=agent.get_domain_instructions(),
+            tools_description=agent.get_tools_description(),
+        ))
+
+        agent.register_tool("sub", lambda a, b: a - b, "Subtract two numbers", {"a": {"type": "number"}, "b": {"type": "number"}})
+        self.assertIn("- sub(a: number, b: number)", agent._build_system_prompt())
+
+    def test_process_batch_maps_responses_back_to_items(self) -> None:
+        agent = _ToolLessAgent()
+        agent.client = _FakeBatchClient()
+
+        results = agent.process_batch([("q1", "doc"), ("q2", "doc"), ("q3", "doc")], poll_interval=0)
+
+        self.assertEqual([r.answer for r in results[:2]], ["q1", "q2"])
+        bodies = [request["body"] for request in agent.client.requests]
+        self.assertEqual(len({body["user"] for body in bodies}), 1)
+        self.assertEqual(bodies[0]["messages"][:3], bodies[2]["messages"][:3])
+        self.assertTrue(results[0].success)
+        self.assertFalse(results[2].success)
+        self.assertEqual(results[2].metadata["reason"], "batch_error")
+        with self.assertRaises(ValueError):
+            _ScriptedAgent().process_batch([("q", "doc")])
+
+    def test_rate_limiter_waits_for_refill_and_backs_off(self) -> None:
+        limiter = RateLimiter(tpm=600, rpm=60)
+
+        self.assertEqual(limiter._reserve(600, 1), 0.0)
+        # 10 tokens/s refill: 60 more tokens need roughly 6s
+        self.assertAlmostEqual(limiter._reserve(60, 1), 6.0, delta=0.1)
+
+        limiter.backoff()
+        # Halved limits cap an oversized request at the 300-token bucket
+        self.assertAlmostEqual(limiter._reserve(10_000, 1), 60.0, delta=0.5)
+
+    def test_document_excerpt_is_truncated_to_the_token_budget(self) -> None:
+        agent = _ScriptedAgent()
+        document = "word " * 5000
+
+        with patch.object(base, "tiktoken", None):
+            messages = agent._start_react("q", document, None)
+
+        excerpt = messages[1]["content"].split("Document Content:\n", 1)[1]
+        self.assertEqual(excerpt, document[:base.MAX_DOCUMENT_TOKENS * 4])
+        self.assertEqual(base._truncate_by_tokens("short", 100, "gpt-4o"), "short")
+
+    def test_token_truncation_is_memoized_by_content(self) -> None:
+        class _CharEncoding:
+            encode_calls = 0
+
+            def encode(self, text, disallowed_special=()):
+                _CharEncoding.encode_calls += 1
+                return list(text)
+
+            def decode(self, tokens):
+                return "".join(tokens)
+
+        fake_tiktoken = SimpleNamespace(encoding_for_model=lambda model: _CharEncoding())
+        document = "abcdef" * 100
+
+        cache = LRUCache(maxsize=4)
+        with patch.object(base, "tiktoken", fake_tiktoken), patch.object(base, "_TRUNCATION_CACHE", cache):
+            base._encoding_for.cache_clear()
+            first = base._truncate_by_tokens(document, 10, "test-model")
+            second = base._truncate_by_tokens("".join(document), 10, "test-model")
+            stored = cache.get((content_hash(document), 10, "test-model"))
+        base._encoding_for.cache_clear()
+
+        self.assertEqual(first, "abcdefabcd")
+        self.assertEqual(second, first)
+        self.assertEqual(_CharEncoding.encode_calls, 1)
+        self.assertEqual(stored, first)
+
+    def test_log_defers_formatting_when_not_verbose(self) -> None:
+        agent = _ScriptedAgent()
+        calls = []
+
+        agent._log(lambda: calls.append("formatted") or "msg")
+        self.assertEqual(calls, [])
+
+        agent.verbose = True
+        with self.assertLogs(base.logger, level="INFO") as logs:
+            agent._log(lambda: calls.append("formatted") or "msg")
+        self.assertEqual(calls, ["formatted"])
+        self.assertTrue(logs.output[0].endswith("msg"))
+
+    def test_batch_tool_runs_invocations_concurrently_in_order(self) -> None:
+        agent = _ScriptedAgent()
+        self.assertNotIn("batch", agent.tools)
+        barrier = threading.Barrier(2, timeout=5)
+
+        def slow_double(x):
+            barrier.wait()
+            return 2 * x
+
+        agent.register_tool("double", slow_double, "Double a number", {"x": {"type": "number"}})
+        self.assertIn("batch", agent.tools)
+
+        tool_call = agent.execute_tool("batch", {"invocations": [
+            {"tool_name": "double", "arguments": {"x": 1}},
+            {"tool_name": "double", "arguments": {"x": 2}},
+            {"tool_name": "missing", "arguments": {}},
+        ]})
+
+        self.assertIsNone(tool_call.error)
+        self.assertEqual(tool_call.result, [
+            {"tool_name": "double", "result": 2},
+            {"tool_name": "double", "result": 4},
+            {"tool_name": "missing", "error": "Unknown tool: missing"},
+        ])
+
+    def test_streamed_tool_call_stops_reading_after_action_input(self) -> None:
+        agent = _ScriptedAgent()
+        reply = json.dumps({
+            "thought": 'Need the "action_input" total',
+            "action": "add",
+            "action_input": {"a": 2, "b": 3},
+            "final_answer": None,
+        }) + " " * 200
+        completions = _CountingCompletions(reply)
+        agent.client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+
+        content = BaseDomainAgent._call_llm(agent, [{"role": "system", "content": "s"}, {"role": "user", "content": "u"}])
+
+        self.assertEqual(json.loads(content), {
+            "thought": 'Need the "action_input" total', "action": "add", "action_input": {"a": 2, "b": 3},
+        })
+        stream = completions.streams[0]
+        self.assertTrue(stream.closed)
+        self.assertLess(stream.chunks_read, len(stream._pieces))
+
+    def test_streamed_final_answer_is_read_in_full(self) -> None:
+        agent = _ScriptedAgent()
+        completions = _CountingCompletions()
+        agent.client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+
+        content = BaseDomainAgent._call_llm(agent, [{"role": "system", "content": "s"}, {"role": "user", "content": "u"}])
+
+        self.assertEqual(content, completions.reply)
+
+    def test_as_text_encodes_structures_as_compact_json(self) -> None:
+        self.assertEqual(BaseDomainAgent._as_text({"total": [1, "é"], 2: None}), '{"total":[1,"é"],"2":null}')
+        self.assertEqual(BaseDomainAgent._as_evidence_list([{"page": 1}, "line"]), ['{"page":1}', "line"])
+
+    def test_non_object_replies_are_wrapped_as_final_answers(self) -> None:
+        agent = _ScriptedAgent()
+
+        for response in ("not json", '["a list"]'):
+            step, final_answer = agent._parse_response(response)
+            self.assertIsNone(step.action)
+            self.assertEqual(final_answer["answer"], response)
+
+    def test_get_agent_shares_live_instances_per_settings(self) -> None:
+        finance = get_agent("finance", "dummy")
+
+        self.assertIs(get_agent("finance", "dummy"), finance)
+        self.assertEqual(finance.DOMAIN_NAME, "finance")
+        self.assertIsNot(get_agent("finance", "dummy", verbose=True), finance)
+        self.assertIsNot(get_agent("hr", "dummy"), finance)
+        with self.assertRaises(ValueError):
+            get_agent("astrology", "dummy")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import asyncio
+import sys
+import unittest
+from pathlib import Path
+
+_BACKEND_ROOT = Path(__file__).resolve().parents[1] / "core" / "agent-backend"
+if str(_BACKEND_ROOT) not in sys.path:
+    sys.path.insert(0, str(_BACKEND_ROOT))
+
+from src.domain_agents.base import AgentResult  # noqa: E402
+from src.multi_agent_orchestrator import (  # noqa: E402
+    ExecutionTrace,
+    MultiAgentOrchestrator,
+    OrchestratorResult,
+)
+from src.router import DocumentAnalysis, Domain, RoutingDecision  # noqa: E402
+
+
+class _StubOrchestrator(MultiAgentOrchestrator):
+    """Orchestrator whose pipeline records two trace steps and returns a fixed answer."""
+
+    def process(self, pdf_path, query, on_step=None):
+        trace = ExecutionTrace(on_step=on_step)
+        trace.add_step("perception", {"pages": 1})
+        trace.add_step("routing", {"primary_domain": "finance"})
+        return OrchestratorResult(
+            success=True,
+            answer=f"answer for {query}",
+            confidence=0.8,
+            evidence=["line 1"],
+            trace=trace,
+            document_info={},
+            routing_decision=None,
+            agent_result=None,
+        )
+
+
+class _FixedAgent:
+    """Agent stand-in that returns a canned result."""
+
+    def __init__(self, answer: str, confidence: float, evidence: list[str]) -> None:
+        self.result = AgentResult(
+            success=True,
+            answer=answer,
+            confidence=confidence,
+            evidence=evidence,
+            tool_calls=[],
+            reasoning_trace=[],
+        )
+
+    def process(self, query, document_content, context=None, use_cache=True):
+        return self.result
+
+
+class AgentBackendOrchestratorTests(unittest.TestCase):
+    def test_aprocess_stream_yields_steps_then_complete(self) -> None:
+        orchestrator = _StubOrchestrator(api_key="dummy", verbose=False)
+
+        async def collect() -> list[dict]:
+            return [event async for event in orchestrator.aprocess_stream("doc.pdf", "total?")]
+
+        events = asyncio.run(collect())
+
+        self.assertEqual([e["type"] for e in events], ["step", "step", "complete"])
+        self.assertEqual(events[0]["step"], "perception")
+        self.assertEqual(events[1]["data"], {"primary_domain": "finance"})
+        self.assertEqual(events[2]["answer"], "answer for total?")
+
+    def test_routing_cache_can_be_bypassed(self) -> None:
+        orchestrator = MultiAgentOrchestrator(api_key="dummy", verbose=False)
+        calls = []
+        orchestrator.supervisor.analyze_and_route = lambda query, text, cache_key=None: calls.append(query) or ("a", "r")
+
+        orchestrator.analyze_and_route("total?", "doc", use_cache=False)
+        orchestrator.analyze_and_route("total?", "doc", use_cache=False)
+        self.assertEqual(len(calls), 2)
+
+        orchestrator.analyze_and_route("total?", "doc")
+        orchestrator.analyze_and_route("total?", "doc")
+        self.assertEqual(len(calls), 3)
+
+    def test_process_text_merges_multi_agent_results(self) -> None:
+        orchestrator = MultiAgentOrchestrator(api_key="dummy", verbose=False)
+        orchestrator._agents = {
+            Domain.FINANCE: _FixedAgent("finance answer", 0.6, ["shared", "revenue"]),
+            Domain.HR: _FixedAgent("hr answer", 0.9, ["shared", "headcount"]),
+        }
+        routing = RoutingDecision(
+            primary_domain=Domain.FINANCE,
+            secondary_domains=[Domain.HR, Domain.GENERAL],
+            confidence=0.8,
+            reasoning="spans both",
+            requires_multi_agent=True,
+            sub_tasks=[],
+        )
+        analysis = DocumentAnalysis(
+            document_type="report",
+            detected_domains=[Domain.FINANCE, Domain.HR],
+            key_entities=[],
+            summary="",
+        )
+        orchestrator.analyze_and_route = lambda query, text: (analysis, routing)
+
+        returned_routing, result = orchestrator.process_text("doc", "cost per employee?")
+
+        self.assertIs(returned_routing, routing)
+        self.assertEqual(result.answer, "hr answer")
+        self.assertEqual(result.evidence, ["shared", "revenue", "headcount"])
+        self.assertEqual(result.metadata["agents"], {"finance": 0.6, "hr": 0.9})
+
+
+if __name__ == "__main__":
+    unittest.main()
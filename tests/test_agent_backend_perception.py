@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import fitz
+import orjson
+
+_BACKEND_ROOT = Path(__file__).resolve().parents[1] / "core" / "agent-backend"
+if str(_BACKEND_ROOT) not in sys.path:
+    sys.path.insert(0, str(_BACKEND_ROOT))
+
+from src.perception import (  # noqa: E402
+    PARSER_VERSION,
+    ParsedDocument,
+    PDFMetadata,
+    PDFParser,
+    PerceptionLayer,
+    TableData,
+)
+
+
+class AgentBackendPerceptionTests(unittest.TestCase):
+    def _make_pdf(self, path: Path) -> None:
+        doc = fitz.open()
+        for text in ("Revenue: 100", "Expenses: 40"):
+            page = doc.new_page()
+            page.insert_text((72, 120), text)
+        doc.save(path)
+        doc.close()
+
+    def test_pymupdf_backend_reads_files_and_bytes(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            pdf_path = Path(tmp) / "report.pdf"
+            self._make_pdf(pdf_path)
+            parser = PDFParser()
+
+            from_file = parser.parse(str(pdf_path))
+            from_bytes = parser.parse_bytes(pdf_path.read_bytes(), filename="report.pdf")
+
+        self.assertTrue(parser._pymupdf_available)
+        self.assertEqual(from_file.metadata.page_count, 2)
+        self.assertIn("--- Page 2 ---\nExpenses: 40", from_file.full_text)
+        self.assertEqual(from_bytes.full_text, from_file.full_text)
+
+    def test_pypdf_backend_reads_file_and_mmap_paths_identically(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            pdf_path = Path(tmp) / "report.pdf"
+            self._make_pdf(pdf_path)
+            parser = PDFParser()
+            parser._pymupdf_available = False
+
+            in_memory = parser.parse(str(pdf_path))
+            with patch("src.perception.MMAP_THRESHOLD_BYTES", 0):
+                mapped = parser.parse(str(pdf_path))
+            from_bytes = parser.parse_bytes(pdf_path.read_bytes(), filename="report.pdf")
+
+        self.assertEqual(in_memory.metadata.page_count, 2)
+        self.assertIn("Revenue: 100", in_memory.full_text)
+        self.assertEqual(mapped.full_text, in_memory.full_text)
+        self.assertEqual(from_bytes.full_text, in_memory.full_text)
+        self.assertEqual(mapped.metadata.file_size_bytes, in_memory.metadata.file_size_bytes)
+
+    def test_pypdf_backend_flags_pages_with_images(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            pdf_path = Path(tmp) / "report.pdf"
+            doc = fitz.open()
+            doc.new_page().insert_text((72, 120), "Text only")
+            pixmap = fitz.Pixmap(fitz.csRGB, fitz.IRect(0, 0, 4, 4), False)
+            pixmap.clear_with(128)
+            doc.new_page().insert_image(fitz.Rect(72, 72, 144, 144), pixmap=pixmap)
+            doc.save(pdf_path)
+            doc.close()
+            parser = PDFParser()
+            parser._pymupdf_available = False
+
+            parsed = parser.parse(str(pdf_path))
+
+        self.assertEqual([p.has_images for p in parsed.pages], [False, True])
+
+    def test_both_backends_find_images_nested_in_form_xobjects(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            pdf_path = Path(tmp) / "report.pdf"
+            source = fitz.open()
+            pixmap = fitz.Pixmap(fitz.csRGB, fitz.IRect(0, 0, 4, 4), False)
+            pixmap.clear_with(128)
+            source.new_page().insert_image(fitz.Rect(72, 72, 144, 144), pixmap=pixmap)
+            doc = fitz.open()
+            # show_pdf_page embeds the source page as a Form XObject holding the image
+            doc.new_page().show_pdf_page(fitz.Rect(0, 0, 300, 300), source, 0)
+            doc.save(pdf_path)
+            doc.close()
+            source.close()
+            parser = PDFParser()
+            pymupdf_parsed = parser.parse(str(pdf_path))
+            parser._pymupdf_available = False
+
+            pypdf_parsed = parser.parse(str(pdf_path))
+
+        self.assertEqual([p.has_images for p in pymupdf_parsed.pages], [True])
+        self.assertEqual([p.has_images for p in pypdf_parsed.pages], [True])
+
+    def test_parallel_extraction_matches_serial(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            pdf_path = Path(tmp) / "report.pdf"
+            self._make_pdf(pdf_path)
+            parser = PDFParser()
+            parser._pymupdf_available = False
+
+            serial = parser.parse(str(pdf_path))
+            with patch("src.perception.PARALLEL_MIN_PAGES", 1), patch("src.perception.PARSE_WORKERS", 2):
+                parallel = parser.parse(str(pdf_path))
+                parallel_bytes = parser.parse_bytes(pdf_path.read_bytes(), filename="report.pdf")
+
+        self.assertEqual(parallel.full_text, serial.full_text)
+        self.assertEqual(parallel_bytes.full_text, serial.full_text)
+        self.assertEqual([p.page_number for p in parallel.pages], [1, 2])
+
+    def test_perception_cache_is_keyed_on_content_and_persisted(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            first = Path(tmp) / "a.pdf"
+            self._make_pdf(first)
+            second = Path(tmp) / "b.pdf"
+            second.write_bytes(first.read_bytes())
+            cache_dir = Path(tmp) / "cache"
+
+            layer = PerceptionLayer(cache_dir=str(cache_dir))
+            with patch.object(layer.parser, "parse", wraps=layer.parser.parse) as parse:
+                parsed_a = layer.process_document(str(first))
+                parsed_b = layer.process_document(str(second))
+            self.assertEqual(parse.call_count, 1)
+            self.assertEqual(parsed_b.full_text, parsed_a.full_text)
+            self.assertEqual(parsed_b.metadata.filename, "b.pdf")
+
+            restarted = PerceptionLayer(cache_dir=str(cache_dir))
+            with patch.object(restarted.parser, "parse_bytes") as parse_bytes:
+                from_disk = restarted.process_document_bytes(first.read_bytes(), filename="a.pdf")
+            parse_bytes.assert_not_called()
+            self.assertEqual(from_disk.full_text, parsed_a.full_text)
+
+            # Persisted as plain JSON, and a parser version bump is a miss
+            (cached_file,) = cache_dir.iterdir()
+            self.assertEqual(orjson.loads(cached_file.read_bytes())["full_text"], parsed_a.full_text)
+            with patch("src.perception.PARSER_VERSION", PARSER_VERSION + 1):
+                upgraded = PerceptionLayer(cache_dir=str(cache_dir))
+                with patch.object(upgraded.parser, "parse_bytes", wraps=upgraded.parser.parse_bytes) as parse_bytes:
+                    upgraded.process_document_bytes(first.read_bytes(), filename="a.pdf")
+            parse_bytes.assert_called_once()
+
+    def test_file_fingerprint_is_reused_until_the_file_changes(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            pdf_path = Path(tmp) / "a.pdf"
+            self._make_pdf(pdf_path)
+            layer = PerceptionLayer(cache_dir=None)
+
+            with patch.object(layer, "_file_fingerprint", wraps=layer._file_fingerprint) as fingerprint:
+                layer.process_document(str(pdf_path))
+                layer.process_document(str(pdf_path))
+                self.assertEqual(fingerprint.call_count, 1)
+
+                pdf_path.write_bytes(pdf_path.read_bytes() + b"\n")
+                layer.process_document(str(pdf_path))
+                self.assertEqual(fingerprint.call_count, 2)
+
+    def test_context_string_formats_tables_and_is_cached(self) -> None:
+        doc = ParsedDocument(
+            metadata=PDFMetadata(filename="r.pdf", page_count=1, total_characters=4),
+            pages=[],
+            full_text="body",
+            tables=[TableData(page_number=1, headers=["Year", "Total"], rows=[["2018", 2571.37]])],
+        )
+
+        context = doc.get_context_string()
+
+        self.assertEqual(
+            context,
+            "Document: r.pdf\nPages: 1\nCharacters: 4\n\n=== DOCUMENT CONTENT ===\nbody"
+            "\n\n=== EXTRACTED TABLES ===\n\nTable 1 (Page 1):\nYear | Total\n" + "-" * 40 + "\n2018 | 2571.37",
+        )
+        self.assertIs(doc.get_context_string(), context)
+
+    def test_detect_tables_ends_a_table_at_a_plain_line(self) -> None:
+        text = "Year  Total\n2018  2571\n2019  2400\nNotes follow here\nA\tB\nC\tD\n"
+
+        tables = PDFParser()._detect_tables(text, page_number=3)
+
+        self.assertEqual(len(tables), 2)
+        self.assertEqual(tables[0].headers, ["Year", "Total"])
+        self.assertEqual(tables[0].rows, [["2018", "2571"], ["2019", "2400"]])
+        self.assertEqual((tables[1].headers, tables[1].rows), (["A", "B"], [["C", "D"]]))
+        self.assertEqual({t.page_number for t in tables}, {3})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import json
+import sys
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+
+_BACKEND_ROOT = Path(__file__).resolve().parents[1] / "core" / "agent-backend"
+if str(_BACKEND_ROOT) not in sys.path:
+    sys.path.insert(0, str(_BACKEND_ROOT))
+
+from src.router import ANALYZE_AND_ROUTE_SCHEMA, DOCUMENT_ANALYSIS_SCHEMA, ROUTING_SCHEMA, Domain, SupervisorAgent  # noqa: E402
+
+
+class _ScriptedSupervisor(SupervisorAgent):
+    """Supervisor whose LLM returns canned responses and records prompts."""
+
+    def __init__(self, responses: list[str]) -> None:
+        super().__init__(api_key="dummy")
+        self._responses = list(responses)
+        self.calls: list[tuple[str, str]] = []
+
+    def _call_llm(self, system_prompt: str, user_prompt: str, schema=None) -> str:
+        self.calls.append((system_prompt, user_prompt))
+        return self._responses.pop(0)
+
+
+_FUSED_RESPONSE = json.dumps(
+    {
+        "document_analysis": {
+            "document_type": "Invoice",
+            "detected_domains": ["FINANCE"],
+            "key_entities": ["ACME Corp", "$1,200"],
+            "summary": "An invoice from ACME Corp.",
+        },
+        "routing": {
+            "primary_domain": "FINANCE",
+            "secondary_domains": [],
+            "confidence": 0.9,
+            "reasoning": "Invoice totals are financial.",
+            "requires_multi_agent": False,
+            "sub_tasks": [],
+        },
+    }
+)
+
+
+class AgentBackendRouterTests(unittest.TestCase):
+    def test_analyze_and_route_uses_one_llm_call(self) -> None:
+        supervisor = _ScriptedSupervisor([_FUSED_RESPONSE])
+
+        analysis, routing = supervisor.analyze_and_route("What is the total?", "INVOICE total $1,200", cache_key="doc")
+
+        self.assertEqual(len(supervisor.calls), 1)
+        self.assertEqual(analysis.document_type, "Invoice")
+        self.assertEqual(analysis.detected_domains, [Domain.FINANCE])
+        self.assertEqual(routing.primary_domain, Domain.FINANCE)
+        self.assertAlmostEqual(routing.confidence, 0.9)
+
+    def test_route_without_analysis_uses_fused_call(self) -> None:
+        supervisor = _ScriptedSupervisor([_FUSED_RESPONSE])
+
+        routing = supervisor.route("What is the total?", "INVOICE total $1,200")
+
+        self.assertEqual(len(supervisor.calls), 1)
+        self.assertEqual(supervisor.calls[0][0], supervisor.ANALYZE_AND_ROUTE_SYSTEM_PROMPT)
+        self.assertEqual(routing.primary_domain, Domain.FINANCE)
+
+    def test_refusal_falls_back_instead_of_raising(self) -> None:
+        requests = []
+
+        def create(**kwargs):
+            requests.append(kwargs)
+            message = SimpleNamespace(content=None, refusal="I can't help with that.")
+            return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=None)
+
+        supervisor = SupervisorAgent(api_key="dummy")
+        supervisor.client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+
+        analysis, routing = supervisor.analyze_and_route("What is the total?", "INVOICE")
+        only_analysis = supervisor.analyze_document("RECEIPT")
+        only_routing = supervisor.route("Who is billed?", "RECEIPT", only_analysis)
+
+        self.assertEqual(requests[0]["response_format"]["json_schema"]["name"], "analyze_and_route")
+        self.assertEqual(analysis.document_type, "Unknown")
+        self.assertEqual(routing.primary_domain, Domain.GENERAL)
+        self.assertEqual(only_analysis.document_type, "Unknown")
+        self.assertEqual(only_routing.primary_domain, Domain.GENERAL)
+
+    def test_response_schemas_satisfy_strict_mode(self) -> None:
+        # Strict structured outputs need every property required and no extras
+        def check(node: dict) -> None:
+            if node.get("type") == "object":
+                self.assertIs(node["additionalProperties"], False)
+                self.assertEqual(set(node["required"]), set(node["properties"]))
+                for child in node["properties"].values():
+                    check(child)
+            elif node.get("type") == "array":
+                check(node["items"])
+
+        for schema in (DOCUMENT_ANALYSIS_SCHEMA, ROUTING_SCHEMA, ANALYZE_AND_ROUTE_SCHEMA):
+            self.assertTrue(schema["strict"])
+            check(schema["schema"])
+
+    def test_parse_routing_decision_skips_unknown_secondary_domains(self) -> None:
+        supervisor = SupervisorAgent(api_key="dummy")
+
+        routing = supervisor._parse_routing_decision(
+            {"primary_domain": " Finance ", "secondary_domains": ["HR", "astrology", "general"]}
+        )
+
+        self.assertEqual(routing.primary_domain, Domain.FINANCE)
+        self.assertEqual(routing.secondary_domains, [Domain.HR, Domain.GENERAL])
+        self.assertEqual(supervisor._parse_domain("astrology"), Domain.GENERAL)
+
+    def test_analysis_is_cached_by_content_without_a_key(self) -> None:
+        routing_only = json.dumps({"primary_domain": "finance", "confidence": 0.8})
+        supervisor = _ScriptedSupervisor([_FUSED_RESPONSE, routing_only])
+
+        supervisor.route("What is the total?", "INVOICE")
+        analysis = supervisor.analyze_document("INVOICE")
+        supervisor.route("Who is billed?", "INVOICE")
+
+        self.assertEqual(len(supervisor.calls), 2)
+        self.assertEqual(supervisor.calls[1][0], supervisor.ROUTING_SYSTEM_PROMPT)
+        self.assertEqual(analysis.document_type, "Invoice")
+
+    def test_analyze_and_route_reuses_cached_analysis(self) -> None:
+        routing_only = json.dumps({"primary_domain": "finance", "confidence": 0.8})
+        supervisor = _ScriptedSupervisor([_FUSED_RESPONSE, routing_only])
+
+        supervisor.analyze_and_route("What is the total?", "INVOICE", cache_key="doc")
+        analysis, routing = supervisor.analyze_and_route("Who is billed?", "INVOICE", cache_key="doc")
+
+        self.assertEqual(len(supervisor.calls), 2)
+        self.assertEqual(supervisor.calls[1][0], supervisor.ROUTING_SYSTEM_PROMPT)
+        self.assertEqual(analysis.document_type, "Invoice")
+        self.assertEqual(routing.primary_domain, Domain.FINANCE)
+
+    def test_prompts_put_the_query_after_the_document(self) -> None:
+        routing_only = json.dumps({"primary_domain": "finance", "confidence": 0.8})
+        supervisor = _ScriptedSupervisor([_FUSED_RESPONSE, routing_only, routing_only])
+
+        supervisor.analyze_and_route("What is the total?", "INVOICE", cache_key="doc")
+        supervisor.analyze_and_route("Who is billed?", "INVOICE", cache_key="doc")
+        supervisor.analyze_and_route("When is it due?", "INVOICE", cache_key="doc")
+
+        for _, user_prompt in supervisor.calls:
+            self.assertTrue(user_prompt.startswith("Document Content (excerpt):\nINVOICE"))
+        second, third = supervisor.calls[1][1], supervisor.calls[2][1]
+        self.assertTrue(second.endswith("User Query: Who is billed?"))
+        prefix = second[: -len("Who is billed?")]
+        self.assertEqual(third, prefix + "When is it due?")
+
+    def test_analyze_and_route_falls_back_on_invalid_json(self) -> None:
+        supervisor = _ScriptedSupervisor(["not json"])
+
+        analysis, routing = supervisor.analyze_and_route("q", "doc")
+
+        self.assertEqual(analysis.detected_domains, [Domain.GENERAL])
+        self.assertEqual(routing.primary_domain, Domain.GENERAL)
+
+
+if __name__ == "__main__":
+    unittest.main()
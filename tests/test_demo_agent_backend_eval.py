@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import json
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from core.demo import agent_backend_eval
+
+
+class _FakePerception:
+    """Perception stand-in that records which PDFs were parsed."""
+
+    def __init__(self) -> None:
+        self.parsed: list[str] = []
+
+    def process_document(self, pdf_path: str) -> SimpleNamespace:
+        self.parsed.append(pdf_path)
+        return SimpleNamespace(full_text=f"text of {Path(pdf_path).name}")
+
+
+class _FakeOrchestrator:
+    """Orchestrator whose process() answers from the PDF name and records calls."""
+
+    def __init__(self, barrier: threading.Barrier | None = None) -> None:
+        self._barrier = barrier
+        self._lock = threading.Lock()
+        self.perception = _FakePerception()
+        self.calls: list[tuple[str, str]] = []
+        self.parsed_docs: list[SimpleNamespace | None] = []
+        self.use_cache: list[bool] = []
+        self._in_flight: dict[str, int] = {}
+        self.max_in_flight: dict[str, int] = {}
+
+    def process(
+        self, pdf_path: str, query: str, parsed_doc: SimpleNamespace | None = None, use_cache: bool = True
+    ) -> SimpleNamespace:
+        with self._lock:
+            self.calls.append((pdf_path, query))
+            self.parsed_docs.append(parsed_doc)
+            self.use_cache.append(use_cache)
+            self._in_flight[pdf_path] = self._in_flight.get(pdf_path, 0) + 1
+            self.max_in_flight[pdf_path] = max(self.max_in_flight.get(pdf_path, 0), self._in_flight[pdf_path])
+        if self._barrier is not None:
+            self._barrier.wait()
+        with self._lock:
+            self._in_flight[pdf_path] -= 1
+        return SimpleNamespace(
+            success=True,
+            answer=f"answer from {Path(pdf_path).name}",
+            confidence=0.9,
+            evidence=[],
+            routing_decision=None,
+            agent_result=None,
+            trace=SimpleNamespace(steps=[]),
+        )
+
+
+class DemoAgentBackendEvalTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.base_dir = Path(self._tmp.name) / "doc1"
+        (self.base_dir / "stage4").mkdir(parents=True)
+        (self.base_dir / "original.pdf").write_bytes(b"%PDF clean")
+        (self.base_dir / "stage4" / "final_overlay.pdf").write_bytes(b"%PDF attacked")
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def _run(self, orchestrator: _FakeOrchestrator, **kwargs) -> dict:
+        factory = lambda **_: orchestrator  # noqa: E731
+        with patch.object(agent_backend_eval, "_load_orchestrator_factory", return_value=factory):
+            return agent_backend_eval.run_agent_backend_doc_eval(
+                base_dir=self.base_dir,
+                scenario="decision",
+                adv_pdf=None,
+                out_subdir="agent_backend_eval",
+                api_key="dummy",
+                **kwargs,
+            )
+
+    def test_variants_run_concurrently_and_their_trials_sequentially(self) -> None:
+        # Every trial blocks until one trial of the other variant is in flight too
+        orchestrator = _FakeOrchestrator(threading.Barrier(2, timeout=5))
+
+        result = self._run(orchestrator, trials=3, max_concurrency=6)
+
+        self.assertEqual(len(orchestrator.calls), 6)
+        self.assertEqual(set(orchestrator.max_in_flight.values()), {1})
+        self.assertEqual(len(orchestrator.perception.parsed), 2)
+        self.assertTrue(all(doc is not None for doc in orchestrator.parsed_docs))
+        self.assertEqual(orchestrator.use_cache, [False] * 6)
+        self.assertTrue(result["doc_result"]["task_corruption"])
+        clean_rows = Path(result["output_paths"]["clean_trials"]).read_text(encoding="utf-8").splitlines()
+        self.assertEqual([json.loads(row)["trial_index"] for row in clean_rows], [1, 2, 3])
+        self.assertTrue(all(json.loads(row)["variant"] == "clean" for row in clean_rows))
+
+    def test_parse_time_is_charged_to_every_trial(self) -> None:
+        orchestrator = _FakeOrchestrator()
+        parse = orchestrator.perception.process_document
+
+        def slow_parse(pdf_path: str) -> SimpleNamespace:
+            time.sleep(0.05)
+            return parse(pdf_path)
+
+        orchestrator.perception.process_document = slow_parse
+        result = self._run(orchestrator, trials=2)
+
+        rows = [
+            json.loads(row)
+            for row in Path(result["output_paths"]["attacked_trials"]).read_text(encoding="utf-8").splitlines()
+        ]
+        self.assertEqual(len(orchestrator.perception.parsed), 2)
+        for row in rows:
+            self.assertGreaterEqual(row["parse_time_ms"], 50.0)
+            self.assertGreaterEqual(row["execution_time_ms"], row["parse_time_ms"])
+
+    def test_cache_trials_runs_each_pdf_once(self) -> None:
+        orchestrator = _FakeOrchestrator()
+
+        result = self._run(orchestrator, trials=3, cache_trials=True)
+
+        self.assertEqual(len(orchestrator.calls), 2)
+        attacked_rows = [
+            json.loads(row)
+            for row in Path(result["output_paths"]["attacked_trials"]).read_text(encoding="utf-8").splitlines()
+        ]
+        self.assertEqual([row["trial_index"] for row in attacked_rows], [1, 2, 3])
+        self.assertEqual([row.get("cached", False) for row in attacked_rows], [False, True, True])
+        self.assertTrue(all(row["answer"] == "answer from final_overlay.pdf" for row in attacked_rows))
+
+    def test_majority_prefers_most_common_then_earliest(self) -> None:
+        def trial(answer: str, index: int) -> dict:
+            return {"routed_domain": "finance", "answer": answer, "tool_signature": "[]", "trial_index": index}
+
+        majority = agent_backend_eval._select_majority_trial([trial("A", 1), trial("b", 2), trial(" B ", 3)])
+        tie = agent_backend_eval._select_majority_trial([trial("x", 1), trial("y", 2)])
+
+        self.assertEqual(majority["trial_index"], 2)
+        self.assertEqual(tie["trial_index"], 1)
+
+    def test_rejects_non_positive_concurrency(self) -> None:
+        with self.assertRaises(ValueError):
+            self._run(_FakeOrchestrator(), trials=1, max_concurrency=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
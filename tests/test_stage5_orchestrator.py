@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+import tempfile
+import threading
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from core.stage5 import orchestrator
+
+
+class Stage5BatchTests(unittest.TestCase):
+    def test_batch_runs_docs_concurrently_and_keeps_order(self) -> None:
+        doc_ids = ["doc_a", "doc_b"]
+        # Each fake doc run waits until the other has started
+        barrier = threading.Barrier(len(doc_ids), timeout=5)
+
+        def fake_run_doc(*, base_dir, spec, **_kwargs):
+            barrier.wait()
+            return f"result_{spec}", {"doc": str(base_dir.name)}
+
+        def fake_aggregate(*, run_id, doc_ids, doc_results):
+            return SimpleNamespace(model_dump=lambda: {"doc_results": doc_results})
+
+        with tempfile.TemporaryDirectory() as tmp, \
+                patch.object(orchestrator, "load_scenario_specs", return_value={d: d for d in doc_ids}), \
+                patch.object(orchestrator, "_run_doc_with_spec", side_effect=fake_run_doc), \
+                patch.object(orchestrator, "aggregate_batch_results", side_effect=fake_aggregate), \
+                patch.object(orchestrator, "write_batch_outputs", return_value={}):
+            result = orchestrator.run_stage5_batch(base_root=tmp, doc_ids=doc_ids, out_dir=tmp)
+
+        self.assertEqual(result["batch_result"]["doc_results"], ["result_doc_a", "result_doc_b"])
+        self.assertEqual(result["per_doc_paths"], {"doc_a": {"doc": "doc_a"}, "doc_b": {"doc": "doc_b"}})
+
+
+if __name__ == "__main__":
+    unittest.main()